@@ -0,0 +1,81 @@
+"""
+PostgreSQL backend taking connections from a psycopg_pool.ConnectionPool.
+
+Django 4.2 has no pooling of its own: closing a connection at the end of a
+request (CONN_MAX_AGE=0) returns it to the process's pool instead, so the
+next request skips the TCP/TLS handshake and authentication. Pool options
+are read from OPTIONS['pool'] (min_size, max_size, timeout, ...); without
+them the backend behaves like django.db.backends.postgresql.
+"""
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    ConnectionPool = None
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # One pool per database alias, shared by all threads of the process
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    @property
+    def pool_options(self):
+        return self.settings_dict['OPTIONS'].get('pool')
+
+    @property
+    def pool(self):
+        if not self.pool_options:
+            return None
+        if ConnectionPool is None:
+            raise ImproperlyConfigured('Database pooling requires the psycopg-pool package')
+        with self._pools_lock:
+            pool = self._pools.get(self.alias)
+            if pool is None:
+                options = dict(self.pool_options)
+                if options.pop('check', True):
+                    # Test connections before handing them out, like CONN_HEALTH_CHECKS
+                    options['check'] = ConnectionPool.check_connection
+                pool = self._pools[self.alias] = ConnectionPool(
+                    kwargs=self.get_connection_params(), name=self.alias, open=True, **options,
+                )
+            return pool
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.getconn()
+        # As in the parent class
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = base.IsolationLevel(
+            options.get('isolation_level', base.IsolationLevel.READ_COMMITTED)
+        )
+        if 'isolation_level' in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool rolls back anything left open before reusing it
+            self.pool.putconn(self.connection)
+            self.connection = None
+
+    @classmethod
+    def close_pools(cls):
+        """Close every pool, e.g. in a worker shutting down"""
+        with cls._pools_lock:
+            for pool in cls._pools.values():
+                pool.close()
+            cls._pools.clear()
@@ -0,0 +1,102 @@
+"""
+Routing of read-only requests to read replicas (DATABASE_REPLICA_URLS).
+
+ReplicaMiddleware marks the requests whose reads may go to a replica:
+safe requests to list/retrieve actions and views declaring
+`read_replica = True`, from users who haven't written recently. Everything
+else, including every write and management commands, uses the primary.
+
+Replicas lag behind the primary, so a user's write pins their reads to the
+primary for REPLICA_PIN_SECONDS: they see their own changes right away,
+whichever worker serves them next. The pins are kept in the cache, which
+must therefore be shared by the workers (see check_shared_cache).
+"""
+import contextvars
+import random
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY = 'replica:pin:{}'
+
+# Cache backends private to each process
+LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+# [alias] of the replica chosen for the request being handled, [None]
+# while its reads go to the primary. A mutable holder, so that choosing a
+# replica once the view is known reaches the context the view runs in
+_replica = contextvars.ContextVar('replica', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def pin_to_primary(user_id):
+    """Send the user's reads to the primary for the next REPLICA_PIN_SECONDS"""
+    cache.set(PIN_KEY.format(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user_id):
+    await cache.aset(PIN_KEY.format(user_id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(cache.get(PIN_KEY.format(user_id)))
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Pins to the primary only hold across workers with a shared cache"""
+    backend = settings.CACHES.get(DEFAULT_CACHE_ALIAS, {}).get('BACKEND')
+    if not replicas() or backend not in LOCAL_CACHES:
+        return []
+    return [checks.Error(
+        'DATABASE_REPLICA_URLS needs a cache shared by every worker.',
+        hint='Set CACHE_URL (e.g. redis://host:6379/1): users are pinned to the primary after '
+             'their writes through the cache, and a per-process cache loses the pins across workers.',
+        obj='CACHES',
+        id='agrisurvey.E001',
+    )]
+
+
+class ReplicaRouter:
+    """Reads of marked requests go to a replica, all other queries to the primary"""
+
+    def db_for_read(self, model, **hints):
+        holder = _replica.get()
+        # Reads inside a transaction must see its writes
+        if holder is None or holder[0] is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return holder[0]
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def start_request():
+    """Begin a request reading from the primary; returns a token for end_request()"""
+    return _replica.set([None])
+
+
+def read_from_replica():
+    """Send the rest of the current request's reads to a random replica"""
+    holder = _replica.get()
+    if holder is not None and replicas():
+        holder[0] = random.choice(replicas())
+
+
+def end_request(token):
+    _replica.reset(token)
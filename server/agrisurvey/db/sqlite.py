@@ -0,0 +1,42 @@
+"""
+Performance profile for SQLite deployments (SQLITE_TUNING).
+
+Every new SQLite connection switches to WAL journaling, so readers no longer
+block the writer and commits append to the log instead of rewriting pages,
+with synchronous=NORMAL (durable across application crashes, the last
+commits may be lost on power failure), a memory-mapped file, a larger page
+cache and a busy timeout making concurrent writers wait for the lock
+instead of failing with "database is locked".
+
+Registered from ApiConfig.ready().
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def tuning_pragmas():
+    """PRAGMA settings of the profile, from the SQLITE_* settings"""
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        # Negative sizes are in KiB rather than pages
+        'cache_size': -settings.SQLITE_CACHE_SIZE_KB,
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def apply_pragmas(connection, pragmas, in_memory=False):
+    """Set `pragmas` on a DB-API sqlite3 connection"""
+    for name, value in pragmas.items():
+        # In-memory databases have no journal file to switch to WAL
+        if name == 'journal_mode' and in_memory:
+            continue
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created, dispatch_uid='sqlite_tuning')
+def tune_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_TUNING', False):
+        apply_pragmas(connection.connection, tuning_pragmas(), in_memory=connection.is_in_memory_db())
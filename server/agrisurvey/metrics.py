@@ -0,0 +1,149 @@
+"""
+Prometheus metrics for request latency, database usage and payload sizes.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) every worker
+process writes its samples to mmap-backed files in that directory and the
+/metrics endpoint aggregates them across workers.
+"""
+import contextvars
+import hmac
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from rest_framework.serializers import ListSerializer
+
+from agrisurvey.middleware.queries import QueryRecorder
+
+REQUEST_LATENCY = Histogram(
+    'agrisurvey_request_duration_seconds',
+    'View latency by route name',
+    ['route', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'agrisurvey_request_queries',
+    'SQL statements executed per request',
+    ['route'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+REQUEST_DB_TIME = Histogram(
+    'agrisurvey_request_db_seconds',
+    'Time spent in the database per request',
+    ['route'],
+)
+SERIALIZER_TIME = Histogram(
+    'agrisurvey_serializer_seconds',
+    'Time spent building serializer representations per request',
+    ['route'],
+)
+RESPONSE_SIZE = Histogram(
+    'agrisurvey_response_size_bytes',
+    'Response body size',
+    ['route'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+
+# Serializer time accumulated for the request being handled, if measured
+_serializer_seconds = contextvars.ContextVar('serializer_seconds', default=None)
+
+
+def add_serializer_seconds(seconds):
+    """Count time spent serializing outside a SerializerTimingMixin serializer"""
+    accumulator = _serializer_seconds.get()
+    if accumulator is not None:
+        accumulator[0] += seconds
+
+
+class SerializerTimingMixin:
+    """
+    Serializer mixin adding the time spent in the outermost
+    to_representation call (one per row for list responses) to the
+    current request's serializer time.
+    """
+
+    def to_representation(self, instance):
+        accumulator = _serializer_seconds.get()
+        root = self.root
+        is_outermost = root is self or (root is self.parent and isinstance(root, ListSerializer))
+        if accumulator is None or not is_outermost:
+            return super().to_representation(instance)
+
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            accumulator[0] += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """Observe latency, query count, DB time, serializer time and size per route"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        accumulator = [0.0]
+        token = _serializer_seconds.set(accumulator)
+        start = time.perf_counter()
+        try:
+            with QueryRecorder() as recorder:
+                response = self.get_response(request)
+        finally:
+            _serializer_seconds.reset(token)
+        return self._observe(request, response, recorder, accumulator[0], time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        accumulator = [0.0]
+        token = _serializer_seconds.set(accumulator)
+        start = time.perf_counter()
+        try:
+            with QueryRecorder() as recorder:
+                response = await self.get_response(request)
+        finally:
+            _serializer_seconds.reset(token)
+        return self._observe(request, response, recorder, accumulator[0], time.perf_counter() - start)
+
+    def _observe(self, request, response, recorder, serializer_seconds, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        route = (match.url_name or match.view_name) if match else 'unmatched'
+        REQUEST_LATENCY.labels(route, request.method, str(response.status_code)).observe(elapsed)
+        REQUEST_QUERIES.labels(route).observe(recorder.count)
+        REQUEST_DB_TIME.labels(route).observe(recorder.total_time)
+        SERIALIZER_TIME.labels(route).observe(serializer_seconds)
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+        return response
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token and not settings.DEBUG:
+        # Never serve traffic and database figures to anyone in production
+        return HttpResponse(status=403)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
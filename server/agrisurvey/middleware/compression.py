@@ -0,0 +1,171 @@
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {
+    'application/json', 'application/geo+json', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+}
+ACCEPT_ENCODING_RE = re.compile(r'^\s*([^\s;]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*$')
+STRONG_ETAG_RE = re.compile(r'^"')
+
+
+def _gzip(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def _brotli(level):
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process, compressor.finish
+
+
+def _zstd(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return compressor.compress, compressor.flush
+
+
+# Content-Encoding -> (compressor factory, level setting, default level)
+CODECS = {'gzip': (_gzip, 'COMPRESSION_GZIP_LEVEL', 6)}
+if brotli is not None:
+    CODECS['br'] = (_brotli, 'COMPRESSION_BROTLI_QUALITY', 4)
+if zstandard is not None:
+    CODECS['zstd'] = (_zstd, 'COMPRESSION_ZSTD_LEVEL', 3)
+
+
+def parse_accept_encoding(header):
+    """Map of coding -> q-value from an Accept-Encoding header"""
+    accepted = {}
+    for part in header.split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            quality = float(match[2]) if match[2] is not None else 1.0
+        except ValueError:
+            continue
+        accepted[match[1].lower()] = quality
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress text and JSON responses with zstd, brotli or gzip.
+
+    The encoding is negotiated from Accept-Encoding among those installed
+    (brotli and zstd need the brotli/zstandard packages), preferring
+    COMPRESSION_ENCODINGS order on equal q-values. Responses smaller than
+    COMPRESSION_MIN_SIZE are sent as is; streaming responses are always
+    compressed, chunk by chunk. Static files are left to WhiteNoise, which
+    serves them precompressed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.encodings = [
+            encoding for encoding in getattr(settings, 'COMPRESSION_ENCODINGS', ['zstd', 'br', 'gzip'])
+            if encoding in CODECS
+        ]
+        self.levels = {
+            encoding: getattr(settings, setting, default)
+            for encoding, (_, setting, default) in CODECS.items()
+        }
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._process(request, await self.get_response(request))
+
+    def _process(self, request, response):
+        if not self._is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        encoding = self._negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        factory = CODECS[encoding][0]
+        if response.streaming:
+            compress_stream = self._compress_async_stream if response.is_async else self._compress_stream
+            response.streaming_content = compress_stream(
+                response.streaming_content, factory, self.levels[encoding]
+            )
+            # The compressed length is unknown up front
+            del response['Content-Length']
+        else:
+            compress, finish = factory(self.levels[encoding])
+            compressed = compress(response.content) + finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The body changed, so a strong ETag no longer holds
+        etag = response.get('ETag')
+        if etag and STRONG_ETAG_RE.match(etag):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def _is_compressible(self, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return False
+        if 'no-transform' in response.get('Cache-Control', ''):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+
+    def _negotiate(self, header):
+        accepted = parse_accept_encoding(header)
+        wildcard = accepted.get('*', 0.0)
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = accepted.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    @staticmethod
+    def _compress_stream(chunks, factory, level):
+        compress, finish = factory(level)
+        for chunk in chunks:
+            # Small chunks (e.g. CSV rows) are buffered by the compressor
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+
+    @staticmethod
+    async def _compress_async_stream(chunks, factory, level):
+        compress, finish = factory(level)
+        async for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
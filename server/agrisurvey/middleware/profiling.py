@@ -0,0 +1,116 @@
+import cProfile
+import itertools
+import os
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # pragma: no cover - optional dependency
+    PyinstrumentProfiler = None
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.(prof|html)$')
+
+
+def is_admin_request(request):
+    """
+    Whether the request's credentials (e.g. its JWT) authenticate an admin,
+    checked with the API's authentication classes before the view runs
+    """
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(request)
+        except APIException:
+            return False
+        if result is not None:
+            return getattr(result[0], 'is_admin', False)
+    return False
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+class ProfilingMiddleware:
+    """
+    Captures a call profile for selected requests.
+
+    A request is profiled when it carries the X-Profile header or the
+    ?profile query flag and its credentials authenticate an admin (checked
+    before profiling starts, so other clients can't trigger it), or when it
+    is one of every PROFILING_SAMPLE_EVERY requests. Profiles are written to
+    PROFILING_DIR, which keeps at most PROFILING_MAX_FILES of them.
+
+    Uses pyinstrument when installed and PROFILING_ENGINE is 'pyinstrument',
+    cProfile otherwise.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_every = getattr(settings, 'PROFILING_SAMPLE_EVERY', 0)
+        self.max_files = getattr(settings, 'PROFILING_MAX_FILES', 50)
+        self.use_pyinstrument = (
+            getattr(settings, 'PROFILING_ENGINE', 'cprofile') == 'pyinstrument'
+            and PyinstrumentProfiler is not None
+        )
+        self._counter = itertools.count(1)
+
+    def __call__(self, request):
+        sampled = self.sample_every > 0 and next(self._counter) % self.sample_every == 0
+        requested = (
+            not sampled
+            and (PROFILE_HEADER in request.headers or PROFILE_QUERY_PARAM in request.GET)
+            and is_admin_request(request)
+        )
+        if not (requested or sampled):
+            return self.get_response(request)
+
+        if self.use_pyinstrument:
+            profiler = PyinstrumentProfiler()
+            start_profiler, stop_profiler = profiler.start, profiler.stop
+        else:
+            profiler = cProfile.Profile()
+            start_profiler, stop_profiler = profiler.enable, profiler.disable
+
+        start = time.perf_counter()
+        start_profiler()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_profiler()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        response['X-Profile-Id'] = self._save(request, profiler, elapsed_ms)
+        return response
+
+    def _save(self, request, profiler, elapsed_ms):
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match else 'unmatched'
+        stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{os.getpid()}"
+        stem = re.sub(r'[^\w.-]', '_', f'{stem}-{request.method}-{view}-{elapsed_ms:.0f}ms')
+
+        if self.use_pyinstrument:
+            name = f'{stem}.html'
+            (directory / name).write_text(profiler.output_html())
+        else:
+            name = f'{stem}.prof'
+            profiler.dump_stats(directory / name)
+
+        self._trim(directory)
+        return name
+
+    def _trim(self, directory):
+        """Keep only the newest max_files profiles (names sort by time)"""
+        profiles = sorted(p for p in directory.iterdir() if PROFILE_NAME_RE.match(p.name))
+        for stale in profiles[:-self.max_files]:
+            stale.unlink(missing_ok=True)
@@ -0,0 +1,166 @@
+import contextvars
+import json
+import logging
+import random
+import time
+from collections import Counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger('agrisurvey.sql')
+
+# Recorders active in the current context. Context variables follow
+# sync_to_async into the thread running an async view's queries, which a
+# wrapper set up on the calling thread's connections would miss.
+_active_recorders = contextvars.ContextVar('query_recorders', default=())
+
+
+def _record(execute, sql, params, many, context):
+    recorders = _active_recorders.get()
+    if not recorders:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        query = {
+            'alias': context['connection'].alias,
+            'sql': sql,
+            'params': params,
+            'duration': time.perf_counter() - start,
+        }
+        for recorder in recorders:
+            recorder.queries.append(query)
+
+
+def _install(connection):
+    if _record not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record)
+
+
+@receiver(connection_created, dispatch_uid='query_recorder')
+def connection_opened(sender, connection, **kwargs):
+    _install(connection)
+
+
+class QueryRecorder:
+    """
+    Context manager recording every SQL statement executed while it is
+    active, on any database connection, without depending on DEBUG.
+    Queries an async view runs through sync_to_async are included.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self._token = None
+
+    def __enter__(self):
+        # Connections opened before this module was imported
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        self._token = _active_recorders.set(_active_recorders.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_recorders.reset(self._token)
+        self._token = None
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(query['duration'] for query in self.queries)
+
+    @property
+    def slowest(self):
+        return max(self.queries, key=lambda query: query['duration'], default=None)
+
+    def duplicates(self, threshold=2):
+        """SQL statements executed at least `threshold` times, most frequent first"""
+        counts = Counter(query['sql'] for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Records per-request query count, DB time, the slowest statement and
+    repeated statements (likely N+1 patterns) for a sample of requests.
+
+    Sampled responses get a Server-Timing header and a JSON log line on the
+    ``agrisurvey.sql`` logger, at WARNING level when a slow or repeated
+    statement was seen.
+
+    Streaming responses (such as the CSV exports) are not measured: their
+    content, and the queries producing it, is generated after the response
+    leaves the middleware, so their header and log line only cover the view.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'SQL_INSTRUMENTATION_SAMPLE_RATE', 0.0)
+        self.slow_query_seconds = getattr(settings, 'SQL_SLOW_QUERY_MS', 100) / 1000
+        self.duplicate_threshold = getattr(settings, 'SQL_DUPLICATE_THRESHOLD', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        return self._report(request, response, recorder, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+
+        start = time.perf_counter()
+        with QueryRecorder() as recorder:
+            response = await self.get_response(request)
+        return self._report(request, response, recorder, time.perf_counter() - start)
+
+    def _report(self, request, response, recorder, elapsed):
+        db_ms = recorder.total_time * 1000
+        timing = f'db;dur={db_ms:.1f};desc="{recorder.count} queries", app;dur={elapsed * 1000:.1f}'
+        if response.has_header('Server-Timing'):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response['Server-Timing'] = timing
+
+        self._log(request, response, recorder, elapsed)
+        return response
+
+    def _log(self, request, response, recorder, elapsed):
+        slowest = recorder.slowest
+        duplicates = recorder.duplicates(self.duplicate_threshold)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'query_count': recorder.count,
+            'db_ms': round(recorder.total_time * 1000, 2),
+        }
+        if slowest is not None:
+            record['slowest_ms'] = round(slowest['duration'] * 1000, 2)
+            record['slowest_sql'] = slowest['sql'][:500]
+        if duplicates:
+            record['duplicates'] = [{'sql': sql[:200], 'count': count} for sql, count in duplicates[:5]]
+
+        is_suspicious = duplicates or (slowest is not None and slowest['duration'] >= self.slow_query_seconds)
+        logger.log(logging.WARNING if is_suspicious else logging.INFO, json.dumps(record))
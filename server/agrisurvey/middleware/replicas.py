@@ -0,0 +1,93 @@
+import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from agrisurvey.db import routers
+
+# ViewSet actions whose reads may go to a replica
+REPLICA_ACTIONS = {'list', 'retrieve'}
+
+
+def reads_from_replica(view_func, method):
+    """Whether the view may serve a `method` request from a replica"""
+    if method not in SAFE_METHODS:
+        return False
+    actions = getattr(view_func, 'actions', None)
+    if actions is not None:
+        return actions.get(method.lower()) in REPLICA_ACTIONS
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    return getattr(view_class, 'read_replica', False)
+
+
+def token_user_id(request):
+    """
+    User ID claimed by the request's access token, without verifying it:
+    it only picks the database, and the view still authenticates the request.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        claims = jwt.decode(raw_token, options={'verify_signature': False})
+    except jwt.InvalidTokenError:
+        return None
+    return claims.get(api_settings.USER_ID_CLAIM)
+
+
+class ReplicaMiddleware:
+    """
+    Route the reads of read-only views (see agrisurvey.db.routers) to a
+    replica, unless the user wrote recently, and pin users to the primary
+    after their writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routers.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.end_request(token)
+        user_id = self._writer(request)
+        if user_id is not None:
+            routers.pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        token = routers.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.end_request(token)
+        user_id = self._writer(request)
+        if user_id is not None:
+            await routers.apin_to_primary(user_id)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not reads_from_replica(view_func, request.method):
+            return None
+        user_id = token_user_id(request)
+        if user_id is None or not routers.is_pinned(user_id):
+            routers.read_from_replica()
+        return None
+
+    def _writer(self, request):
+        """ID of the user who sent a write request, once the view authenticated them"""
+        if request.method in SAFE_METHODS:
+            return None
+        user = getattr(request, 'user', None)
+        return user.pk if user is not None and user.is_authenticated else None
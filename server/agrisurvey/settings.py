@@ -3,6 +3,7 @@ from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
 from environs import Env  # new
+import dj_database_url
 
 # Load environment variables from .env file
 load_dotenv()
@@ -44,7 +45,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'agrisurvey.middleware.static.WhiteNoiseMiddleware',
+    'agrisurvey.middleware.compression.CompressionMiddleware',
+    'agrisurvey.middleware.queries.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +57,41 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Compression of API responses (static files are precompressed by
+# WhiteNoise). zstd and br are offered when the zstandard/brotli packages
+# are installed; responses under COMPRESSION_MIN_SIZE bytes are not compressed
+COMPRESSION_ENABLED = env.bool('COMPRESSION_ENABLED', True)
+COMPRESSION_MIN_SIZE = env.int('COMPRESSION_MIN_SIZE', 1024)
+COMPRESSION_ENCODINGS = env.list('COMPRESSION_ENCODINGS', ['zstd', 'br', 'gzip'])
+COMPRESSION_GZIP_LEVEL = env.int('COMPRESSION_GZIP_LEVEL', 6)
+COMPRESSION_BROTLI_QUALITY = env.int('COMPRESSION_BROTLI_QUALITY', 4)
+COMPRESSION_ZSTD_LEVEL = env.int('COMPRESSION_ZSTD_LEVEL', 3)
+
+if not COMPRESSION_ENABLED:
+    MIDDLEWARE.remove('agrisurvey.middleware.compression.CompressionMiddleware')
+
+# Prometheus metrics, served at /metrics behind a METRICS_TOKEN bearer
+# token (without one, only while DEBUG is on)
+METRICS_ENABLED = env.bool('METRICS_ENABLED', False)
+METRICS_TOKEN = env.str('METRICS_TOKEN', '')
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(2, 'agrisurvey.metrics.MetricsMiddleware')
+
+# On-demand profiling: admins send an X-Profile header or ?profile flag, or
+# one in every PROFILING_SAMPLE_EVERY requests is profiled
+PROFILING_ENABLED = env.bool('PROFILING_ENABLED', False)
+PROFILING_SAMPLE_EVERY = env.int('PROFILING_SAMPLE_EVERY', 0)
+PROFILING_ENGINE = env.str('PROFILING_ENGINE', 'cprofile')
+PROFILING_DIR = env.str('PROFILING_DIR', os.path.join(BASE_DIR, 'profiles'))
+PROFILING_MAX_FILES = env.int('PROFILING_MAX_FILES', 50)
+
+if PROFILING_ENABLED:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+        'agrisurvey.middleware.profiling.ProfilingMiddleware',
+    )
+
 ROOT_URLCONF = 'agrisurvey.urls'
 
 TEMPLATES = [
@@ -73,16 +111,84 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'api.wsgi.application'
+ASGI_APPLICATION = 'agrisurvey.asgi.application'
+
+# Deployment mode: 'wsgi' (gunicorn sync workers) or 'asgi' (uvicorn workers,
+# see gunicorn.conf.py). API_ASYNC_VIEWS serves the dashboard, exports and
+# media files from async views, which only pays off under ASGI
+SERVER_MODE = env.str('SERVER_MODE', 'wsgi')
+API_ASYNC_VIEWS = env.bool('API_ASYNC_VIEWS', SERVER_MODE == 'asgi')
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Keep connections open across requests for DB_CONN_MAX_AGE seconds (0
+# closes them after each request) and check them before reuse. Under ASGI
+# requests don't run on a fixed thread, so connections wouldn't be reused
+# and aren't kept.
+DB_CONNECTION_OPTIONS = {
+    "conn_max_age": env.int("DB_CONN_MAX_AGE", 0 if SERVER_MODE == 'asgi' else 600),
+    "conn_health_checks": env.bool("DB_CONN_HEALTH_CHECKS", True),
+}
+
 DATABASES = {
-    "default": env.dj_db_url("DATABASE_URL", default="sqlite:///db.sqlite3"),
+    "default": env.dj_db_url("DATABASE_URL", default="sqlite:///db.sqlite3", **DB_CONNECTION_OPTIONS),
 }
 
+# SQLite performance profile for small deployments (see agrisurvey.db.sqlite):
+# WAL journaling, synchronous=NORMAL, a SQLITE_MMAP_SIZE byte memory map,
+# a SQLITE_CACHE_SIZE_KB page cache and writers waiting up to
+# SQLITE_BUSY_TIMEOUT_MS for the lock
+SQLITE_TUNING = env.bool("SQLITE_TUNING", False)
+SQLITE_MMAP_SIZE = env.int("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)
+SQLITE_CACHE_SIZE_KB = env.int("SQLITE_CACHE_SIZE_KB", 64 * 1024)
+SQLITE_BUSY_TIMEOUT_MS = env.int("SQLITE_BUSY_TIMEOUT_MS", 5000)
+
+# Read replicas (aliases replica1, replica2, ...) serving the reads of
+# list/retrieve actions, the dashboard, exports and analytics; see
+# agrisurvey.db.routers. A user's reads stay on the primary for
+# REPLICA_PIN_SECONDS after each of their writes, which requires a cache
+# shared by the workers (CACHE_URL). Tests mirror the replicas to the test
+# database.
+DATABASE_REPLICAS = []
+for _number, _url in enumerate(env.list("DATABASE_REPLICA_URLS", []), start=1):
+    DATABASE_REPLICAS.append(f"replica{_number}")
+    DATABASES[f"replica{_number}"] = {
+        **dj_database_url.parse(_url, **DB_CONNECTION_OPTIONS),
+        "TEST": {"MIRROR": "default"},
+    }
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", 10)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['agrisurvey.db.routers.ReplicaRouter']
+    MIDDLEWARE.append('agrisurvey.middleware.replicas.ReplicaMiddleware')
+
+# PostgreSQL connection pool (psycopg_pool) per process and database,
+# replacing persistent connections: connections go back to the pool at the
+# end of each request, and are checked before being handed out. Leave room
+# for the dashboard's DASHBOARD_WORKERS threads in DB_POOL_MAX_SIZE
+if env.bool("DB_POOL", False):
+    for _database in DATABASES.values():
+        if _database["ENGINE"] != "django.db.backends.postgresql":
+            continue
+        _database.update({
+            "ENGINE": "agrisurvey.db.postgresql_pool",
+            "CONN_MAX_AGE": 0,
+        })
+        _database.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": env.int("DB_POOL_MIN_SIZE", 2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", 10),
+            # Seconds to wait for a free connection before failing the request
+            "timeout": env.float("DB_POOL_TIMEOUT", 10),
+        }
+
 print("DATABASES:", DATABASES)
 
+# Cache, e.g. redis://host:6379/1 when running several workers
+CACHES = {
+    "default": env.dj_cache_url("CACHE_URL", default="locmem://"),
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -99,6 +205,28 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER picks the hasher for new and re-encoded passwords; the other
+# hashers stay enabled so existing hashes keep verifying and get upgraded on
+# the next login.
+PASSWORD_HASHER = env.str('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = env.int('PASSWORD_PBKDF2_ITERATIONS', 600000)
+PASSWORD_SCRYPT_WORK_FACTOR = env.int('PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14)
+PASSWORD_SCRYPT_BLOCK_SIZE = env.int('PASSWORD_SCRYPT_BLOCK_SIZE', 8)
+PASSWORD_SCRYPT_PARALLELISM = env.int('PASSWORD_SCRYPT_PARALLELISM', 1)
+PASSWORD_ARGON2_TIME_COST = env.int('PASSWORD_ARGON2_TIME_COST', 2)
+PASSWORD_ARGON2_MEMORY_COST = env.int('PASSWORD_ARGON2_MEMORY_COST', 102400)
+PASSWORD_ARGON2_PARALLELISM = env.int('PASSWORD_ARGON2_PARALLELISM', 8)
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'api.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'api.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'api.hashers.TunedScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
 # Custom user model
 AUTH_USER_MODEL = 'api.User'
 
@@ -116,18 +244,61 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Serve MEDIA_ROOT from the application itself
+MEDIA_SERVE = env.bool('MEDIA_SERVE', DEBUG)
+
+# SQL instrumentation: fraction of requests whose queries are timed and
+# reported through Server-Timing headers and the agrisurvey.sql logger
+SQL_INSTRUMENTATION_SAMPLE_RATE = env.float('SQL_INSTRUMENTATION_SAMPLE_RATE', 0.0)
+SQL_SLOW_QUERY_MS = env.float('SQL_SLOW_QUERY_MS', 100)
+SQL_DUPLICATE_THRESHOLD = env.int('SQL_DUPLICATE_THRESHOLD', 5)
+
+# Logging
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'agrisurvey': {
+            'handlers': ['console'],
+            'level': env.str('AGRISURVEY_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
+# Stateless JWT auth rebuilds request.user from token claims instead of
+# loading it from the database on every request. Revoked tokens (password or
+# role changes) may still be accepted by other workers for up to
+# JWT_REVOCATION_CACHE_TTL seconds
+JWT_STATELESS_AUTH = env.bool('JWT_STATELESS_AUTH', False)
+JWT_REVOCATION_CACHE_TTL = env.int('JWT_REVOCATION_CACHE_TTL', 60)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication' if JWT_STATELESS_AUTH
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed when installed, DRF's json-module classes otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_FILTER_BACKENDS': [
@@ -137,6 +308,43 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Build list responses for samples, pest reports and crops straight from
+# values() rows instead of model instances (same output, less CPU)
+FAST_LIST_SERIALIZATION = env.bool('FAST_LIST_SERIALIZATION', True)
+
+# ?search= on farm, sample and pest report lists matches word prefixes
+# through the full-text index (api.search) instead of LIKE '%term%' scans
+SEARCH_USE_INDEX = env.bool('SEARCH_USE_INDEX', True)
+
+# Analytics read the daily rollups kept by `manage.py refresh_rollups` once
+# it has run. Each incremental refresh re-reads rows updated up to
+# ROLLUP_WATERMARK_OVERLAP seconds before the previous one, to catch rows
+# committed late
+ANALYTICS_USE_ROLLUPS = env.bool('ANALYTICS_USE_ROLLUPS', True)
+ROLLUP_WATERMARK_OVERLAP = env.int('ROLLUP_WATERMARK_OVERLAP', 300)
+
+# Pest hotspot grid: default cell size in degrees (0.01 is about 1.1 km) and
+# high-severity reports making a cell a hotspot. Past windows are cached for
+# HOTSPOT_CACHE_TIMEOUT seconds, the current one for HOTSPOT_CURRENT_CACHE_TIMEOUT
+HOTSPOT_CELL_SIZE = env.float('HOTSPOT_CELL_SIZE', 0.01)
+HOTSPOT_MIN_HIGH = env.int('HOTSPOT_MIN_HIGH', 3)
+HOTSPOT_CACHE_TIMEOUT = env.int('HOTSPOT_CACHE_TIMEOUT', 24 * 3600)
+HOTSPOT_CURRENT_CACHE_TIMEOUT = env.int('HOTSPOT_CURRENT_CACHE_TIMEOUT', 300)
+
+# Error reports of bulk imports (api.imports), listing the rejected rows
+IMPORT_REPORT_DIR = env.str('IMPORT_REPORT_DIR', os.path.join(BASE_DIR, 'imports'))
+
+# Farm detail responses include at most this many soil samples, water samples
+# and pest reports each, plus links to the paginated lists for the rest
+FARM_DETAIL_CHILD_LIMIT = env.int('FARM_DETAIL_CHILD_LIMIT', 50)
+
+# Dashboard sections are computed concurrently by up to DASHBOARD_WORKERS
+# threads, each with its own database connection (0 runs them one after
+# another, as always happens on SQLite). Sections not done within
+# DASHBOARD_TIMEOUT_MS are left out and listed under 'incomplete' (0: no limit)
+DASHBOARD_WORKERS = env.int('DASHBOARD_WORKERS', 4)
+DASHBOARD_TIMEOUT_MS = env.int('DASHBOARD_TIMEOUT_MS', 0)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -151,6 +359,7 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.auth.ClaimsTokenObtainPairSerializer',
 }
 
 # CORS settings
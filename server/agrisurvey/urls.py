@@ -1,7 +1,9 @@
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from django.views.static import serve
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -30,6 +32,17 @@ urlpatterns = [
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 ]
 
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+if settings.METRICS_ENABLED:
+    from agrisurvey.metrics import metrics_view
+
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
+
+# Serve uploaded media files (in development, by default)
+if settings.MEDIA_SERVE:
+    media_pattern = rf'^{re.escape(settings.MEDIA_URL.lstrip("/"))}(?P<path>.*)$'
+    if settings.API_ASYNC_VIEWS:
+        from api.views.asynchronous import serve_media
+
+        urlpatterns.append(re_path(media_pattern, serve_media))
+    else:
+        urlpatterns.append(re_path(media_pattern, serve, {'document_root': settings.MEDIA_ROOT}))
\ No newline at end of file
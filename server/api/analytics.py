@@ -0,0 +1,240 @@
+"""
+Grouped statistics over soil and water sample measurements, and pest
+report counts.
+
+Counts, means, standard deviations, minimums and maximums come either
+from the daily rollup tables (see api.rollups), costing O(days) per
+group, or straight from the sample tables with one GROUP BY query.
+Percentiles need the individual values, so they are only computed when
+asked for, from the sample tables, with NumPy when it is installed and an
+equivalent pure Python interpolation otherwise. Pest report counts per
+severity come from the pest rollups or the report table the same way.
+"""
+import math
+from collections import defaultdict
+
+from django.db.models import Avg, Count, Exists, F, FloatField, Max, Min, OuterRef, Q, Sum
+from django.db.models.functions import Cast, TruncMonth, TruncWeek
+
+from api.models import Crop, PestDiseaseReport
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+SOIL_METRICS = ['pH', 'moisture_pct', 'nutrient_n', 'nutrient_p', 'nutrient_k']
+WATER_METRICS = ['pH', 'turbidity']
+
+# group_by name -> output keys
+GROUPINGS = {
+    'route': ['route', 'route_name'],
+    'month': ['month'],
+    'week': ['week'],
+    'crop_type': ['crop_type'],
+}
+TRUNCATIONS = {'month': TruncMonth, 'week': TruncWeek}
+
+# Output key -> lookup, from a sample table and from a rollup table
+SAMPLE_LOOKUPS = {'route': 'farm__route_id', 'route_name': 'farm__route__name',
+                  'crop_type': 'farm__crops__crop_type'}
+ROLLUP_LOOKUPS = {'route': 'route_id', 'route_name': 'route__name', 'crop_type': 'farm__crops__crop_type'}
+
+STATS = ['mean', 'std', 'min', 'max']
+
+
+def group_expressions(group_by, lookups, date_field):
+    """Output key -> expression for the requested groupings"""
+    expressions = {}
+    for grouping in group_by:
+        for key in GROUPINGS[grouping]:
+            expressions[key] = TRUNCATIONS[key](date_field) if key in TRUNCATIONS else F(lookups[key])
+    return expressions
+
+
+def one_row_per_crop_type(queryset):
+    """
+    Keep a single crops join row per crop type of each farm, so grouping
+    by crop_type doesn't count a row twice when its farm grows the same
+    crop type in two fields.
+    """
+    duplicate = Crop.objects.filter(
+        farm_id=OuterRef('farm_id'), crop_type=OuterRef('farm__crops__crop_type'),
+        pk__lt=OuterRef('farm__crops__pk'),
+    )
+    return queryset.filter(Q(farm__crops__isnull=True) | ~Exists(duplicate))
+
+
+def _annotations(expressions):
+    """Group expressions under names that cannot clash with model fields (e.g. route)"""
+    return {f'group_{key}': expression for key, expression in expressions.items()}
+
+
+def _grouped(queryset, group_by):
+    return one_row_per_crop_type(queryset) if 'crop_type' in group_by else queryset
+
+
+def percentile(values, pct):
+    """Linear-interpolation percentile of sorted values, as numpy.percentile computes it"""
+    if not values:
+        return None
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def compute_percentiles(values, percentiles):
+    """Map of percentile -> value for a list of numbers"""
+    if not values:
+        return dict.fromkeys(percentiles)
+    if np is not None:
+        return dict(zip(percentiles, np.percentile(np.asarray(values, dtype=float), percentiles).tolist()))
+    ordered = sorted(float(value) for value in values)
+    return {pct: percentile(ordered, pct) for pct in percentiles}
+
+
+def _number(value):
+    return None if value is None else round(float(value), 4)
+
+
+def _output_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _std(mean, mean_sq):
+    """Population standard deviation from the mean and the mean of squares"""
+    return math.sqrt(max(mean_sq - mean * mean, 0.0))
+
+
+def _group(keys, key_values):
+    return {key: _output_value(value) for key, value in zip(keys, key_values)}
+
+
+def sample_statistics(queryset, date_field, metrics, group_by=()):
+    """
+    Statistics per group computed from a sample queryset. Returns
+    {group key tuple: group dict}, ordered by the group keys.
+    """
+    expressions = group_expressions(group_by, SAMPLE_LOOKUPS, date_field)
+    keys = list(expressions)
+
+    aggregates = {'count': Count('pk', distinct=True)}
+    for metric in metrics:
+        value = Cast(metric, FloatField())
+        aggregates.update({
+            f'{metric}__count': Count(metric), f'{metric}__mean': Avg(value),
+            f'{metric}__mean_sq': Avg(value * value), f'{metric}__min': Min(metric), f'{metric}__max': Max(metric),
+        })
+
+    names = list(_annotations(expressions))
+    queryset = _grouped(queryset, group_by)
+    if keys:
+        rows = queryset.values(**_annotations(expressions)).annotate(**aggregates).order_by(*names)
+    else:
+        rows = [queryset.aggregate(**aggregates)]
+
+    groups = {}
+    for row in rows:
+        key_values = tuple(row[name] for name in names)
+        group = groups[key_values] = _group(keys, key_values)
+        group['count'] = row['count']
+        for metric in metrics:
+            mean, mean_sq = row[f'{metric}__mean'], row[f'{metric}__mean_sq']
+            group[metric] = {
+                'count': row[f'{metric}__count'],
+                'mean': _number(mean),
+                'std': None if mean is None else _number(_std(mean, mean_sq)),
+                'min': _number(row[f'{metric}__min']),
+                'max': _number(row[f'{metric}__max']),
+            }
+    return groups
+
+
+def rollup_statistics(queryset, metrics, group_by=()):
+    """
+    Statistics per group combined from a FarmDailyRollup or RouteDailyRollup
+    queryset already limited to one dataset, shaped like sample_statistics.
+    """
+    expressions = group_expressions(group_by, ROLLUP_LOOKUPS, 'date')
+    keys = list(expressions)
+    names = list(_annotations(expressions))
+    queryset = _grouped(queryset, group_by).filter(metric__in=metrics)
+    rows = queryset.values('metric', **_annotations(expressions)).annotate(
+        sum_count=Sum('count'), sum_total=Sum('total'), sum_total_sq=Sum('total_sq'),
+        min_minimum=Min('minimum'), max_maximum=Max('maximum'),
+    ).order_by(*names, 'metric')
+
+    groups = {}
+    for row in rows:
+        key_values = tuple(row[name] for name in names)
+        group = groups.get(key_values)
+        if group is None:
+            group = groups[key_values] = _group(keys, key_values)
+            group['count'] = 0
+            for metric in metrics:
+                group[metric] = {'count': 0, **dict.fromkeys(STATS)}
+
+        count, total, total_sq = row['sum_count'], row['sum_total'], row['sum_total_sq']
+        mean = total / count
+        group[row['metric']] = {
+            'count': count,
+            'mean': _number(mean),
+            'std': _number(_std(mean, total_sq / count)),
+            'min': _number(row['min_minimum']),
+            'max': _number(row['max_maximum']),
+        }
+        # pH is required on every sample, so its count is the sample count
+        if row['metric'] == 'pH':
+            group['count'] = count
+
+    if not keys and not groups:
+        groups[()] = {'count': 0, **{metric: {'count': 0, **dict.fromkeys(STATS)} for metric in metrics}}
+    return groups
+
+
+def add_percentiles(groups, queryset, date_field, metrics, group_by, percentiles):
+    """Add the requested percentiles of each metric to every group"""
+    expressions = group_expressions(group_by, SAMPLE_LOOKUPS, date_field)
+    values = defaultdict(lambda: defaultdict(list))
+    for row in _grouped(queryset, group_by).values_list(*expressions.values(), *metrics).iterator():
+        key_values, measurements = row[:len(expressions)], row[len(expressions):]
+        for metric, value in zip(metrics, measurements):
+            if value is not None:
+                values[key_values][metric].append(value)
+
+    for key_values, group in groups.items():
+        for metric in metrics:
+            computed = compute_percentiles(values[key_values][metric], percentiles)
+            group[metric].update({f'p{pct:g}': _number(value) for pct, value in computed.items()})
+
+
+def pest_report_counts(queryset, group_by=(), from_rollups=False):
+    """
+    Number of pest/disease reports per severity and group, from a
+    PestDiseaseReport queryset or a Farm/RouteDailyPestRollup queryset.
+    """
+    if from_rollups:
+        expressions = group_expressions(group_by, ROLLUP_LOOKUPS, 'date')
+        reports = Sum('count')
+    else:
+        expressions = group_expressions(group_by, SAMPLE_LOOKUPS, 'report_date')
+        reports = Count('pk', distinct=True)
+    keys = list(expressions)
+    severities = PestDiseaseReport.Severity.values
+
+    names = list(_annotations(expressions))
+    rows = _grouped(queryset, group_by).values('severity', **_annotations(expressions)).annotate(
+        reports=reports
+    ).order_by(*names, 'severity')
+    groups = {}
+    if not keys:
+        groups[()] = {'count': 0, **dict.fromkeys(severities, 0)}
+    for row in rows:
+        key_values = tuple(row[name] for name in names)
+        group = groups.get(key_values)
+        if group is None:
+            group = groups[key_values] = {**_group(keys, key_values), 'count': 0, **dict.fromkeys(severities, 0)}
+        group[row['severity']] = row['reports']
+        group['count'] += row['reports']
+    return groups
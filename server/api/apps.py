@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'api'
\ No newline at end of file
+    name = 'api'
+
+    def ready(self):
+        from agrisurvey.db import routers, sqlite  # noqa: F401
+        from api import signals  # noqa: F401
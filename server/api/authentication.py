@@ -0,0 +1,117 @@
+import threading
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import User
+
+# Claims copied from the user into every token pair. Together with the user ID
+# they are enough to authorize requests without touching the database.
+# Profile fields (email, names) stay out of tokens; views needing them load
+# the user.
+USER_CLAIMS = ('username', 'role', 'token_version')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying the user claims; access tokens inherit them"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class ClaimsUser(TokenUser):
+    """Lightweight stand-in for User rebuilt from signed token claims"""
+
+    Role = User.Role
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', '')
+
+    @cached_property
+    def token_version(self):
+        return self.token.get('token_version', 0)
+
+    @property
+    def is_admin(self):
+        return self.role == self.Role.ADMIN
+
+    @property
+    def is_enumerator(self):
+        return self.role == self.Role.ENUMERATOR
+
+    def get_role_display(self):
+        return str(dict(self.Role.choices).get(self.role, self.role))
+
+
+class TokenVersionCache:
+    """Small thread-safe TTL cache of (token_version, is_active) per user ID"""
+
+    def __init__(self, ttl, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        state = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[user_id] = (time.monotonic() + self.ttl, state)
+        return state
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+
+token_versions = TokenVersionCache(ttl=getattr(settings, 'JWT_REVOCATION_CACHE_TTL', 60))
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds request.user from token claims.
+
+    Revocation is checked against the user's token_version through an
+    in-process TTL cache, so the database is hit at most once per user per
+    JWT_REVOCATION_CACHE_TTL seconds. Saving a revoking change clears the
+    cache of the process that saved it only: other workers keep accepting
+    the old tokens for up to JWT_REVOCATION_CACHE_TTL seconds. Tokens issued without the user claims
+    fall back to the regular database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        state = token_versions.get(str(user.id))
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        current_version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if user.token_version != current_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return user
@@ -0,0 +1,228 @@
+"""
+In-memory prefix index for farm name and owner autocomplete.
+
+Every word of a farm's name and owner_name is kept in sorted
+(word, slot) lists, one for all farms and one per route, so a prefix
+lookup is a bisect plus a short scan, and an enumerator's lookup only
+touches their own routes' lists. Inserting into the list of all farms
+would move millions of entries, so changed farms go to a small sorted
+list of recent entries, removed ones are skipped until both are merged
+into the main list.
+
+Each process holds its own index, built on first use. Farm saves and
+deletions are appended to a change log in the database (FarmChange, see
+api.signals), which every worker sees whatever the cache backend: before
+answering, the index replays the changes it hasn't seen, and rebuilds from
+the database when the log has gaps or `invalidate()` was called (e.g.
+after bulk loads).
+"""
+import bisect
+import heapq
+import re
+import sys
+import threading
+
+from django.db.models import Max
+
+from api.models import Farm, FarmChange
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+# Changes to replay before rebuilding instead
+MAX_REPLAY = 1000
+# Changes kept in the log, pruned once every PRUNE_EVERY changes
+KEEP_CHANGES = 10 * MAX_REPLAY
+PRUNE_EVERY = 100
+# A missing change this many versions old has expired rather than not
+# being written yet
+MISSING_GRACE = 20
+# Matching entries examined per lookup, bounding multi-word lookups
+MAX_SCAN = 5000
+# Recent and dead entries tolerated before merging them into the main list
+MERGE_SIZE = 20000
+
+
+def words(text):
+    return sorted({sys.intern(word) for word in WORD_RE.findall((text or '').lower())})
+
+
+def record_change(farm_id):
+    """Log a farm saved or deleted, for every process to replay"""
+    change = FarmChange.objects.create(farm_id=farm_id)
+    if change.pk % PRUNE_EVERY == 0:
+        # Processes further behind rebuild rather than replay anyway
+        FarmChange.objects.filter(pk__lte=change.pk - KEEP_CHANGES).delete()
+
+
+def invalidate():
+    """Make every process rebuild its index on its next lookup"""
+    FarmChange.objects.create(farm_id=None)
+
+
+class FarmIndex:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None  # last change of the log applied
+        self.clear()
+
+    def clear(self):
+        self.farms = {}  # slot -> (id, name, owner_name, route_id, words)
+        self.slots = {}  # farm id -> slot
+        self.entries = []  # sorted (word, slot) of every farm, possibly removed since
+        self.recent = []  # sorted (word, slot) added since the last merge
+        self.dead = 0  # entries of removed farms left in self.entries, skipped by lookups
+        self.by_route = {}  # route id -> sorted (word, slot)
+        self.next_slot = 0
+
+    def load(self, rows):
+        """Replace the index with (id, name, owner_name, route_id) rows"""
+        self.clear()
+        for farm_id, name, owner_name, route_id in rows:
+            entries = self._store(farm_id, name, owner_name, route_id)
+            self.entries.extend(entries)
+            self.by_route.setdefault(route_id, []).extend(entries)
+        self.entries.sort()
+        for entries in self.by_route.values():
+            entries.sort()
+
+    def add(self, farm_id, name, owner_name, route_id):
+        self.remove(farm_id)
+        route_entries = self.by_route.setdefault(route_id, [])
+        for entry in self._store(farm_id, name, owner_name, route_id):
+            bisect.insort(self.recent, entry)
+            bisect.insort(route_entries, entry)
+        if len(self.recent) + self.dead > MERGE_SIZE:
+            self.merge()
+
+    def merge(self):
+        self.entries = [entry for entry in heapq.merge(self.entries, self.recent) if entry[1] in self.farms]
+        self.recent, self.dead = [], 0
+
+    def _store(self, farm_id, name, owner_name, route_id):
+        """Record a farm under a new slot and return its (word, slot) entries"""
+        slot = self.next_slot
+        self.next_slot += 1
+        farm_words = words(f'{name} {owner_name}')
+        self.farms[slot] = (farm_id, name, owner_name, route_id, farm_words)
+        self.slots[farm_id] = slot
+        return [(word, slot) for word in farm_words]
+
+    def remove(self, farm_id):
+        slot = self.slots.pop(farm_id, None)
+        if slot is None:
+            return
+        _, _, _, route_id, farm_words = self.farms.pop(slot)
+        self.dead += len(farm_words) - self._discard(self.recent, farm_words, slot)
+        self._discard(self.by_route.get(route_id, []), farm_words, slot)
+
+    @staticmethod
+    def _discard(entries, farm_words, slot):
+        """Delete a farm's entries from a sorted list, returning how many were there"""
+        found = 0
+        for word in farm_words:
+            i = bisect.bisect_left(entries, (word, slot))
+            if i < len(entries) and entries[i] == (word, slot):
+                del entries[i]
+                found += 1
+        return found
+
+    def sync(self):
+        """Catch up with the change log, rebuilding when it can't be replayed"""
+        with self.lock:
+            if self.version is None:
+                return self.rebuild()
+            version = self.version
+
+        changes = list(
+            FarmChange.objects.filter(pk__gt=version).order_by('pk').values_list('pk', 'farm_id')[:MAX_REPLAY + 1]
+        )
+        with self.lock:
+            # Unless another thread caught up meanwhile
+            if not changes or self.version != version:
+                return
+            if len(changes) > MAX_REPLAY or any(farm_id is None for _, farm_id in changes):
+                self.rebuild()
+            else:
+                self.replay(changes)
+
+    def rebuild(self):
+        # Changes after `version` are replayed later, so reading farms
+        # concurrently with writes loses nothing
+        version = FarmChange.objects.aggregate(version=Max('pk'))['version'] or 0
+        rows = Farm.objects.values_list('pk', 'name', 'owner_name', 'route_id').order_by()
+        self.load(rows.iterator(chunk_size=10000))
+        self.version = version
+
+    def replay(self, changes):
+        """Apply (number, farm_id) changes following self.version"""
+        farm_ids, reached = set(), self.version
+        latest = changes[-1][0]
+        for number, farm_id in changes:
+            if number != reached + 1:
+                # A gap is a change not committed yet, unless it is old
+                if latest - (reached + 1) >= MISSING_GRACE:
+                    return self.rebuild()
+                break
+            farm_ids.add(farm_id)
+            reached = number
+
+        saved = Farm.objects.filter(pk__in=farm_ids).values_list('pk', 'name', 'owner_name', 'route_id')
+        for row in saved:
+            self.add(*row)
+            farm_ids.discard(row[0])
+        for farm_id in farm_ids:
+            self.remove(farm_id)
+        self.version = reached
+
+    def search(self, query, route_ids=None, limit=10):
+        """
+        Farms with a word starting with each word of `query`, limited to
+        `route_ids` when given. Names starting with the query come first:
+        up to MAX_SCAN matching entries are ranked before keeping `limit`.
+        """
+        terms = words(query)
+        if not terms:
+            return []
+        # Scan the most selective term, check the others per farm
+        scan = max(terms, key=len)
+        with self.lock:
+            if route_ids is None:
+                lists = [self.entries, self.recent]
+            else:
+                lists = [self.by_route[route_id] for route_id in route_ids if route_id in self.by_route]
+
+            found, seen = [], set()
+            matches = heapq.merge(*(self._prefixed(entries, scan) for entries in lists))
+            for scanned, (_, slot) in enumerate(matches):
+                if scanned >= MAX_SCAN:
+                    break
+                if slot in seen or slot not in self.farms:
+                    continue
+                seen.add(slot)
+                farm = self.farms[slot]
+                if all(any(word.startswith(term) for word in farm[4]) for term in terms):
+                    found.append(farm)
+
+        prefix = query.strip().lower()
+        best = heapq.nsmallest(
+            limit, found, key=lambda farm: (not farm[1].lower().startswith(prefix), farm[1].lower(), str(farm[0])),
+        )
+        return [
+            {'id': farm_id, 'name': name, 'owner_name': owner_name, 'route': route_id}
+            for farm_id, name, owner_name, route_id, _ in best
+        ]
+
+    @staticmethod
+    def _prefixed(entries, prefix):
+        for i in range(bisect.bisect_left(entries, (prefix,)), len(entries)):
+            if not entries[i][0].startswith(prefix):
+                return
+            yield entries[i]
+
+
+farm_index = FarmIndex()
+
+
+def autocomplete(query, route_ids=None, limit=10):
+    farm_index.sync()
+    return farm_index.search(query, route_ids, limit)
@@ -0,0 +1,155 @@
+"""Synthetic data generator used by the benchmarks and query-budget tests"""
+import datetime
+import random
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.models import (
+    User, Route, Farm, Crop,
+    SoilSample, WaterSample, PestDiseaseReport
+)
+from api import autocomplete
+from api.search import rebuild_index
+
+# Named presets: routes, farms per route, and per-farm crops, soil samples,
+# water samples and pest/disease reports. "large" is 10k routes, 1M farms and
+# 10M samples/reports.
+SCALES = {
+    'tiny': (4, 5, 1, 2, 1, 1),
+    'small': (50, 20, 1, 4, 3, 3),
+    'medium': (1000, 50, 1, 4, 3, 3),
+    'large': (10000, 100, 1, 4, 3, 3),
+}
+
+ROUTES_PER_ENUMERATOR = 5
+CROP_TYPES = ['Maize', 'Rice', 'Wheat', 'Tea', 'Coffee', 'Cassava', 'Beans']
+WATER_SOURCES = ['Well', 'River', 'Irrigation canal', 'Borehole', 'Rainwater tank']
+PEST_NAMES = ['Fall Armyworm', 'Maize Stalk Borer', 'Leaf Rust', 'Blast', 'Blight', 'Aphids']
+FIRST_NAMES = ['Amara', 'Kasun', 'Nimali', 'Ruwan', 'Dilani', 'Tharindu', 'Sajith', 'Ishara']
+LAST_NAMES = ['Perera', 'Silva', 'Fernando', 'Jayasinghe', 'Bandara', 'Wijesinghe']
+
+
+def _decimal(rng, low, high, places=2):
+    return Decimal(f'{rng.uniform(low, high):.{places}f}')
+
+
+def _past_date(rng, today, max_days=730):
+    return today - datetime.timedelta(days=rng.randrange(max_days))
+
+
+def _batched(objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_dataset(routes=50, farms_per_route=20, crops_per_farm=1, soil_per_farm=4,
+                     water_per_farm=3, pests_per_farm=3, batch_size=5000, seed=0,
+                     password='password123', progress=None):
+    """
+    Bulk-create a realistic dataset and return the number of rows per model.
+
+    Farms are generated route by route and their children in batches, so
+    memory stays bounded by batch_size regardless of the dataset size.
+    """
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    report = progress or (lambda message: None)
+    counts = dict.fromkeys(['users', 'routes', 'farms', 'crops', 'soil', 'water', 'pests'], 0)
+
+    # Hash once; every generated user shares the same password
+    password_hash = make_password(password)
+    # Tags this run's users, outside the seeded RNG so reruns don't collide
+    run = uuid.uuid4().hex[:6]
+
+    enumerator_count = max(1, routes // ROUTES_PER_ENUMERATOR)
+    users = [User(
+        username=f'bench-admin-{run}', email=f'bench-admin-{run}@example.com',
+        password=password_hash, role=User.Role.ADMIN, is_staff=True,
+    )] + [User(
+        username=f'enum-{run}-{i}', email=f'enum-{run}-{i}@example.com', password=password_hash,
+        first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+        role=User.Role.ENUMERATOR,
+    ) for i in range(enumerator_count)]
+    User.objects.bulk_create(users, batch_size=batch_size)
+    counts['users'] = len(users)
+    enumerators = users[1:]
+
+    route_objects = [Route(
+        name=f'Route {i + 1}', assigned_to=enumerators[i % enumerator_count],
+        status=rng.choice(Route.Status.values),
+    ) for i in range(routes)]
+    Route.objects.bulk_create(route_objects, batch_size=batch_size)
+    counts['routes'] = len(route_objects)
+    report(f"Created {counts['users']} users and {counts['routes']} routes")
+
+    def farms():
+        for r, route in enumerate(route_objects):
+            base_lat, base_lng = rng.uniform(6.0, 9.5), rng.uniform(79.8, 81.8)
+            for f in range(farms_per_route):
+                yield Farm(
+                    route=route, name=f'Farm {r + 1}-{f + 1}',
+                    owner_name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    size_ha=_decimal(rng, 0.2, 25), address=f'{f + 1} Field Road, Village {r + 1}',
+                    latitude=_decimal(rng, base_lat - 0.05, base_lat + 0.05, 7),
+                    longitude=_decimal(rng, base_lng - 0.05, base_lng + 0.05, 7),
+                )
+
+    def children(farm_batch):
+        for farm in farm_batch:
+            for _ in range(crops_per_farm):
+                planted = _past_date(rng, today, 365)
+                yield Crop(
+                    farm=farm, crop_type=rng.choice(CROP_TYPES), variety=f'Variety {rng.randint(1, 5)}',
+                    planting_date=planted, expected_harvest=planted + datetime.timedelta(days=rng.randint(60, 180)),
+                )
+            for _ in range(soil_per_farm):
+                yield SoilSample(
+                    farm=farm, sample_date=_past_date(rng, today), pH=_decimal(rng, 4.5, 8.5),
+                    moisture_pct=_decimal(rng, 5, 60), nutrient_n=_decimal(rng, 5, 300),
+                    nutrient_p=_decimal(rng, 2, 150), nutrient_k=_decimal(rng, 10, 400),
+                )
+            for _ in range(water_per_farm):
+                yield WaterSample(
+                    farm=farm, sample_date=_past_date(rng, today), source=rng.choice(WATER_SOURCES),
+                    pH=_decimal(rng, 5.5, 8.5), turbidity=_decimal(rng, 0, 80),
+                )
+            for _ in range(pests_per_farm):
+                yield PestDiseaseReport(
+                    farm=farm, report_date=_past_date(rng, today),
+                    category=rng.choice(PestDiseaseReport.Category.values), name=rng.choice(PEST_NAMES),
+                    severity=rng.choices(PestDiseaseReport.Severity.values, weights=[5, 3, 2])[0],
+                    location_lat=_decimal(rng, float(farm.latitude) - 0.002, float(farm.latitude) + 0.002, 6),
+                    location_lng=_decimal(rng, float(farm.longitude) - 0.002, float(farm.longitude) + 0.002, 6),
+                )
+
+    keys = {Crop: 'crops', SoilSample: 'soil', WaterSample: 'water', PestDiseaseReport: 'pests'}
+    for farm_batch in _batched(farms(), batch_size):
+        with transaction.atomic():
+            Farm.objects.bulk_create(farm_batch)
+            counts['farms'] += len(farm_batch)
+            for batch in _batched(children(farm_batch), batch_size):
+                by_model = {}
+                for obj in batch:
+                    by_model.setdefault(type(obj), []).append(obj)
+                for model, objects in by_model.items():
+                    model.objects.bulk_create(objects)
+                    counts[keys[model]] += len(objects)
+        report(f"Created {counts['farms']} farms")
+
+    # bulk_create skips the signals maintaining the search documents and
+    # the autocomplete indexes
+    with transaction.atomic():
+        rebuild_index(batch_size=batch_size)
+    autocomplete.invalidate()
+    report('Rebuilt the search index')
+
+    return counts
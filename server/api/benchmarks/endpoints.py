@@ -0,0 +1,61 @@
+"""Key API endpoints exercised by the benchmark suite and query-budget tests"""
+from collections import namedtuple
+
+from django.test import Client
+
+from api.authentication import ClaimsRefreshToken
+from api.models import User, Farm
+
+# path may reference {farm} (a farm on one of the enumerator's routes)
+Endpoint = namedtuple('Endpoint', ['name', 'role', 'path'])
+
+ENDPOINTS = [
+    Endpoint('farm-list', 'admin', '/api/farms/'),
+    Endpoint('farm-list', 'enumerator', '/api/farms/'),
+    Endpoint('farm-detail', 'admin', '/api/farms/{farm}/'),
+    Endpoint('farm-detail', 'enumerator', '/api/farms/{farm}/'),
+    Endpoint('route-list', 'admin', '/api/routes/'),
+    Endpoint('route-list', 'enumerator', '/api/routes/'),
+    Endpoint('dashboard', 'admin', '/api/dashboard/'),
+    Endpoint('dashboard', 'enumerator', '/api/dashboard/'),
+    Endpoint('soilsample-list', 'admin', '/api/soil-samples/?min_ph=6&max_ph=7'),
+    Endpoint('soilsample-list', 'enumerator', '/api/soil-samples/?farm={farm}'),
+    Endpoint('watersample-list', 'admin', '/api/water-samples/?farm={farm}'),
+    Endpoint('pestdisease-list', 'admin', '/api/pest-disease/?severity=high'),
+    Endpoint('crop-list', 'admin', '/api/crops/'),
+    Endpoint('analytics_soil', 'admin', '/api/analytics/soil/?group_by=route,month&percentiles=50,90'),
+    Endpoint('analytics_water', 'enumerator', '/api/analytics/water/?group_by=month'),
+    Endpoint('analytics_pests', 'admin', '/api/analytics/pests/?group_by=route'),
+    Endpoint('analytics_pest_hotspots', 'admin',
+             '/api/analytics/pests/hotspots/?date_from=2024-01-01&date_to=2025-12-31'),
+    Endpoint('search', 'admin', '/api/search/?q=farm'),
+    Endpoint('autocomplete_farms', 'enumerator', '/api/autocomplete/farms/?q=farm'),
+    Endpoint('export_farms', 'admin', '/api/export/farms/'),
+    Endpoint('export_soil_samples', 'admin', '/api/export/soil-samples/'),
+    Endpoint('export_water_samples', 'admin', '/api/export/water-samples/'),
+    Endpoint('export_pest_disease', 'admin', '/api/export/pest-disease/'),
+]
+
+
+def endpoint_label(endpoint):
+    return f'{endpoint.name}[{endpoint.role}]'
+
+
+def role_clients():
+    """Authenticated test clients for an admin and an enumerator owning farms"""
+    admin = User.objects.filter(role=User.Role.ADMIN).order_by('username').first()
+    farm = Farm.objects.select_related('route__assigned_to').order_by('name').first()
+    enumerator = farm.route.assigned_to
+
+    clients = {}
+    for role, user in [('admin', admin), ('enumerator', enumerator)]:
+        token = ClaimsRefreshToken.for_user(user).access_token
+        clients[role] = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return clients, {'farm': farm.pk}
+
+
+def consume(response):
+    """Return the full body size, draining streaming responses"""
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
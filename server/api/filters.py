@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework import filters
+
+from api.models import SearchDocument
+from api.search import matching_documents
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter answered from the full-text search index.
+
+    Views name their document kind in `search_kind`; every search term
+    then has to match a word prefix in the row's document instead of a
+    substring of one of `search_fields`, which stay the fallback when
+    SEARCH_USE_INDEX is off.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, 'search_kind', None)
+        terms = self.get_search_terms(request)
+        if not terms or kind is None or not settings.SEARCH_USE_INDEX:
+            return super().filter_queryset(request, queryset, view)
+
+        documents = matching_documents(SearchDocument.objects.filter(kind=kind), ' '.join(terms))
+        if documents is None:
+            return super().filter_queryset(request, queryset, view)
+        return queryset.filter(pk__in=documents.values('object_id'))
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+    Argon2PasswordHasher,
+)
+
+# Each hasher keeps Django's algorithm name, so hashes created with other
+# parameters still verify and are transparently re-encoded on the next
+# successful login (see must_update).
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count taken from settings"""
+
+    iterations = getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with work factor, block size and parallelism taken from settings"""
+
+    work_factor = getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', ScryptPasswordHasher.work_factor)
+    block_size = getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', ScryptPasswordHasher.block_size)
+    parallelism = getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', ScryptPasswordHasher.parallelism)
+    # OpenSSL refuses to allocate more than 32 MiB unless told otherwise
+    maxmem = 2 * 128 * work_factor * block_size * parallelism
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id (requires argon2-cffi) with cost parameters taken from settings"""
+
+    time_cost = getattr(settings, 'PASSWORD_ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+    memory_cost = getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+    parallelism = getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
@@ -0,0 +1,179 @@
+"""
+Pest/disease outbreak hotspots.
+
+Reports with a GPS position are binned into square grid cells of
+`cell_size` degrees and into time windows of `window` days. Windows are
+aligned on multiples of `window` days since 1970-01-01, so a window's
+cells never depend on the range asked for and can be cached on their own.
+A cell is a hotspot when it holds at least `min_high` high-severity
+reports.
+
+Binning is vectorized with NumPy when it is installed, with an equivalent
+pure Python loop otherwise. Cached windows are invalidated through
+generation numbers kept in the database, so that every worker sees them:
+a report change bumps the generation of its report date, which only
+invalidates the windows covering that day, and moving a farm to another
+route bumps the global generation (see api.signals).
+"""
+import datetime
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+
+from api.models import CacheGeneration, PestDiseaseReport
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+SEVERITIES = PestDiseaseReport.Severity.values
+HIGH = SEVERITIES.index(PestDiseaseReport.Severity.HIGH)
+
+EPOCH = datetime.date(1970, 1, 1)
+GENERATION = 'hotspots'
+DAY_GENERATION = 'hotspots:{:%Y-%m-%d}'
+
+
+def window_bounds(date, days):
+    """First and last day of the aligned window containing `date`"""
+    start = EPOCH + datetime.timedelta(days=(date - EPOCH).days // days * days)
+    return start, start + datetime.timedelta(days=days - 1)
+
+
+def windows_between(date_from, date_to, days):
+    """Aligned windows covering date_from..date_to, oldest first"""
+    start, _ = window_bounds(date_from, days)
+    windows = []
+    while start <= date_to:
+        windows.append((start, start + datetime.timedelta(days=days - 1)))
+        start += datetime.timedelta(days=days)
+    return windows
+
+
+def _bin_numpy(lats, lngs, severities, cell_size):
+    rows = np.floor(np.asarray(lats, dtype=float) / cell_size).astype(np.int64)
+    cols = np.floor(np.asarray(lngs, dtype=float) / cell_size).astype(np.int64)
+    cells, inverse = np.unique(np.stack([rows, cols], axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(
+        inverse * len(SEVERITIES) + np.asarray(severities, dtype=np.int64),
+        minlength=len(cells) * len(SEVERITIES),
+    ).reshape(len(cells), len(SEVERITIES))
+    return [(int(row), int(col), counts[i].tolist()) for i, (row, col) in enumerate(cells.tolist())]
+
+
+def _bin_python(lats, lngs, severities, cell_size):
+    counts = Counter(
+        (math.floor(lat / cell_size), math.floor(lng / cell_size), severity)
+        for lat, lng, severity in zip(lats, lngs, severities)
+    )
+    cells = {}
+    for (row, col, severity), count in counts.items():
+        cells.setdefault((row, col), [0] * len(SEVERITIES))[severity] = count
+    return [(row, col, cells[row, col]) for row, col in sorted(cells)]
+
+
+def bin_reports(lats, lngs, severities, cell_size):
+    """
+    (row, col, per-severity counts) of every non-empty grid cell, ordered
+    by row then column. severities are indexes into SEVERITIES.
+    """
+    if not lats:
+        return []
+    binner = _bin_numpy if np is not None else _bin_python
+    return binner(lats, lngs, severities, cell_size)
+
+
+def window_cells(queryset, start, end, cell_size, min_high):
+    """Grid cells of the reports dated start..end in `queryset`"""
+    rows = queryset.filter(
+        report_date__range=(start, end), location_lat__isnull=False, location_lng__isnull=False,
+    ).values_list('location_lat', 'location_lng', 'severity')
+
+    lats, lngs, severities = [], [], []
+    for lat, lng, severity in rows.order_by().iterator():
+        lats.append(float(lat))
+        lngs.append(float(lng))
+        severities.append(SEVERITIES.index(severity))
+
+    cells = []
+    for row, col, counts in bin_reports(lats, lngs, severities, cell_size):
+        south, west = row * cell_size, col * cell_size
+        cells.append({
+            'lat': round(south + cell_size / 2, 6),
+            'lng': round(west + cell_size / 2, 6),
+            'bounds': [round(south, 6), round(west, 6), round(south + cell_size, 6), round(west + cell_size, 6)],
+            'count': sum(counts),
+            **dict(zip(SEVERITIES, counts)),
+            'hotspot': counts[HIGH] >= min_high,
+        })
+    return cells
+
+
+def generations(start, end):
+    """The global generation and {date: generation} of the days start..end that changed"""
+    rows = CacheGeneration.objects.filter(
+        Q(name=GENERATION) | Q(name__range=(DAY_GENERATION.format(start), DAY_GENERATION.format(end)))
+    ).values_list('name', 'value')
+    current, days = 1, {}
+    for name, value in rows:
+        if name == GENERATION:
+            current = value
+        else:
+            days[datetime.date.fromisoformat(name.split(':')[1])] = value
+    return current, days
+
+
+def _bump(name):
+    updated = CacheGeneration.objects.filter(name=name).update(value=F('value') + 1)
+    if not updated:
+        _, created = CacheGeneration.objects.get_or_create(name=name, defaults={'value': 2})
+        if not created:
+            CacheGeneration.objects.filter(name=name).update(value=F('value') + 1)
+
+
+def bump_generation():
+    """Invalidate every cached window"""
+    _bump(GENERATION)
+
+
+def bump_dates(dates):
+    """Invalidate the cached windows covering any of `dates`"""
+    for date in sorted(dates):
+        _bump(DAY_GENERATION.format(date))
+
+
+def hotspot_windows(queryset, windows, cell_size, min_high, cache_key):
+    """
+    Cells of each window, from the cache when possible. cache_key
+    identifies what `queryset` covers (e.g. the user's scope).
+    """
+    current, days = generations(windows[0][0], windows[-1][1])
+
+    def key(start, end):
+        # Day generations only grow, so their sum changes with any of them
+        window_generation = sum(value for day, value in days.items() if start <= day <= end)
+        return (f'hotspots:{current}.{window_generation}:{cache_key}:{start:%Y%m%d}:{end:%Y%m%d}:'
+                f'{cell_size:g}:{min_high}')
+
+    keys = {window: key(*window) for window in windows}
+    cached = cache.get_many(list(keys.values()))
+    today = datetime.date.today()
+
+    results, missing = [], {}
+    for window, key in keys.items():
+        cells = cached.get(key)
+        if cells is None:
+            cells = window_cells(queryset, *window, cell_size, min_high)
+            # The current window still fills up, so keep it only briefly
+            timeout = settings.HOTSPOT_CACHE_TIMEOUT if window[1] < today else settings.HOTSPOT_CURRENT_CACHE_TIMEOUT
+            missing.setdefault(timeout, {})[key] = cells
+        results.append({'start': window[0], 'end': window[1], 'cells': cells})
+
+    for timeout, values in missing.items():
+        cache.set_many(values, timeout=timeout)
+    return results
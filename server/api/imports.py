@@ -0,0 +1,296 @@
+"""
+Bulk import of farms and soil samples from CSV or XLSX files.
+
+Files are read row by row (XLSX through openpyxl's read-only mode, when
+it is installed) and validated in chunks by the same serializers as the
+API, so imported rows follow the same rules as ones entered one at a
+time. The related objects a chunk refers to are fetched with one query,
+and the value rules of api.validation are checked for the whole chunk at
+once. The valid rows of each chunk are inserted with bulk_create in their
+own transaction, together with their search documents. A chunk breaking a
+database constraint (say, a route deleted since the chunk was validated)
+is inserted again one row at a time, rejecting the rows that fail.
+
+Rejected rows are written to an error report: the original columns plus
+the row number and the errors, so the report can be corrected and
+imported again (unknown columns are ignored).
+"""
+import csv
+import datetime
+import io
+import os
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from api import autocomplete, search
+from api.serializers import FarmCreateUpdateSerializer, SoilSampleSerializer
+from api.validation import validate_batch
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+ImportType = namedtuple('ImportType', ['serializer', 'search_kind'])
+
+IMPORT_TYPES = {
+    'farms': ImportType(FarmCreateUpdateSerializer, search.Kind.FARM),
+    'soil_samples': ImportType(SoilSampleSerializer, search.Kind.SOIL_SAMPLE),
+}
+
+# Rows validated and inserted per transaction
+CHUNK_SIZE = 2000
+# Rejected rows included in import results; the report has all of them
+MAX_LISTED_ERRORS = 20
+
+REPORT_NAME_RE = re.compile(r'^[a-z_]+-\d{8}-\d{6}-[0-9a-f]{8}\.csv$')
+
+
+class ImportFileError(Exception):
+    """
+    The file can't be imported (format, missing columns, unreadable rows).
+    `result` holds the counts of import_rows() when rows were already
+    processed, and possibly inserted, before the error.
+    """
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+def report_dir():
+    return Path(settings.IMPORT_REPORT_DIR)
+
+
+def report_name(kind):
+    return f"{kind}-{datetime.datetime.now():%Y%m%d-%H%M%S}-{os.urandom(4).hex()}.csv"
+
+
+class FormRow(dict):
+    """
+    The filled cells of a row, read by serializer fields the way they
+    read HTML form input, so JSON fields parse their text. Empty cells are
+    left out and count as missing.
+    """
+
+    def getlist(self, key):
+        return [self[key]] if key in self else []
+
+
+class ChunkRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field resolving keys from the objects fetched for the current chunk"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.objects = {}
+
+    def to_pk(self, data):
+        return self.queryset.model._meta.pk.to_python(data)
+
+    def prefetch(self, values):
+        pks = set()
+        for value in values:
+            try:
+                pks.add(self.to_pk(value))
+            except (DjangoValidationError, TypeError, ValueError):
+                pass
+        self.objects = self.queryset.in_bulk(pks)
+
+    def to_internal_value(self, data):
+        try:
+            pk = self.to_pk(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.objects[pk]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime.datetime):
+        return value.date() if value.time() == datetime.time() else value.isoformat()
+    return value
+
+
+def read_rows(file, name):
+    """
+    Header and row iterator of a binary CSV or XLSX file, chosen by the
+    file name. Rows are yielded as lists of cells without reading the
+    whole file.
+    """
+    extension = Path(name).suffix.lower()
+    if extension == '.csv':
+        reader = csv.reader(io.TextIOWrapper(file, encoding='utf-8-sig', newline=''))
+    elif extension == '.xlsx':
+        if openpyxl is None:
+            raise ImportFileError('XLSX files need the openpyxl package; upload a CSV file instead')
+        try:
+            workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        except Exception as exc:
+            raise ImportFileError(f'Not a readable XLSX file ({exc})')
+        reader = ([_cell(value) for value in row] for row in workbook.active.iter_rows(values_only=True))
+    else:
+        raise ImportFileError('Upload a .csv or .xlsx file')
+
+    try:
+        header = [str(column).strip() for column in next(reader)]
+    except StopIteration:
+        raise ImportFileError('The file is empty')
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise ImportFileError(f'Not a readable CSV file ({exc})')
+    return header, _readable(reader)
+
+
+def _readable(reader):
+    """Rows of `reader`, turning decoding and CSV errors into ImportFileError"""
+    number = 1  # the header
+    try:
+        for values in reader:
+            number += 1
+            yield values
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # The file is decoded in blocks, so the bad data may be further down
+        raise ImportFileError(f'Row {number + 1} or a later one is not readable ({exc})')
+
+
+def _messages(detail):
+    """Flatten a ValidationError detail into {field: message}"""
+    if not isinstance(detail, dict):
+        detail = {'non_field_errors': detail}
+    return {
+        field: ' '.join(str(message) for message in messages) if isinstance(messages, list) else str(messages)
+        for field, messages in detail.items()
+    }
+
+
+def _chunks(rows, size):
+    chunk = []
+    # The header is row 1, as in a spreadsheet
+    for number, values in enumerate(rows, start=2):
+        if any(value != '' for value in values):
+            chunk.append((number, values))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _save(import_type, objects):
+    with transaction.atomic():
+        import_type.serializer.Meta.model.objects.bulk_create(objects)
+        search.index_objects(import_type.search_kind, [obj.pk for obj in objects], created=True)
+
+
+def _insert(import_type, valid):
+    """
+    Insert the validated rows of a chunk, one at a time if the chunk as a
+    whole breaks a constraint. Returns the number of rows created and
+    {row number: (values, errors)} for the rows that could not be.
+    """
+    model = import_type.serializer.Meta.model
+    try:
+        _save(import_type, [model(**data) for _, _, data in valid])
+        return len(valid), {}
+    except IntegrityError:
+        pass
+
+    created, rejected = 0, {}
+    for number, values, data in valid:
+        try:
+            _save(import_type, [model(**data)])
+        except IntegrityError as exc:
+            rejected[number] = (values, {'non_field_errors': f'Could not be saved ({exc})'})
+        else:
+            created += 1
+    return created, rejected
+
+
+def import_rows(kind, header, rows, report=None, dry_run=False, chunk_size=CHUNK_SIZE, context=None):
+    """
+    Validate `rows` (lists of cells under `header`) as `kind` objects and
+    insert the valid ones, unless `dry_run`. Rejected rows are written to
+    the `report` text file when given. Returns the row counts and the
+    first rejected rows.
+    """
+    import_type = IMPORT_TYPES[kind]
+    # Value rules shared with validate_batch are checked per chunk
+    rules = getattr(import_type.serializer, 'rules', None)
+    validator = import_type.serializer(context={**(context or {}), 'batch_rules': bool(rules)})
+    fields = validator.fields
+    related = {}
+    for name, field in list(fields.items()):
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and not field.read_only:
+            fields[name] = related[name] = ChunkRelatedField(
+                queryset=field.queryset, required=field.required, allow_null=field.allow_null,
+            )
+
+    writable = {
+        name for name, field in fields.items()
+        if not field.read_only and not isinstance(field, serializers.FileField)
+    }
+    missing = sorted(name for name in writable if fields[name].required and name not in header)
+    if missing:
+        raise ImportFileError(f"Missing required column(s): {', '.join(missing)}")
+    columns = [(name, position) for position, name in enumerate(header) if name in writable]
+
+    writer = csv.writer(report) if report is not None else None
+    if writer:
+        writer.writerow(['row', 'errors', *header])
+    today = timezone.now().date()
+    result = {'rows': 0, 'created': 0, 'failed': 0, 'errors': []}
+
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            records = [
+                (number, values, FormRow((name, values[position]) for name, position in columns
+                                         if position < len(values) and values[position] != ''))
+                for number, values in chunk
+            ]
+            for name, field in related.items():
+                field.prefetch(record[name] for _, _, record in records if name in record)
+
+            valid, rejected = [], {}
+            for number, values, record in records:
+                try:
+                    valid.append((number, values, validator.run_validation(record)))
+                except serializers.ValidationError as exc:
+                    rejected[number] = (values, _messages(exc.detail))
+            if rules and valid:
+                parsed = {field: [data.get(field) for _, _, data in valid] for field in rules}
+                for row, errors in validate_batch(rules, parsed, today).items():
+                    number, values, _ = valid[row]
+                    rejected[number] = (values, errors)
+                valid = [item for item in valid if item[0] not in rejected]
+
+            if valid and not dry_run:
+                created, failed = _insert(import_type, valid)
+                result['created'] += created
+                rejected.update(failed)
+
+            for number, (values, errors) in sorted(rejected.items()):
+                result['failed'] += 1
+                if len(result['errors']) < MAX_LISTED_ERRORS:
+                    result['errors'].append({'row': number, 'errors': errors})
+                if writer:
+                    writer.writerow([number, '; '.join(f'{field}: {message}' for field, message in errors.items()),
+                                     *values])
+            result['rows'] += len(records)
+    except ImportFileError as exc:
+        # Earlier chunks are already committed
+        exc.result = result
+        raise
+    finally:
+        if kind == 'farms' and result['created']:
+            autocomplete.invalidate()
+    return result
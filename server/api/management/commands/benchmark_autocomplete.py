@@ -0,0 +1,55 @@
+import random
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from api.autocomplete import FarmIndex
+from api.benchmarks import summarize, time_call
+from api.benchmarks.data import FIRST_NAMES, LAST_NAMES
+
+FARMS_PER_ROUTE = 100
+ROUTES_PER_ENUMERATOR = 5
+QUERIES = ['f', 'fa', 'farm 1', 'farm 12-3', 'am', 'amara', 'kas per', 'silva', 'wije', 'farm 99', 'zz']
+
+
+class Command(BaseCommand):
+    help = (
+        'Time farm autocomplete lookups, index build and incremental updates on an '
+        'in-memory index of synthetic farms (no database needed).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--farms', type=int, default=1_000_000, help='Farms in the index')
+        parser.add_argument('--repeat', type=int, default=200, help='Timed lookups per query')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        routes = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(max(1, options['farms'] // FARMS_PER_ROUTE))]
+        rows = [
+            (uuid.UUID(int=rng.getrandbits(128)), f'Farm {i // FARMS_PER_ROUTE + 1}-{i % FARMS_PER_ROUTE + 1}',
+             f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', routes[i // FARMS_PER_ROUTE])
+            for i in range(options['farms'])
+        ]
+
+        index = FarmIndex()
+        elapsed, _ = time_call(index.load, rows)
+        self.stdout.write(f"Indexed {len(rows)} farms ({len(index.entries)} words) in {elapsed:.1f}s")
+
+        enumerator_routes = frozenset(rng.sample(routes, min(ROUTES_PER_ENUMERATOR, len(routes))))
+        for role, route_ids in [('admin', None), ('enumerator', enumerator_routes)]:
+            durations = []
+            for query in QUERIES:
+                durations += [time_call(index.search, query, route_ids)[0] for _ in range(options['repeat'])]
+            stats = summarize(durations)
+            self.stdout.write(
+                f"{role:10} lookups  p50 {stats['p50_ms']:7.3f} ms  p95 {stats['p95_ms']:7.3f} ms  "
+                f"p99 {stats['p99_ms']:7.3f} ms  max {stats['max_ms']:7.3f} ms"
+            )
+
+        updates = []
+        for farm_id, name, owner_name, route_id in rng.sample(rows, min(100, len(rows))):
+            updates.append(time_call(index.add, farm_id, f'{name} Estate', owner_name, route_id)[0])
+            updates.append(time_call(index.remove, farm_id)[0])
+        stats = summarize(updates)
+        self.stdout.write(f"{'updates':10}          p50 {stats['p50_ms']:7.3f} ms  p95 {stats['p95_ms']:7.3f} ms")
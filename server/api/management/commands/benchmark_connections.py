@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+from api.benchmarks import summarize, time_call
+
+PERSISTENT_MAX_AGE = 600
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the per-request cost of opening database connections: a new connection per '
+        'request, persistent connections (CONN_MAX_AGE) and, with DB_POOL, the connection pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Simulated requests per mode')
+        parser.add_argument('--queries', type=int, default=1, help='Queries per request')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        settings_dict = connection.settings_dict
+        pool_options = settings_dict['OPTIONS'].pop('pool', None)
+        original_max_age = settings_dict['CONN_MAX_AGE']
+
+        modes = [('new connection', 0, None), ('persistent', PERSISTENT_MAX_AGE, None)]
+        if pool_options:
+            modes.append(('pooled', 0, pool_options))
+
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == options['database']:
+                opened.append(connection)
+
+        connection_created.connect(count_connection)
+        baseline = None
+        try:
+            for label, max_age, pool in modes:
+                connection.close()
+                settings_dict['CONN_MAX_AGE'] = max_age
+                if pool:
+                    settings_dict['OPTIONS']['pool'] = pool
+                    # Fill the pool before timing
+                    self._request(connection, options['queries'])
+                    connection.pool.pop_stats()
+                opened.clear()
+                durations = [
+                    time_call(self._request, connection, options['queries'])[0]
+                    for _ in range(options['requests'])
+                ]
+                # Pooled requests take an open connection rather than connecting
+                connects = connection.pool.get_stats().get('connections_num', 0) if pool else len(opened)
+                settings_dict['OPTIONS'].pop('pool', None)
+
+                stats = summarize(durations)
+                baseline = baseline if baseline is not None else stats['mean_ms']
+                self.stdout.write(
+                    f"{label:15} mean {stats['mean_ms']:8.3f} ms  p50 {stats['p50_ms']:8.3f} ms  "
+                    f"p95 {stats['p95_ms']:8.3f} ms  connects {connects:4}  "
+                    f"saved {baseline - stats['mean_ms']:8.3f} ms/request"
+                )
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = original_max_age
+            if pool_options:
+                settings_dict['OPTIONS']['pool'] = pool_options
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {options['requests']} requests per mode on {connection.vendor} "
+            f"(health checks {'on' if settings_dict['CONN_HEALTH_CHECKS'] else 'off'})"
+        ))
+
+    def _request(self, connection, queries):
+        """One request's worth of database work, between the signals Django sends around requests"""
+        request_started.send(sender=self.__class__)
+        try:
+            with connection.cursor() as cursor:
+                for _ in range(queries):
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+        finally:
+            request_finished.send(sender=self.__class__)
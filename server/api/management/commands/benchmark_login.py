@@ -0,0 +1,113 @@
+import json
+import time
+import uuid
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+
+from api.benchmarks import summarize, time_call
+from api.models import User
+
+TOKEN_PATH = '/api/auth/token/'
+
+
+class Command(BaseCommand):
+    help = 'Measure /api/auth/token/ login throughput to size workers for login bursts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Total number of logins')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel clients')
+        parser.add_argument('--url', help='Base URL of a running server; benchmarks in-process if omitted')
+        parser.add_argument('--username', help='Existing user to log in as (required with --url)')
+        parser.add_argument('--password', help='Password of --username')
+
+    def handle(self, *args, **options):
+        if options['url'] and not (options['username'] and options['password']):
+            raise CommandError('--url requires --username and --password')
+
+        self._report_hasher_cost()
+
+        temp_user = None
+        username, password = options['username'], options['password']
+        if not options['url'] and not username:
+            username, password = f'bench-login-{uuid.uuid4().hex[:8]}', uuid.uuid4().hex
+            temp_user = User.objects.create_user(
+                username=username, email=f'{username}@bench.invalid', password=password
+            )
+
+        try:
+            login = self._remote_login(options['url']) if options['url'] else self._local_login()
+            payload = json.dumps({'username': username, 'password': password})
+
+            def worker(count):
+                durations, errors = [], 0
+                for _ in range(count):
+                    elapsed, ok = time_call(login, payload)
+                    durations.append(elapsed)
+                    errors += 0 if ok else 1
+                connections.close_all()
+                return durations, errors
+
+            concurrency = max(1, options['concurrency'])
+            shares = [options['requests'] // concurrency] * concurrency
+            for i in range(options['requests'] % concurrency):
+                shares[i] += 1
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                results = list(pool.map(worker, shares))
+            wall = time.perf_counter() - started
+        finally:
+            if temp_user is not None:
+                temp_user.delete()
+
+        durations = [d for result in results for d in result[0]]
+        errors = sum(result[1] for result in results)
+        stats = summarize(durations)
+        self.stdout.write(f"Logins: {stats['count']} ({errors} failed) with concurrency {concurrency}")
+        self.stdout.write(f"Throughput: {stats['count'] / wall:.1f} logins/s")
+        self.stdout.write(
+            f"Latency ms: mean {stats['mean_ms']}, p50 {stats['p50_ms']}, "
+            f"p95 {stats['p95_ms']}, p99 {stats['p99_ms']}, max {stats['max_ms']}"
+        )
+
+    def _report_hasher_cost(self):
+        hasher = get_hasher()
+        encoded = make_password('benchmark-password')
+        elapsed = min(time_call(check_password, 'benchmark-password', encoded)[0] for _ in range(3))
+        self.stdout.write(
+            f"Hasher {hasher.algorithm} ({settings.PASSWORD_HASHERS[0]}): "
+            f"{elapsed * 1000:.1f} ms per check, ~{1 / elapsed:.0f} checks/s per core"
+        )
+
+    def _local_login(self):
+        host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost')
+
+        def login(payload):
+            client = Client(HTTP_HOST=host)
+            response = client.post(TOKEN_PATH, payload, content_type='application/json')
+            return response.status_code == 200
+
+        return login
+
+    def _remote_login(self, base_url):
+        url = base_url.rstrip('/') + TOKEN_PATH
+
+        def login(payload):
+            request = urllib.request.Request(
+                url, data=payload.encode(), headers={'Content-Type': 'application/json'}
+            )
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    return response.status == 200
+            except urllib.error.URLError:
+                return False
+
+        return login
@@ -0,0 +1,80 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+from rest_framework.renderers import JSONRenderer
+
+from api.benchmarks import summarize, time_call
+from api.benchmarks.data import SCALES, generate_dataset
+from api.models import SoilSample, WaterSample, PestDiseaseReport, Crop
+from api.serializers import (
+    SoilSampleSerializer, WaterSampleSerializer, PestDiseaseReportSerializer, CropSerializer,
+)
+from api.serializers.values import values_serializer
+
+CASES = [
+    ('soil', SoilSample.objects.select_related('farm'), SoilSampleSerializer),
+    ('water', WaterSample.objects.select_related('farm'), WaterSampleSerializer),
+    ('pest', PestDiseaseReport.objects.select_related('farm'), PestDiseaseReportSerializer),
+    ('crop', Crop.objects.all(), CropSerializer),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare list serialization through ModelSerializers with the values() '
+        'fast path, checking both render identical JSON. Runs against a freshly '
+        'created test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', default='small', choices=sorted(SCALES), help='Dataset scale')
+        parser.add_argument('--rows', type=int, default=1000, help='Rows serialized per run')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per serializer')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            routes, farms_per_route, crops, soil, water, pests = SCALES[options['size']]
+            generate_dataset(
+                routes=routes, farms_per_route=farms_per_route, crops_per_farm=crops,
+                soil_per_farm=soil, water_per_farm=water, pests_per_farm=pests,
+            )
+            request = RequestFactory().get('/api/')
+            for name, queryset, serializer_class in CASES:
+                self._compare(name, queryset.order_by('pk')[:options['rows']], serializer_class,
+                              request, options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def _compare(self, name, queryset, serializer_class, request, repeat):
+        fast = values_serializer(serializer_class)
+        renderer = JSONRenderer()
+
+        # Rows are fetched outside the timed section: only serialization differs
+        instances = list(queryset)
+        rows = list(queryset.values(*fast.columns))
+
+        def drf():
+            data = serializer_class(instances, many=True, context={'request': request}).data
+            return renderer.render(data)
+
+        def values():
+            return renderer.render(fast.serialize(rows, request))
+
+        if drf() != values():
+            raise CommandError(f'{name}: values() output differs from {serializer_class.__name__}')
+
+        slow = summarize([time_call(drf)[0] for _ in range(repeat)])
+        quick = summarize([time_call(values)[0] for _ in range(repeat)])
+        speedup = slow['p50_ms'] / quick['p50_ms'] if quick['p50_ms'] else float('inf')
+        self.stdout.write(
+            f"{name:6} {len(rows):6d} rows  serializer p50 {slow['p50_ms']:9.2f} ms  "
+            f"values p50 {quick['p50_ms']:9.2f} ms  {speedup:5.1f}x"
+        )
@@ -0,0 +1,117 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from agrisurvey.db.sqlite import apply_pragmas, tuning_pragmas
+from api.benchmarks import summarize
+
+# Seconds sqlite3 waits for a lock by default, as Django's SQLite backend uses it
+DEFAULT_TIMEOUT = 5.0
+
+SCHEMA = [
+    'CREATE TABLE sample (id INTEGER PRIMARY KEY, farm_id INTEGER, ph REAL, notes TEXT, created_at REAL)',
+    'CREATE INDEX sample_farm ON sample (farm_id)',
+    'CREATE TABLE farm (id INTEGER PRIMARY KEY, samples INTEGER NOT NULL DEFAULT 0)',
+]
+FARMS = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure write throughput of parallel writers (plus readers) on a scratch SQLite database, '
+        'with SQLite defaults and with the SQLITE_TUNING profile.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='Parallel writing threads')
+        parser.add_argument('--writes', type=int, default=200, help='Write transactions per writer')
+        parser.add_argument('--readers', type=int, default=2, help='Threads reading while the writers run')
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix='agrisurvey-sqlite-')
+        try:
+            for label, pragmas in [('defaults', {}), ('tuned', tuning_pragmas())]:
+                path = os.path.join(directory, f'{label}.sqlite3')
+                self._create(path, pragmas)
+                wall, durations, errors, reads = self._run(path, pragmas, options)
+                stats = summarize(durations)
+                self.stdout.write(
+                    f"{label:9} {stats['count'] / wall:8.1f} writes/s  p50 {stats['p50_ms']:8.3f} ms  "
+                    f"p95 {stats['p95_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms  "
+                    f"locked {errors:4}  {reads / wall:8.1f} reads/s"
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {options['writers']} writers x {options['writes']} transactions, {options['readers']} readers"
+        ))
+
+    def _connect(self, path, pragmas):
+        # Autocommit with explicit BEGIN, as Django runs transactions
+        connection = sqlite3.connect(path, timeout=DEFAULT_TIMEOUT, isolation_level=None,
+                                     check_same_thread=False)
+        apply_pragmas(connection, pragmas)
+        return connection
+
+    def _create(self, path, pragmas):
+        connection = self._connect(path, pragmas)
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.executemany('INSERT INTO farm (id) VALUES (?)', [(i,) for i in range(FARMS)])
+        connection.close()
+
+    def _run(self, path, pragmas, options):
+        done = threading.Event()
+
+        def write(number):
+            connection = self._connect(path, pragmas)
+            durations, errors = [], 0
+            for i in range(options['writes']):
+                farm_id = (number * options['writes'] + i) % FARMS
+                start = time.perf_counter()
+                try:
+                    # A sample insert and the farm update that goes with it
+                    connection.execute('BEGIN')
+                    connection.execute(
+                        'INSERT INTO sample (farm_id, ph, notes, created_at) VALUES (?, ?, ?, ?)',
+                        (farm_id, 6.5, 'x' * 200, time.time()),
+                    )
+                    connection.execute('UPDATE farm SET samples = samples + 1 WHERE id = ?', (farm_id,))
+                    connection.execute('COMMIT')
+                    durations.append(time.perf_counter() - start)
+                except sqlite3.OperationalError:
+                    errors += 1
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+            connection.close()
+            return durations, errors
+
+        def read(_):
+            connection = self._connect(path, pragmas)
+            reads = 0
+            while not done.is_set():
+                try:
+                    connection.execute(
+                        'SELECT farm_id, count(*), avg(ph) FROM sample GROUP BY farm_id').fetchall()
+                    reads += 1
+                except sqlite3.OperationalError:
+                    pass
+            connection.close()
+            return reads
+
+        with ThreadPoolExecutor(max_workers=options['readers'] + options['writers']) as pool:
+            readers = [pool.submit(read, i) for i in range(options['readers'])]
+            start = time.perf_counter()
+            results = list(pool.map(write, range(options['writers'])))
+            wall = time.perf_counter() - start
+            done.set()
+            reads = sum(reader.result() for reader in readers)
+
+        durations = [duration for result in results for duration in result[0]]
+        return wall, durations, sum(result[1] for result in results), reads
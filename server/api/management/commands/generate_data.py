@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.data import SCALES, generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic routes, farms, crops, samples and pest reports with bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small',
+                            help='Preset dataset size (large = 10k routes, 1M farms, 10M samples)')
+        parser.add_argument('--routes', type=int, help='Override the number of routes')
+        parser.add_argument('--farms-per-route', type=int, help='Override farms per route')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        routes, farms_per_route, crops, soil, water, pests = SCALES[options['scale']]
+        routes = options['routes'] or routes
+        farms_per_route = options['farms_per_route'] or farms_per_route
+
+        start = time.perf_counter()
+        counts = generate_dataset(
+            routes=routes, farms_per_route=farms_per_route, crops_per_farm=crops,
+            soil_per_farm=soil, water_per_farm=water, pests_per_farm=pests,
+            batch_size=options['batch_size'], seed=options['seed'],
+            progress=lambda message: self.stdout.write(message),
+        )
+        elapsed = time.perf_counter() - start
+
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'✓ Generated {summary} in {elapsed:.1f}s'))
@@ -0,0 +1,46 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.imports import CHUNK_SIZE, IMPORT_TYPES, ImportFileError, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Import farms or soil samples from a CSV or XLSX file, validated like the API. '
+        'Rejected rows are written to an error report next to the file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('type', choices=sorted(IMPORT_TYPES), help='What the file holds')
+        parser.add_argument('path', help='CSV or XLSX file')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the rows')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per transaction')
+        parser.add_argument('--report', help='Error report path (default: <path>.errors.csv)')
+
+    def handle(self, *args, **options):
+        report_path = options['report'] or f"{options['path']}.errors.csv"
+        start = time.perf_counter()
+        try:
+            with open(options['path'], 'rb') as file, open(report_path, 'w', newline='', encoding='utf-8') as report:
+                header, rows = read_rows(file, options['path'])
+                result = import_rows(options['type'], header, rows, report, dry_run=options['dry_run'],
+                                     chunk_size=options['chunk_size'])
+        except ImportFileError as exc:
+            if exc.result is not None:
+                # Rows before the unreadable one were imported
+                raise CommandError(f"{exc}; {exc.result['created']} rows imported, "
+                                   f"{exc.result['failed']} rejected (see {report_path})")
+            raise CommandError(str(exc))
+        except OSError as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - start
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        count = result['rows'] - result['failed'] if options['dry_run'] else result['created']
+        self.stdout.write(self.style.SUCCESS(f"✓ {verb} {count} of {result['rows']} rows in {elapsed:.1f}s"))
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(f"{result['failed']} rows rejected, see {report_path}"))
+        else:
+            os.remove(report_path)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api import autocomplete
+from api.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Recreate the full-text search documents of every farm, sample and pest report, '
+        'and make running servers rebuild their farm autocomplete index. '
+        'Run after loading data with bulk_create or raw SQL, which skip the signals keeping them in sync.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Documents per INSERT')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        with transaction.atomic():
+            counts = rebuild_index(batch_size=options['batch_size'])
+        autocomplete.invalidate()
+        elapsed = time.perf_counter() - start
+
+        summary = ', '.join(f'{count} {kind}' for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"✓ Indexed {summary} in {elapsed:.1f}s"))
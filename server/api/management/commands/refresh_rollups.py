@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the daily analytics rollups with the samples and pest reports '
+        'changed since the last run. Meant to run periodically (e.g. from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every rollup from scratch')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rollup rows per INSERT')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        result = refresh_rollups(full=options['full'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        if result['farm_days'] is None:
+            scope = 'all rollups rebuilt'
+        else:
+            scope = f"{result['farm_days']} farm-days and {result['route_days']} route-days recomputed"
+        self.stdout.write(self.style.SUCCESS(f"✓ {scope}, {result['rows']} rows written in {elapsed:.1f}s"))
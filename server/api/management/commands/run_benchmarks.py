@@ -0,0 +1,138 @@
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from agrisurvey.middleware.queries import QueryRecorder
+from api.benchmarks import summarize
+from api.benchmarks.data import SCALES, generate_dataset
+from api.benchmarks.endpoints import ENDPOINTS, consume, endpoint_label, role_clients
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the key API endpoints at several dataset sizes and write a JSON '
+        'results file. Runs against freshly created test databases.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='tiny,small',
+                            help=f"Comma-separated scales from: {', '.join(sorted(SCALES))}")
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per endpoint')
+        parser.add_argument('--only', help='Comma-separated endpoint names to run')
+        parser.add_argument('--output', help='Results file (default: benchmark-results/<timestamp>-<commit>.json)')
+        parser.add_argument('--compare', help='Previous results file to print p50 deltas against')
+
+    def handle(self, *args, **options):
+        sizes = [size.strip() for size in options['sizes'].split(',') if size.strip()]
+        unknown = set(sizes) - set(SCALES)
+        if unknown:
+            raise CommandError(f"Unknown sizes: {', '.join(sorted(unknown))}")
+        only = set(options['only'].split(',')) if options['only'] else None
+        endpoints = [e for e in ENDPOINTS if only is None or e.name in only]
+
+        commit = self._git_commit()
+        results = {
+            'commit': commit,
+            'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sizes': {},
+        }
+
+        setup_test_environment()
+        try:
+            for size in sizes:
+                results['sizes'][size] = self._run_size(size, endpoints, options['repeat'])
+        finally:
+            teardown_test_environment()
+
+        output = options['output'] or os.path.join(
+            settings.BASE_DIR, 'benchmark-results',
+            f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{commit or 'nocommit'}.json",
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'✓ Results written to {output}'))
+
+        if options['compare']:
+            self._compare(options['compare'], results)
+
+    def _run_size(self, size, endpoints, repeat):
+        routes, farms_per_route, crops, soil, water, pests = SCALES[size]
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            start = time.perf_counter()
+            rows = generate_dataset(
+                routes=routes, farms_per_route=farms_per_route, crops_per_farm=crops,
+                soil_per_farm=soil, water_per_farm=water, pests_per_farm=pests,
+            )
+            self.stdout.write(f'[{size}] generated {sum(rows.values())} rows in {time.perf_counter() - start:.1f}s')
+
+            clients, context = role_clients()
+            timings = {}
+            for endpoint in endpoints:
+                client = clients[endpoint.role]
+                path = endpoint.path.format(**context)
+
+                # Warm-up run, also used to count queries and response size
+                with QueryRecorder() as recorder:
+                    response = client.get(path)
+                    size_bytes = consume(response)
+                if response.status_code != 200:
+                    raise CommandError(f'{path} returned {response.status_code}')
+
+                durations = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    consume(client.get(path))
+                    durations.append(time.perf_counter() - start)
+
+                label = endpoint_label(endpoint)
+                timings[label] = dict(summarize(durations), queries=recorder.count, bytes=size_bytes)
+                self.stdout.write(
+                    f"[{size}] {label:36} p50 {timings[label]['p50_ms']:9.2f} ms  "
+                    f"{recorder.count:4d} queries  {size_bytes:9d} bytes"
+                )
+            return {'rows': rows, 'endpoints': timings}
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+    def _compare(self, path, results):
+        with open(path) as fh:
+            previous = json.load(fh)
+        self.stdout.write(f"Compared with {previous.get('commit')} ({path}):")
+        for size, data in results['sizes'].items():
+            before = previous.get('sizes', {}).get(size, {}).get('endpoints', {})
+            for label, stats in data['endpoints'].items():
+                if label not in before or not before[label]['p50_ms']:
+                    continue
+                change = (stats['p50_ms'] - before[label]['p50_ms']) / before[label]['p50_ms'] * 100
+                self.stdout.write(
+                    f"[{size}] {label:36} p50 {before[label]['p50_ms']:9.2f} -> {stats['p50_ms']:9.2f} ms "
+                    f"({change:+.1f}%), queries {before[label]['queries']} -> {stats['queries']}"
+                )
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
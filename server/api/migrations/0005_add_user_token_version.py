@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-19 15:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_add_water_sample_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Bumped to revoke all tokens issued to the user'),
+        ),
+    ]
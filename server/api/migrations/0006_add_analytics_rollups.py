@@ -0,0 +1,100 @@
+# Generated by Django 4.2.10 on 2026-10-19 16:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_add_user_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('refreshed_through', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StaleRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('farm_id', models.UUIDField(null=True)),
+                ('route_id', models.UUIDField(null=True)),
+                ('date', models.DateField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RouteDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('dataset', models.CharField(choices=[('soil', 'Soil samples'), ('water', 'Water samples')], max_length=10)),
+                ('metric', models.CharField(max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('total_sq', models.FloatField(default=0)),
+                ('minimum', models.FloatField(null=True)),
+                ('maximum', models.FloatField(null=True)),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.route')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dataset', 'date'], name='api_routeda_dataset_8419f1_idx')],
+                'unique_together': {('route', 'date', 'dataset', 'metric')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RouteDailyPestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('severity', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.route')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='api_routeda_date_2fefad_idx')],
+                'unique_together': {('route', 'date', 'severity')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FarmDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('dataset', models.CharField(choices=[('soil', 'Soil samples'), ('water', 'Water samples')], max_length=10)),
+                ('metric', models.CharField(max_length=32)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.FloatField(default=0)),
+                ('total_sq', models.FloatField(default=0)),
+                ('minimum', models.FloatField(null=True)),
+                ('maximum', models.FloatField(null=True)),
+                ('farm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.farm')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.route')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dataset', 'date'], name='api_farmdai_dataset_8fd4b7_idx')],
+                'unique_together': {('farm', 'date', 'dataset', 'metric')},
+            },
+        ),
+        migrations.CreateModel(
+            name='FarmDailyPestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('severity', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('farm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.farm')),
+                ('route', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.route')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='api_farmdai_date_3295e2_idx')],
+                'unique_together': {('farm', 'date', 'severity')},
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.10 on 2026-10-19 16:20
+
+from django.db import migrations, models
+
+# Full-text index over title (weighted higher) and body, per database
+INDEX_SQL = {
+    'postgresql': [
+        """
+        ALTER TABLE api_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX api_searchdocument_vector_gin ON api_searchdocument USING GIN (search_vector)",
+    ],
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE api_searchdocument_fts USING fts5(
+            title, body, content='api_searchdocument', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER api_searchdocument_fts_insert AFTER INSERT ON api_searchdocument BEGIN
+            INSERT INTO api_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END
+        """,
+        """
+        CREATE TRIGGER api_searchdocument_fts_delete AFTER DELETE ON api_searchdocument BEGIN
+            INSERT INTO api_searchdocument_fts(api_searchdocument_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+        END
+        """,
+        """
+        CREATE TRIGGER api_searchdocument_fts_update AFTER UPDATE ON api_searchdocument BEGIN
+            INSERT INTO api_searchdocument_fts(api_searchdocument_fts, rowid, title, body)
+            VALUES ('delete', old.id, old.title, old.body);
+            INSERT INTO api_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+        END
+        """,
+    ],
+}
+
+DROP_SQL = {
+    'postgresql': [
+        "DROP INDEX IF EXISTS api_searchdocument_vector_gin",
+        "ALTER TABLE api_searchdocument DROP COLUMN IF EXISTS search_vector",
+    ],
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS api_searchdocument_fts_insert",
+        "DROP TRIGGER IF EXISTS api_searchdocument_fts_delete",
+        "DROP TRIGGER IF EXISTS api_searchdocument_fts_update",
+        "DROP TABLE IF EXISTS api_searchdocument_fts",
+    ],
+}
+
+
+def create_index(apps, schema_editor):
+    # Other databases fall back to substring search (see api.search)
+    for sql in INDEX_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    for sql in DROP_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_add_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('farm', 'Farm'), ('soil_sample', 'Soil sample'), ('water_sample', 'Water sample'), ('pest_report', 'Pest/disease report')], max_length=20)),
+                ('object_id', models.UUIDField()),
+                ('farm_id', models.UUIDField()),
+                ('route_id', models.UUIDField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['farm_id'], name='api_searchd_farm_id_5efe57_idx')],
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
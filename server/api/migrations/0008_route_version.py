@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-19 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_add_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='route',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
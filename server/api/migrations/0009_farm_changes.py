@@ -0,0 +1,20 @@
+# Generated by Django 4.2.10 on 2026-10-19 17:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_route_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FarmChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('farm_id', models.UUIDField(null=True)),
+            ],
+        ),
+    ]
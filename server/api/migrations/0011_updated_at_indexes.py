@@ -0,0 +1,25 @@
+# Generated by Django 4.2.10 on 2026-10-19 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_cache_generations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pestdiseasereport',
+            index=models.Index(fields=['updated_at'], name='api_pestdis_updated_fd760e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='soilsample',
+            index=models.Index(fields=['updated_at'], name='api_soilsam_updated_ae03e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='watersample',
+            index=models.Index(fields=['updated_at'], name='api_watersa_updated_1d263b_idx'),
+        ),
+    ]
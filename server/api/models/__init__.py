@@ -1,15 +1,30 @@
 from api.models.auth import User
-from api.models.farm import Farm, Crop
+from api.models.farm import Farm, Crop, FarmChange
 from api.models.route import Route
 from api.models.sampling import SoilSample, WaterSample
 from api.models.pest import PestDiseaseReport
+from api.models.rollup import (
+    FarmDailyRollup, RouteDailyRollup, FarmDailyPestRollup, RouteDailyPestRollup,
+    StaleRollup, RollupWatermark,
+)
+from api.models.search import SearchDocument
+from api.models.cache import CacheGeneration
 
 __all__ = [
     'User',
     'Route',
     'Farm',
     'Crop',
+    'FarmChange',
     'SoilSample',
     'WaterSample',
     'PestDiseaseReport',
+    'FarmDailyRollup',
+    'RouteDailyRollup',
+    'FarmDailyPestRollup',
+    'RouteDailyPestRollup',
+    'StaleRollup',
+    'RollupWatermark',
+    'SearchDocument',
+    'CacheGeneration',
 ]
\ No newline at end of file
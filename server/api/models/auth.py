@@ -18,6 +18,10 @@ class User(AbstractUser):
         choices=Role.choices,
         default=Role.ENUMERATOR
     )
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped to revoke all tokens issued to the user"
+    )
 
     REQUIRED_FIELDS = ['email', 'role']
 
@@ -32,3 +36,30 @@ class User(AbstractUser):
     def is_enumerator(self):
         return self.role == self.Role.ENUMERATOR
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._saved_role = user.__dict__.get('role')
+        return user
+
+    def save(self, *args, **kwargs):
+        # Tokens carry the role as a claim, so password and role changes
+        # revoke them, whatever made the change (API, admin, changepassword).
+        # Hash upgrades on login reset _password and revoke nothing
+        saved_role = getattr(self, '_saved_role', None)
+        revoked = not self._state.adding and (
+            self._password is not None or (saved_role is not None and self.role != saved_role)
+        )
+        if revoked:
+            self.revoke_tokens()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'token_version'}
+        super().save(*args, **kwargs)
+        self._saved_role = self.role
+        if revoked:
+            from api.authentication import token_versions
+            token_versions.discard(self.pk)
+
+    def revoke_tokens(self):
+        """Invalidate every token issued so far; takes effect on the next save"""
+        self.token_version += 1
@@ -0,0 +1,15 @@
+from django.db import models
+
+
+class CacheGeneration(models.Model):
+    """
+    Generation number of a family of cached values, bumped to invalidate
+    them all. Kept in the database so every worker sees the bump, whatever
+    the cache backend.
+    """
+
+    name = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=1)
+
+    def __str__(self):
+        return f"{self.name} #{self.value}"
@@ -80,4 +80,15 @@ class Crop(models.Model):
         return f"{self.crop_type} - {self.farm.name}"
 
     class Meta:
-        ordering = ['-planting_date']
\ No newline at end of file
+        ordering = ['-planting_date']
+
+class FarmChange(models.Model):
+    """
+    Log of committed farm saves and deletions, replayed by every process's
+    autocomplete index (see api.autocomplete). A change without a farm_id
+    makes the indexes rebuild. The farm ID is kept without a foreign key so
+    it outlives deleted farms.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    farm_id = models.UUIDField(null=True)
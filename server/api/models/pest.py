@@ -65,4 +65,6 @@ class PestDiseaseReport(models.Model):
     class Meta:
         ordering = ['-report_date']
         verbose_name = _('Pest/Disease Report')
-        verbose_name_plural = _('Pest/Disease Reports')
\ No newline at end of file
+        verbose_name_plural = _('Pest/Disease Reports')
+        # Rows changed since the last incremental rollup refresh (api.rollups)
+        indexes = [models.Index(fields=['updated_at'])]
\ No newline at end of file
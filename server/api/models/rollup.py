@@ -0,0 +1,96 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from api.models.pest import PestDiseaseReport
+
+
+class Dataset(models.TextChoices):
+    SOIL = 'soil', _('Soil samples')
+    WATER = 'water', _('Water samples')
+
+
+class MetricRollup(models.Model):
+    """Daily count, sum, sum of squares, min and max of one sample measurement"""
+
+    date = models.DateField()
+    dataset = models.CharField(max_length=10, choices=Dataset.choices)
+    metric = models.CharField(max_length=32)
+    count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)
+    total_sq = models.FloatField(default=0)
+    minimum = models.FloatField(null=True)
+    maximum = models.FloatField(null=True)
+
+    class Meta:
+        abstract = True
+
+
+class PestRollup(models.Model):
+    """Daily number of pest/disease reports of one severity"""
+
+    date = models.DateField()
+    severity = models.CharField(max_length=20, choices=PestDiseaseReport.Severity.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class FarmDailyRollup(MetricRollup):
+    farm = models.ForeignKey('Farm', on_delete=models.CASCADE, related_name='+')
+    route = models.ForeignKey('Route', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['farm', 'date', 'dataset', 'metric']
+        indexes = [models.Index(fields=['dataset', 'date'])]
+
+
+class RouteDailyRollup(MetricRollup):
+    route = models.ForeignKey('Route', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['route', 'date', 'dataset', 'metric']
+        indexes = [models.Index(fields=['dataset', 'date'])]
+
+
+class FarmDailyPestRollup(PestRollup):
+    farm = models.ForeignKey('Farm', on_delete=models.CASCADE, related_name='+')
+    route = models.ForeignKey('Route', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['farm', 'date', 'severity']
+        indexes = [models.Index(fields=['date'])]
+
+
+class RouteDailyPestRollup(PestRollup):
+    route = models.ForeignKey('Route', on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        unique_together = ['route', 'date', 'severity']
+        indexes = [models.Index(fields=['date'])]
+
+
+class StaleRollup(models.Model):
+    """
+    Rollups to recompute that no updated_at change points to.
+
+    farm_id and date: a sample was deleted or moved away from that farm-day.
+    farm_id only: every day of the farm (it moved to another route).
+    route_id only: every day of the route (one of its farms was deleted).
+    IDs are kept without foreign keys so they outlive deleted rows.
+    """
+
+    farm_id = models.UUIDField(null=True)
+    route_id = models.UUIDField(null=True)
+    date = models.DateField(null=True)
+
+
+class RollupWatermark(models.Model):
+    """How far the incremental rollup refresh has processed updated_at"""
+
+    name = models.CharField(max_length=50, unique=True)
+    refreshed_through = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.refreshed_through:%Y-%m-%d %H:%M:%S}"
@@ -28,6 +28,10 @@ class Route(models.Model):
         choices=Status.choices,
         default=Status.PENDING
     )
+    # Incremented on every status change (update_status, bulk_update_status
+    # and PUT/PATCH); clients send back the version they saw so concurrent
+    # changes are detected instead of overwritten
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"{self.name} - {self.get_status_display()}"
@@ -83,6 +83,8 @@ class SoilSample(models.Model):
         ordering = ['-sample_date']
         verbose_name = _('Soil Sample')
         verbose_name_plural = _('Soil Samples')
+        # Rows changed since the last incremental rollup refresh (api.rollups)
+        indexes = [models.Index(fields=['updated_at'])]
 
 
 class WaterSample(models.Model):
@@ -133,4 +135,6 @@ class WaterSample(models.Model):
     class Meta:
         ordering = ['-sample_date']
         verbose_name = _('Water Sample')
-        verbose_name_plural = _('Water Samples')
\ No newline at end of file
+        verbose_name_plural = _('Water Samples')
+        # Rows changed since the last incremental rollup refresh (api.rollups)
+        indexes = [models.Index(fields=['updated_at'])]
\ No newline at end of file
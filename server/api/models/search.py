@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one farm, sample or pest report (see api.search).
+
+    The full-text index itself lives outside the model: a tsvector column
+    with a GIN index on PostgreSQL, an FTS5 table kept in sync by triggers
+    on SQLite, both created by migration 0007. Altering this table on
+    SQLite rebuilds it and drops the triggers, so recreate them then.
+    """
+
+    class Kind(models.TextChoices):
+        FARM = 'farm', _('Farm')
+        SOIL_SAMPLE = 'soil_sample', _('Soil sample')
+        WATER_SAMPLE = 'water_sample', _('Water sample')
+        PEST_REPORT = 'pest_report', _('Pest/disease report')
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.UUIDField()
+    farm_id = models.UUIDField()
+    route_id = models.UUIDField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default='')
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        indexes = [models.Index(fields=['farm_id'])]
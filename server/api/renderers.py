@@ -0,0 +1,44 @@
+"""
+JSON renderer backed by orjson when it is installed.
+
+Output matches DRF's JSONRenderer: compact, UTF-8, U+2028/U+2029 escaped,
+and anything orjson cannot encode natively (Decimal, datetime, lazy
+strings, querysets) goes through DRF's own JSONEncoder, so Decimals stay
+strings or floats according to COERCE_DECIMAL_TO_STRING. Indented output
+and non-default UNICODE_JSON/COMPACT_JSON settings use DRF's renderer.
+"""
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    # Datetimes are left to DRF's encoder, which formats UTC as '...Z'
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer encoding with orjson, falling back to the stdlib json module"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the json module handles
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same JavaScript-safe escaping as DRF
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,240 @@
+"""
+Maintenance of the daily analytics rollup tables.
+
+Farm-day rollups are aggregated from the sample and pest report tables,
+route-day rollups from the farm-day rollups. An incremental refresh
+recomputes only the farm-days touched since the last run: rows whose
+updated_at passed the watermark, plus the StaleRollup entries recorded by
+the signal handlers for deletions and moves.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from api.analytics import SOIL_METRICS, WATER_METRICS
+from api.models import (
+    SoilSample, WaterSample, PestDiseaseReport,
+    FarmDailyRollup, RouteDailyRollup, FarmDailyPestRollup, RouteDailyPestRollup,
+    StaleRollup, RollupWatermark,
+)
+from api.models.rollup import Dataset
+
+WATERMARK = 'analytics'
+
+# dataset -> (model, date field, metrics)
+SOURCES = {
+    Dataset.SOIL: (SoilSample, 'sample_date', SOIL_METRICS),
+    Dataset.WATER: (WaterSample, 'sample_date', WATER_METRICS),
+}
+
+# Every table rolled up, with its date field
+DATED_MODELS = [(SoilSample, 'sample_date'), (WaterSample, 'sample_date'), (PestDiseaseReport, 'report_date')]
+
+# Maximum farm or route IDs per query when filtering on keys
+KEY_CHUNK_SIZE = 500
+
+
+def _key_filters(keys, id_field, date_field):
+    """Q objects matching (id, date) keys, grouped by date and chunked"""
+    by_date = defaultdict(set)
+    for object_id, date in keys:
+        by_date[date].add(object_id)
+
+    condition, size = Q(), 0
+    for date, ids in sorted(by_date.items()):
+        ids = list(ids)
+        for start in range(0, len(ids), KEY_CHUNK_SIZE):
+            chunk = ids[start:start + KEY_CHUNK_SIZE]
+            condition |= Q(**{date_field: date, f'{id_field}__in': chunk})
+            size += len(chunk)
+            if size >= KEY_CHUNK_SIZE:
+                yield condition
+                condition, size = Q(), 0
+    if size:
+        yield condition
+
+
+def _filtered(queryset, keys, id_field, date_field):
+    """Querysets covering `keys`, or the whole queryset when keys is None"""
+    if keys is None:
+        return [queryset]
+    return [queryset.filter(condition) for condition in _key_filters(keys, id_field, date_field)]
+
+
+def _farm_metric_rollups(dataset, keys):
+    model, date_field, metrics = SOURCES[dataset]
+    aggregates = {}
+    for metric in metrics:
+        value = Cast(metric, FloatField())
+        aggregates.update({
+            f'{metric}__count': Count(metric),
+            f'{metric}__total': Sum(value),
+            f'{metric}__total_sq': Sum(value * value),
+            f'{metric}__minimum': Min(value),
+            f'{metric}__maximum': Max(value),
+        })
+
+    for queryset in _filtered(model.objects.all(), keys, 'farm_id', date_field):
+        rows = queryset.values('farm_id', route=F('farm__route_id'), day=F(date_field)).annotate(
+            **aggregates
+        ).order_by()
+        for row in rows.iterator():
+            for metric in metrics:
+                if row[f'{metric}__count']:
+                    yield FarmDailyRollup(
+                        farm_id=row['farm_id'], route_id=row['route'], date=row['day'],
+                        dataset=dataset, metric=metric, count=row[f'{metric}__count'],
+                        total=row[f'{metric}__total'], total_sq=row[f'{metric}__total_sq'],
+                        minimum=row[f'{metric}__minimum'], maximum=row[f'{metric}__maximum'],
+                    )
+
+
+def _farm_pest_rollups(keys):
+    for queryset in _filtered(PestDiseaseReport.objects.all(), keys, 'farm_id', 'report_date'):
+        rows = queryset.values(
+            'farm_id', 'severity', route=F('farm__route_id'), day=F('report_date'),
+        ).annotate(reports=Count('pk')).order_by()
+        for row in rows.iterator():
+            yield FarmDailyPestRollup(
+                farm_id=row['farm_id'], route_id=row['route'], date=row['day'],
+                severity=row['severity'], count=row['reports'],
+            )
+
+
+def _route_metric_rollups(keys):
+    for queryset in _filtered(FarmDailyRollup.objects.all(), keys, 'route_id', 'date'):
+        rows = queryset.values('route_id', 'date', 'dataset', 'metric').annotate(
+            sum_count=Sum('count'), sum_total=Sum('total'), sum_total_sq=Sum('total_sq'),
+            min_minimum=Min('minimum'), max_maximum=Max('maximum'),
+        ).order_by()
+        for row in rows.iterator():
+            yield RouteDailyRollup(
+                route_id=row['route_id'], date=row['date'], dataset=row['dataset'], metric=row['metric'],
+                count=row['sum_count'], total=row['sum_total'], total_sq=row['sum_total_sq'],
+                minimum=row['min_minimum'], maximum=row['max_maximum'],
+            )
+
+
+def _route_pest_rollups(keys):
+    for queryset in _filtered(FarmDailyPestRollup.objects.all(), keys, 'route_id', 'date'):
+        rows = queryset.values('route_id', 'date', 'severity').annotate(reports=Sum('count')).order_by()
+        for row in rows.iterator():
+            yield RouteDailyPestRollup(
+                route_id=row['route_id'], date=row['date'], severity=row['severity'], count=row['reports'],
+            )
+
+
+def _save(objects, batch_size):
+    created, batch = 0, []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            type(obj).objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        type(batch[0]).objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def _delete(model, keys, id_field):
+    for queryset in _filtered(model.objects.all(), keys, id_field, 'date'):
+        queryset.delete()
+
+
+def _farm_keys_since(since):
+    """(farm_id, date) of every sample or report updated since `since`"""
+    keys = set()
+    for model, date_field in DATED_MODELS:
+        changed = model.objects.filter(updated_at__gte=since)
+        keys.update(changed.values_list('farm_id', date_field).order_by().distinct())
+    return keys
+
+
+def _stale_keys(stale):
+    """Expand StaleRollup entries into farm-day and route-day keys"""
+    farm_keys, route_keys = set(), set()
+    whole_farms, whole_routes = set(), set()
+    for entry in stale:
+        if entry.farm_id and entry.date:
+            farm_keys.add((entry.farm_id, entry.date))
+        elif entry.farm_id:
+            whole_farms.add(entry.farm_id)
+        elif entry.route_id:
+            whole_routes.add(entry.route_id)
+
+    if whole_farms:
+        # Days with data now, and days rolled up before the move
+        sources = DATED_MODELS + [(FarmDailyRollup, 'date'), (FarmDailyPestRollup, 'date')]
+        for model, date_field in sources:
+            rows = model.objects.filter(farm_id__in=whole_farms)
+            farm_keys.update(rows.values_list('farm_id', date_field).order_by().distinct())
+    if whole_routes:
+        for model in (RouteDailyRollup, RouteDailyPestRollup):
+            rows = model.objects.filter(route_id__in=whole_routes)
+            route_keys.update(rows.values_list('route_id', 'date').order_by().distinct())
+    return farm_keys, route_keys
+
+
+def _route_keys(farm_keys):
+    """(route_id, date) of the farm-day rollups matching farm_keys"""
+    route_keys = set()
+    for model in (FarmDailyRollup, FarmDailyPestRollup):
+        for queryset in _filtered(model.objects.all(), farm_keys, 'farm_id', 'date'):
+            route_keys.update(queryset.values_list('route_id', 'date').order_by().distinct())
+    return route_keys
+
+
+def refresh_rollups(full=False, batch_size=5000):
+    """
+    Bring the rollup tables up to date and return the number of farm-day
+    and route-day keys recomputed (None for a full rebuild) and rows written.
+    """
+    started = timezone.now()
+    overlap = datetime.timedelta(seconds=getattr(settings, 'ROLLUP_WATERMARK_OVERLAP', 300))
+
+    with transaction.atomic():
+        watermark = RollupWatermark.objects.select_for_update().filter(name=WATERMARK).first()
+        stale = list(StaleRollup.objects.all())
+
+        if full or watermark is None:
+            farm_keys = route_keys = None
+            for model in (FarmDailyRollup, FarmDailyPestRollup, RouteDailyRollup, RouteDailyPestRollup):
+                model.objects.all().delete()
+        else:
+            # Rows saved just before the previous run may have committed after
+            # it read them, so look back a little further than the watermark
+            farm_keys, route_keys = _stale_keys(stale)
+            farm_keys |= _farm_keys_since(watermark.refreshed_through - overlap)
+            # Routes the farm-days belonged to before and after recomputing
+            route_keys |= _route_keys(farm_keys)
+            _delete(FarmDailyRollup, farm_keys, 'farm_id')
+            _delete(FarmDailyPestRollup, farm_keys, 'farm_id')
+
+        rows = 0
+        for dataset in SOURCES:
+            rows += _save(_farm_metric_rollups(dataset, farm_keys), batch_size)
+        rows += _save(_farm_pest_rollups(farm_keys), batch_size)
+
+        if route_keys is not None:
+            route_keys |= _route_keys(farm_keys)
+            _delete(RouteDailyRollup, route_keys, 'route_id')
+            _delete(RouteDailyPestRollup, route_keys, 'route_id')
+        rows += _save(_route_metric_rollups(route_keys), batch_size)
+        rows += _save(_route_pest_rollups(route_keys), batch_size)
+
+        if stale:
+            StaleRollup.objects.filter(pk__lte=max(entry.pk for entry in stale)).delete()
+        RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={'refreshed_through': started})
+
+    return {
+        'farm_days': None if farm_keys is None else len(farm_keys),
+        'route_days': None if route_keys is None else len(route_keys),
+        'rows': rows,
+    }
@@ -0,0 +1,54 @@
+from django.utils.functional import cached_property
+
+from api.models import Route, Farm
+
+
+class UserScope:
+    """
+    Routes and farms a user is allowed to work with.
+
+    Admins are unrestricted. For enumerators the route and farm IDs are
+    loaded lazily, at most once each, and kept as frozensets so membership
+    checks in viewsets and validators don't touch the database again.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.user_id = getattr(user, 'pk', None)
+        self.is_restricted = bool(getattr(user, 'is_enumerator', False))
+
+    @cached_property
+    def route_ids(self):
+        return frozenset(
+            Route.objects.filter(assigned_to_id=self.user_id).values_list('id', flat=True)
+        )
+
+    @cached_property
+    def farm_ids(self):
+        return frozenset(
+            Farm.objects.filter(route__assigned_to_id=self.user_id).values_list('id', flat=True)
+        )
+
+    def has_route(self, route_id):
+        return not self.is_restricted or route_id in self.route_ids
+
+    def has_farm(self, farm_id):
+        return not self.is_restricted or farm_id in self.farm_ids
+
+    def restrict(self, queryset, route_field):
+        """Limit a queryset to the scope, given the lookup path to the route ID"""
+        if not self.is_restricted:
+            return queryset
+        return queryset.filter(**{f'{route_field}__in': self.route_ids})
+
+
+def get_user_scope(request):
+    """Return the UserScope for request.user, computing it once per request"""
+    # Cache on the underlying HttpRequest so DRF and plain Django views share it
+    http_request = getattr(request, '_request', request)
+    user = request.user
+    scope = getattr(http_request, '_user_scope', None)
+    if scope is None or scope.user_id != getattr(user, 'pk', None):
+        scope = UserScope(user)
+        http_request._user_scope = scope
+    return scope
@@ -0,0 +1,137 @@
+"""
+Full-text search over farms, samples and pest reports.
+
+Every searchable row has a SearchDocument holding its title and body
+text, kept in sync by the signal handlers in api.signals and rebuilt by
+`manage.py rebuild_search_index` after bulk loads. Queries match every
+term as a word prefix, using the tsvector GIN index on PostgreSQL and the
+FTS5 table on SQLite, and rank title matches above body matches. Other
+databases fall back to unranked substring matching.
+"""
+import re
+from collections import namedtuple
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from api.models import Farm, SoilSample, WaterSample, PestDiseaseReport, SearchDocument
+
+Kind = SearchDocument.Kind
+
+# lookups giving the document fields of a row of `model`; title and body
+# together are the search_fields of the model's list view, so ?search= on
+# a list matches the same fields with or without the index
+SearchType = namedtuple('SearchType', ['model', 'farm', 'route', 'title', 'body'])
+
+SEARCH_TYPES = {
+    Kind.FARM: SearchType(Farm, 'pk', 'route_id', ['name'], ['owner_name', 'location']),
+    Kind.SOIL_SAMPLE: SearchType(SoilSample, 'farm_id', 'farm__route_id', ['farm__name'], ['notes']),
+    Kind.WATER_SAMPLE: SearchType(WaterSample, 'farm_id', 'farm__route_id', ['farm__name'], ['source', 'notes']),
+    Kind.PEST_REPORT: SearchType(PestDiseaseReport, 'farm_id', 'farm__route_id', ['name'],
+                                 ['farm__name', 'description']),
+}
+KINDS = {search_type.model: kind for kind, search_type in SEARCH_TYPES.items()}
+
+MAX_TERMS = 10
+TERM_RE = re.compile(r'[^\W_]+')
+
+
+def search_terms(query):
+    """Words of a query, as the full-text indexes split them"""
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def documents(kind, queryset):
+    """Unsaved SearchDocuments for the rows of `queryset`"""
+    search_type = SEARCH_TYPES[kind]
+    fields = [search_type.farm, search_type.route, *search_type.title, *search_type.body]
+    split = len(search_type.title)
+    for pk, farm_id, route_id, *text in queryset.values_list('pk', *fields).order_by().iterator():
+        yield SearchDocument(
+            kind=kind, object_id=pk, farm_id=farm_id, route_id=route_id,
+            title=' '.join(value for value in text[:split] if value)[:255],
+            body='\n'.join(str(value) for value in text[split:] if value),
+        )
+
+
+def index_objects(kind, pks, created=False):
+    """Create or refresh the documents of the given rows (just created: no documents to replace)"""
+    if not created:
+        remove_objects(kind, pks)
+    SearchDocument.objects.bulk_create(documents(kind, SEARCH_TYPES[kind].model.objects.filter(pk__in=pks)))
+
+
+def remove_objects(kind, pks):
+    SearchDocument.objects.filter(kind=kind, object_id__in=pks).delete()
+
+
+def index_farm_children(farm_id):
+    """Refresh the documents of a farm's samples and reports, which copy its name and route"""
+    for kind, search_type in SEARCH_TYPES.items():
+        if search_type.model is not Farm:
+            SearchDocument.objects.filter(kind=kind, farm_id=farm_id).delete()
+            SearchDocument.objects.bulk_create(documents(kind, search_type.model.objects.filter(farm_id=farm_id)))
+
+
+def rebuild_index(batch_size=2000):
+    """Recreate every document and return the number indexed per kind"""
+    SearchDocument.objects.all().delete()
+    counts = {}
+    for kind, search_type in SEARCH_TYPES.items():
+        counts[kind], batch = 0, []
+        for document in documents(kind, search_type.model.objects.all()):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                SearchDocument.objects.bulk_create(batch)
+                counts[kind] += len(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+        counts[kind] += len(batch)
+    return counts
+
+
+def _sqlite_matches(queryset, terms):
+    query = ' '.join(f'"{term}"*' for term in terms)
+    matching = RawSQL('SELECT rowid FROM api_searchdocument_fts WHERE api_searchdocument_fts MATCH %s', (query,))
+    # bm25() is lower for better matches; title matches weigh 10x
+    rank = RawSQL(
+        'SELECT -bm25(api_searchdocument_fts, 10.0, 1.0) FROM api_searchdocument_fts '
+        'WHERE api_searchdocument_fts MATCH %s AND rowid = "api_searchdocument"."id"',
+        (query,), output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=matching).annotate(rank=rank)
+
+
+def _postgresql_matches(queryset, terms):
+    query = ' & '.join(f'{term}:*' for term in terms)
+    matching = RawSQL(
+        '"api_searchdocument"."search_vector" @@ to_tsquery(\'simple\', %s)', (query,), output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        'ts_rank("api_searchdocument"."search_vector", to_tsquery(\'simple\', %s))', (query,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(matching).annotate(rank=rank)
+
+
+def _substring_matches(queryset, terms):
+    condition = reduce(and_, (reduce(or_, [Q(title__icontains=term), Q(body__icontains=term)]) for term in terms))
+    return queryset.filter(condition).annotate(rank=Value(0.0))
+
+
+MATCHERS = {'sqlite': _sqlite_matches, 'postgresql': _postgresql_matches}
+
+
+def matching_documents(queryset, query):
+    """
+    SearchDocuments of `queryset` matching every word of `query`, with a
+    `rank` annotation (higher is better). None when the query has no words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    matcher = MATCHERS.get(connections[queryset.db].vendor, _substring_matches)
+    return matcher(queryset, terms)
@@ -1,11 +1,14 @@
 from rest_framework import serializers
+from agrisurvey.metrics import SerializerTimingMixin
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
 from api.models import Route
+from api.authentication import ClaimsRefreshToken
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for the User model"""
 
     password = serializers.CharField(write_only=True, required=False)
@@ -28,11 +31,14 @@ class UserSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         password = validated_data.pop('password', None)
-        user = super().update(instance, validated_data)
-
         if password:
-            user.set_password(password)
-            user.save()
+            instance.set_password(password)
+        # Saving revokes the user's tokens on password and role changes
+        return super().update(instance, validated_data)
 
-        return user
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Token pair serializer embedding the user claims used by stateless auth"""
+
+    token_class = ClaimsRefreshToken
 
@@ -1,8 +1,12 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from agrisurvey.metrics import SerializerTimingMixin
 from api.models import Farm, Crop, Route
+from api.scope import get_user_scope
 
 
-class CropSerializer(serializers.ModelSerializer):
+class CropSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for the Crop model"""
 
     class Meta:
@@ -34,7 +38,7 @@ class CropSerializer(serializers.ModelSerializer):
         return data
 
 
-class FarmSerializer(serializers.ModelSerializer):
+class FarmSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for the Farm model"""
 
     crops = CropSerializer(many=True, read_only=True)
@@ -60,21 +64,31 @@ class FarmSerializer(serializers.ModelSerializer):
     def get_route_name(self, obj):
         return obj.route.name
 
+    # The counts below come from annotations added by FarmViewSet when
+    # present, falling back to one query per farm otherwise
+
     def get_soil_sample_count(self, obj):
-        return obj.soil_samples.count()
+        count = getattr(obj, 'num_soil_samples', None)
+        return obj.soil_samples.count() if count is None else count
 
     def get_water_sample_count(self, obj):
-        return obj.water_samples.count()
+        count = getattr(obj, 'num_water_samples', None)
+        return obj.water_samples.count() if count is None else count
 
     def get_pest_disease_count(self, obj):
-        return obj.pest_disease_reports.count()
+        count = getattr(obj, 'num_pest_reports', None)
+        return obj.pest_disease_reports.count() if count is None else count
 
     def get_has_samples(self, obj):
         """Check if farm has any soil or water samples"""
+        if hasattr(obj, 'num_soil_samples') and hasattr(obj, 'num_water_samples'):
+            return obj.num_soil_samples > 0 or obj.num_water_samples > 0
         return obj.soil_samples.exists() or obj.water_samples.exists()
 
     def get_has_pest_reports(self, obj):
         """Check if farm has any pest or disease reports"""
+        if hasattr(obj, 'num_pest_reports'):
+            return obj.num_pest_reports > 0
         return obj.pest_disease_reports.exists()
 
 
@@ -84,18 +98,43 @@ from api.serializers.pest import PestDiseaseReportSerializer
 
 
 class FarmDetailSerializer(FarmSerializer):
-    """Serializer for detailed Farm model view"""
+    """
+    Serializer for detailed Farm model view
+
+    FarmViewSet prefetches each child list capped at FARM_DETAIL_CHILD_LIMIT
+    rows into latest_* attributes; `more` links to the paginated list
+    endpoint of every child list that was cut.
+    """
 
     crops = CropSerializer(many=True, read_only=True)
-    soil_samples = SoilSampleSerializer(many=True, read_only=True)
-    water_samples = WaterSampleSerializer(many=True, read_only=True)
-    pest_disease_reports = PestDiseaseReportSerializer(many=True, read_only=True)
+    soil_samples = SoilSampleSerializer(source='latest_soil_samples', many=True, read_only=True)
+    water_samples = WaterSampleSerializer(source='latest_water_samples', many=True, read_only=True)
+    pest_disease_reports = PestDiseaseReportSerializer(source='latest_pest_disease_reports', many=True,
+                                                       read_only=True)
+    more = serializers.SerializerMethodField()
 
     class Meta(FarmSerializer.Meta):
-        fields = FarmSerializer.Meta.fields + ['soil_samples', 'water_samples', 'pest_disease_reports']
+        fields = FarmSerializer.Meta.fields + ['soil_samples', 'water_samples', 'pest_disease_reports', 'more']
 
-
-class FarmCreateUpdateSerializer(serializers.ModelSerializer):
+    def get_more(self, obj):
+        limit = settings.FARM_DETAIL_CHILD_LIMIT
+        request = self.context.get('request')
+        links = {}
+        for field, url_name, count in [
+            ('soil_samples', 'soilsample-list', self.get_soil_sample_count(obj)),
+            ('water_samples', 'watersample-list', self.get_water_sample_count(obj)),
+            ('pest_disease_reports', 'pestdisease-list', self.get_pest_disease_count(obj)),
+        ]:
+            url = None
+            if count > limit:
+                url = f'{reverse(url_name)}?farm={obj.pk}'
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+            links[field] = url
+        return links
+
+
+class FarmCreateUpdateSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for creating and updating farms"""
 
     class Meta:
@@ -110,8 +149,7 @@ class FarmCreateUpdateSerializer(serializers.ModelSerializer):
         """Ensure the route belongs to the current user if they're an enumerator"""
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            user = request.user
-            if hasattr(user, 'is_enumerator') and user.is_enumerator and value.assigned_to != user:
+            if not get_user_scope(request).has_route(value.pk):
                 raise serializers.ValidationError("You can only create farms for your assigned routes.")
         return value
     
@@ -1,11 +1,14 @@
 from rest_framework import serializers
+from agrisurvey.metrics import SerializerTimingMixin
 from api.models import PestDiseaseReport
+from api.scope import get_user_scope
 
 
-class PestDiseaseReportSerializer(serializers.ModelSerializer):
+class PestDiseaseReportSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for PestDiseaseReport model"""
 
     farm_name = serializers.SerializerMethodField()
+    values_sources = {'farm_name': 'farm__name'}
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     severity_display = serializers.CharField(source='get_severity_display', read_only=True)
 
@@ -27,8 +30,7 @@ class PestDiseaseReportSerializer(serializers.ModelSerializer):
         """Ensure the farm belongs to a route assigned to the current user if they're an enumerator"""
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            user = request.user
-            if user.is_enumerator and value.route.assigned_to != user:
+            if not get_user_scope(request).has_farm(value.pk):
                 raise serializers.ValidationError(
                     "You can only add pest/disease reports to farms in your assigned routes.")
         return value
\ No newline at end of file
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from agrisurvey.metrics import SerializerTimingMixin
 from django.db.models import Count, Q
 
 from api.models import Route, User
 
 
-class RouteSerializer(serializers.ModelSerializer):
+class RouteSerializer(SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for Route model"""
 
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -19,7 +20,7 @@ class RouteSerializer(serializers.ModelSerializer):
         model = Route
         fields = [
             'id', 'name', 'assigned_to', 'assigned_to_name', 'date_assigned',
-            'status', 'status_display', 'farm_count', 'completed_farms', 'progress'
+            'status', 'status_display', 'version', 'farm_count', 'completed_farms', 'progress'
         ]
 
     def get_assigned_to_name(self, obj):
@@ -29,10 +30,14 @@ class RouteSerializer(serializers.ModelSerializer):
 
 
     def get_farm_count(self, obj):
-        return obj.farms.count()
+        count = getattr(obj, 'num_farms', None)
+        return obj.farms.count() if count is None else count
 
     def get_completed_farms(self, obj):
         """Count farms that have samples or pest reports"""
+        count = getattr(obj, 'num_completed_farms', None)
+        if count is not None:
+            return count
         # Use annotate to count farms with samples or pest reports in a single query
         completed_farms = obj.farms.annotate(
             sample_count=Count('soil_samples') + Count('water_samples'),
@@ -1,12 +1,18 @@
 from rest_framework import serializers
+from agrisurvey.metrics import SerializerTimingMixin
 from api.models import SoilSample, WaterSample, Farm
-from django.core.validators import MinValueValidator, MaxValueValidator
+from api.scope import get_user_scope
+from api.validation import RuleValidationMixin, SOIL_SAMPLE_RULES, WATER_SAMPLE_RULES
 
 
-class SoilSampleSerializer(serializers.ModelSerializer):
+class SoilSampleSerializer(RuleValidationMixin, SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for SoilSample model"""
 
+    rules = SOIL_SAMPLE_RULES
+
     farm_name = serializers.SerializerMethodField()
+    # Columns for fields without one, used by the values() list fast path
+    values_sources = {'farm_name': 'farm__name'}
 
     class Meta:
         model = SoilSample
@@ -22,55 +28,44 @@ class SoilSampleSerializer(serializers.ModelSerializer):
 
     def validate_pH(self, value):
         """Validate pH is between 0 and 14"""
-        if value < 0 or value > 14:
-            raise serializers.ValidationError("pH must be between 0 and 14")
-        return value
+        return self.check_rule('pH', value)
 
     def validate_moisture_pct(self, value):
         """Validate moisture percentage is between 0 and 100"""
-        if value is not None and (value < 0 or value > 100):
-            raise serializers.ValidationError("Moisture percentage must be between 0 and 100")
-        return value
+        return self.check_rule('moisture_pct', value)
 
     def validate_farm(self, value):
         """Ensure the farm belongs to a route assigned to the current user if they're an enumerator"""
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            user = request.user
-            if hasattr(user, 'is_enumerator') and user.is_enumerator and value.route.assigned_to != user:
+            if not get_user_scope(request).has_farm(value.pk):
                 raise serializers.ValidationError("You can only add soil samples to farms in your assigned routes.")
         return value
 
     def validate_sample_date(self, value):
         """Ensure sample date is not in the future"""
-        from django.utils import timezone
-        if value > timezone.now().date():
-            raise serializers.ValidationError("Sample date cannot be in the future")
-        return value
+        return self.check_rule('sample_date', value)
 
     def validate_nutrient_n(self, value):
         """Validate nitrogen level is within reasonable range"""
-        if value is not None and (value < 0 or value > 999):
-            raise serializers.ValidationError("Nitrogen level must be between 0 and 999")
-        return value
+        return self.check_rule('nutrient_n', value)
 
     def validate_nutrient_p(self, value):
         """Validate phosphorus level is within reasonable range"""
-        if value is not None and (value < 0 or value > 999):
-            raise serializers.ValidationError("Phosphorus level must be between 0 and 999")
-        return value
+        return self.check_rule('nutrient_p', value)
 
     def validate_nutrient_k(self, value):
         """Validate potassium level is within reasonable range"""
-        if value is not None and (value < 0 or value > 999):
-            raise serializers.ValidationError("Potassium level must be between 0 and 999")
-        return value
+        return self.check_rule('nutrient_k', value)
 
 
-class WaterSampleSerializer(serializers.ModelSerializer):
+class WaterSampleSerializer(RuleValidationMixin, SerializerTimingMixin, serializers.ModelSerializer):
     """Serializer for WaterSample model"""
 
+    rules = WATER_SAMPLE_RULES
+
     farm_name = serializers.SerializerMethodField()
+    values_sources = {'farm_name': 'farm__name'}
 
     class Meta:
         model = WaterSample
@@ -86,31 +81,23 @@ class WaterSampleSerializer(serializers.ModelSerializer):
 
     def validate_pH(self, value):
         """Validate pH is between 0 and 14"""
-        if value < 0 or value > 14:
-            raise serializers.ValidationError("pH must be between 0 and 14")
-        return value
+        return self.check_rule('pH', value)
 
     def validate_turbidity(self, value):
         """Validate turbidity is non-negative"""
-        if value is not None and value < 0:
-            raise serializers.ValidationError("Turbidity must be 0 or greater")
-        return value
+        return self.check_rule('turbidity', value)
 
     def validate_farm(self, value):
         """Ensure the farm belongs to a route assigned to the current user if they're an enumerator"""
         request = self.context.get('request')
         if request and hasattr(request, 'user'):
-            user = request.user
-            if hasattr(user, 'is_enumerator') and user.is_enumerator and value.route.assigned_to != user:
+            if not get_user_scope(request).has_farm(value.pk):
                 raise serializers.ValidationError("You can only add water samples to farms in your assigned routes.")
         return value
 
     def validate_sample_date(self, value):
         """Ensure sample date is not in the future"""
-        from django.utils import timezone
-        if value > timezone.now().date():
-            raise serializers.ValidationError("Sample date cannot be in the future")
-        return value
+        return self.check_rule('sample_date', value)
 
     def validate_source(self, value):
         """Ensure water source is not empty"""
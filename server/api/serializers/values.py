@@ -0,0 +1,168 @@
+"""
+Read-only fast path for list responses.
+
+A ValuesSerializer renders queryset.values() rows into exactly the data the
+equivalent ModelSerializer would produce for model instances, without
+creating a model instance or running the per-field machinery of a
+serializer for every row. Converters are chosen once per field when the
+ValuesSerializer is built.
+
+Fields that do not map onto a model column (SerializerMethodFields and the
+like) must be listed in the serializer's `values_sources`, mapping the
+field name to a values() lookup, e.g. {'farm_name': 'farm__name'}.
+"""
+import decimal
+import functools
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import models
+from django.dispatch import receiver
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from agrisurvey.metrics import add_serializer_seconds
+
+
+def _passthrough(value):
+    return value
+
+
+def _date_converter(field):
+    if getattr(field, 'format', api_settings.DATE_FORMAT) != ISO_8601:
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _datetime_converter(field):
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        # The field's timezone is resolved per call, like DRF does, so
+        # timezone.activate() is honoured
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if tz is not None and value.tzinfo is not None:
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return convert
+
+
+def _decimal_converter(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.decimal_places is None:
+        return field.to_representation
+    exponent = -field.decimal_places
+
+    def convert(value):
+        # Database values normally come back with the column's scale already;
+        # anything else goes through DRF's quantization
+        if isinstance(value, decimal.Decimal) and value.as_tuple().exponent == exponent:
+            return '{:f}'.format(value)
+        return field.to_representation(value)
+
+    return convert
+
+
+class ValuesSerializer:
+    """Renders values() rows like `serializer_class` renders instances"""
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        sources = getattr(serializer_class, 'values_sources', {})
+
+        self.serializer_class = serializer_class
+        # (field name, values() column, converter, request-dependent extra) per field
+        self.fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in sources:
+                self.fields.append((name, sources[name], _passthrough, None))
+                continue
+
+            source = field.source
+            if source.startswith('get_') and source.endswith('_display'):
+                model_field = model._meta.get_field(source[4:-8])
+                self.fields.append((name, model_field.attname, _passthrough, model_field))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.fields.append((name, source, _passthrough, None))
+            elif isinstance(field, serializers.FileField):
+                self.fields.append((name, source, None, field))
+            elif isinstance(field, serializers.DecimalField):
+                self.fields.append((name, source, _decimal_converter(field), None))
+            elif isinstance(field, serializers.DateTimeField):
+                self.fields.append((name, source, _datetime_converter(field), None))
+            elif isinstance(field, serializers.DateField):
+                self.fields.append((name, source, _date_converter(field), None))
+            elif isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+                self.fields.append((name, source, str, None))
+            elif isinstance(field, (serializers.CharField, serializers.IntegerField, serializers.BooleanField)):
+                self.fields.append((name, source, field.to_representation, None))
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)) or source == '*' or '.' in source:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} has no column to read; "
+                    f"add it to {serializer_class.__name__}.values_sources"
+                )
+            else:
+                self.fields.append((name, source, field.to_representation, None))
+
+        self.columns = list(dict.fromkeys(column for _, column, _, _ in self.fields))
+
+    def _converters(self, request):
+        """Converters for this request: choice labels and file URLs depend on it"""
+        converters = []
+        for name, column, convert, extra in self.fields:
+            if isinstance(extra, models.Field):
+                labels = {value: str(label) for value, label in extra.flatchoices}
+                convert = lambda value, labels=labels: labels.get(value, str(value))
+            elif extra is not None:
+                convert = self._file_converter(extra, request)
+            converters.append((name, column, convert))
+        return converters
+
+    def _file_converter(self, field, request):
+        use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+        storage = self.serializer_class.Meta.model._meta.get_field(field.source).storage
+
+        def convert(name):
+            # Empty file fields are stored as ''
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return convert
+
+    def serialize(self, rows, request=None):
+        """List of output dicts for an iterable of values() rows"""
+        start = time.perf_counter()
+        converters = self._converters(request)
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in converters:
+                value = row[column]
+                item[name] = None if value is None else convert(value)
+            data.append(item)
+        add_serializer_seconds(time.perf_counter() - start)
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    """Shared ValuesSerializer for a serializer class"""
+    return ValuesSerializer(serializer_class)
+
+
+@receiver(setting_changed)
+def _reset_values_serializers(*, setting, **kwargs):
+    """Converters depend on REST_FRAMEWORK settings; rebuild them when it changes"""
+    if setting == 'REST_FRAMEWORK':
+        values_serializer.cache_clear()
@@ -0,0 +1,105 @@
+"""
+Signal handlers keeping derived data in step with the survey tables.
+
+Registered from ApiConfig.ready().
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api import autocomplete, search
+from api.hotspots import bump_dates, bump_generation
+from api.models import Farm, SoilSample, WaterSample, PestDiseaseReport, StaleRollup
+
+# Rolled-up models and their date field
+ROLLUP_SOURCES = {SoilSample: 'sample_date', WaterSample: 'sample_date', PestDiseaseReport: 'report_date'}
+
+
+# Analytics rollups: updated rows are found through updated_at by
+# refresh_rollups; deletions and moves leave no trace there, so they are
+# recorded as StaleRollup entries
+
+def _source_deleted(sender, instance, **kwargs):
+    StaleRollup.objects.create(farm_id=instance.farm_id, date=getattr(instance, ROLLUP_SOURCES[sender]))
+
+
+def _source_saving(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    date_field = ROLLUP_SOURCES[sender]
+    previous = sender.objects.filter(pk=instance.pk).values_list('farm_id', date_field).first()
+    # Kept for the handlers after the save (pest hotspots)
+    instance._previous_source = previous
+    if previous and previous != (instance.farm_id, getattr(instance, date_field)):
+        StaleRollup.objects.create(farm_id=previous[0], date=previous[1])
+
+
+for model in ROLLUP_SOURCES:
+    post_delete.connect(_source_deleted, sender=model, dispatch_uid=f'rollup_deleted_{model.__name__}')
+    pre_save.connect(_source_saving, sender=model, dispatch_uid=f'rollup_saving_{model.__name__}')
+
+
+@receiver(post_delete, sender=Farm, dispatch_uid='rollup_farm_deleted')
+def farm_deleted(sender, instance, **kwargs):
+    StaleRollup.objects.create(route_id=instance.route_id)
+
+
+@receiver(pre_save, sender=Farm, dispatch_uid='farm_saving')
+def farm_saving(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = Farm.objects.filter(pk=instance.pk).values_list('route_id', 'name').first()
+    if previous is None:
+        return
+    # Sample and report search documents copy the farm's route and name
+    instance._search_children_stale = previous != (instance.route_id, instance.name)
+    if previous[0] != instance.route_id:
+        StaleRollup.objects.create(farm_id=instance.pk)
+        # Enumerators' hotspot grids cover their routes' farms
+        transaction.on_commit(bump_generation)
+
+
+# Pest hotspots: a report change invalidates the cached windows covering
+# its old and new report dates, once committed so no request caches the old
+# rows under the new generation
+
+@receiver(post_save, sender=PestDiseaseReport, dispatch_uid='hotspots_report_saved')
+@receiver(post_delete, sender=PestDiseaseReport, dispatch_uid='hotspots_report_deleted')
+def pest_report_changed(sender, instance, **kwargs):
+    dates = {instance.report_date}
+    previous = getattr(instance, '_previous_source', None)
+    if previous is not None:
+        dates.add(previous[1])
+    transaction.on_commit(lambda: bump_dates(date for date in dates if date is not None))
+
+
+
+# Search index: documents are refreshed in the same transaction as the rows
+
+def _indexed_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_objects(search.KINDS[sender], [instance.pk])
+    if getattr(instance, '_search_children_stale', False):
+        search.index_farm_children(instance.pk)
+        instance._search_children_stale = False
+
+
+def _indexed_deleted(sender, instance, **kwargs):
+    search.remove_objects(search.KINDS[sender], [instance.pk])
+
+
+for model in search.KINDS:
+    post_save.connect(_indexed_saved, sender=model, dispatch_uid=f'search_saved_{model.__name__}')
+    post_delete.connect(_indexed_deleted, sender=model, dispatch_uid=f'search_deleted_{model.__name__}')
+
+
+
+# Farm autocomplete: log committed farm changes for every process's index
+
+@receiver(post_save, sender=Farm, dispatch_uid='autocomplete_farm_saved')
+@receiver(post_delete, sender=Farm, dispatch_uid='autocomplete_farm_deleted')
+def farm_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        farm_id = instance.pk
+        transaction.on_commit(lambda: autocomplete.record_change(farm_id))
@@ -0,0 +1,80 @@
+"""
+Query-count budgets for API endpoints.
+
+Budgets are checked against the 'tiny' synthetic dataset. When an endpoint
+exceeds its query budget the failure shows a diff of the captured SQL
+against the snapshot in query_snapshots/; run the tests with
+UPDATE_QUERY_SNAPSHOTS=1 to refresh the snapshots after intended changes.
+
+Latency is too noisy to assert on in the test suite; it is measured by the
+run_benchmarks command instead.
+"""
+import difflib
+import os
+from collections import namedtuple
+from pathlib import Path
+
+from django.test import TestCase
+
+from agrisurvey.middleware.queries import QueryRecorder
+from api.benchmarks.data import SCALES, generate_dataset
+from api.benchmarks.endpoints import consume, endpoint_label, role_clients
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent / 'query_snapshots'
+
+Budget = namedtuple('Budget', ['queries'])
+
+
+def snapshot_path(label):
+    return SNAPSHOT_DIR / (label.replace('[', '-').replace(']', '') + '.sql')
+
+
+class QueryBudgetTestCase(TestCase):
+    """Base class for tests asserting endpoint query budgets"""
+
+    scale = 'tiny'
+
+    @classmethod
+    def setUpTestData(cls):
+        routes, farms_per_route, crops, soil, water, pests = SCALES[cls.scale]
+        generate_dataset(
+            routes=routes, farms_per_route=farms_per_route, crops_per_farm=crops,
+            soil_per_farm=soil, water_per_farm=water, pests_per_farm=pests,
+        )
+
+    def setUp(self):
+        self.clients, self.path_context = role_clients()
+
+    def assertWithinBudget(self, endpoint, budget):
+        client = self.clients[endpoint.role]
+        path = endpoint.path.format(**self.path_context)
+        label = endpoint_label(endpoint)
+
+        # Warm up URL resolution, serializer construction and other lazy setup
+        consume(client.get(path))
+
+        with QueryRecorder() as recorder:
+            response = client.get(path)
+            consume(response)
+
+        self.assertEqual(response.status_code, 200, f'{label}: GET {path} failed')
+
+        statements = [query['sql'] for query in recorder.queries]
+        if os.environ.get('UPDATE_QUERY_SNAPSHOTS'):
+            SNAPSHOT_DIR.mkdir(exist_ok=True)
+            snapshot_path(label).write_text('\n'.join(statements) + '\n')
+
+        if recorder.count > budget.queries:
+            self.fail(
+                f'{label} ran {recorder.count} queries, budget is {budget.queries}\n'
+                + self._sql_diff(label, statements)
+            )
+
+    def _sql_diff(self, label, statements):
+        path = snapshot_path(label)
+        expected = path.read_text().splitlines() if path.exists() else []
+        diff = '\n'.join(difflib.unified_diff(
+            expected, statements, fromfile=f'{path.name} (snapshot)', tofile='captured', lineterm='',
+        ))
+        # Unchanged from the snapshot: the budget was lowered, show what ran
+        return diff or 'Captured SQL (same as snapshot):\n' + '\n'.join(statements)
@@ -0,0 +1,2 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_cachegeneration"."name", "api_cachegeneration"."value" FROM "api_cachegeneration" WHERE ("api_cachegeneration"."name" = %s OR "api_cachegeneration"."name" BETWEEN %s AND %s)
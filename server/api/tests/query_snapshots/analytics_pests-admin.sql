@@ -0,0 +1,3 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_rollupwatermark"."id", "api_rollupwatermark"."name", "api_rollupwatermark"."refreshed_through", "api_rollupwatermark"."updated_at" FROM "api_rollupwatermark" WHERE "api_rollupwatermark"."name" = %s ORDER BY "api_rollupwatermark"."id" ASC LIMIT 1
+SELECT "api_pestdiseasereport"."severity", "api_farm"."route_id" AS "group_route", "api_route"."name" AS "group_route_name", COUNT(DISTINCT "api_pestdiseasereport"."id") AS "reports" FROM "api_pestdiseasereport" INNER JOIN "api_farm" ON ("api_pestdiseasereport"."farm_id" = "api_farm"."id") INNER JOIN "api_route" ON ("api_farm"."route_id" = "api_route"."id") GROUP BY "api_pestdiseasereport"."severity", 2, 3 ORDER BY 2 ASC, 3 ASC, "api_pestdiseasereport"."severity" ASC
@@ -0,0 +1,4 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_rollupwatermark"."id", "api_rollupwatermark"."name", "api_rollupwatermark"."refreshed_through", "api_rollupwatermark"."updated_at" FROM "api_rollupwatermark" WHERE "api_rollupwatermark"."name" = %s ORDER BY "api_rollupwatermark"."id" ASC LIMIT 1
+SELECT "api_farm"."route_id" AS "group_route", "api_route"."name" AS "group_route_name", django_date_trunc(%s, "api_soilsample"."sample_date", %s, %s) AS "group_month", COUNT(DISTINCT "api_soilsample"."id") AS "count", COUNT("api_soilsample"."pH") AS "pH__count", AVG(CAST("api_soilsample"."pH" AS real)) AS "pH__mean", AVG((CAST("api_soilsample"."pH" AS real) * CAST("api_soilsample"."pH" AS real))) AS "pH__mean_sq", CAST(MIN("api_soilsample"."pH") AS NUMERIC) AS "pH__min", CAST(MAX("api_soilsample"."pH") AS NUMERIC) AS "pH__max", COUNT("api_soilsample"."moisture_pct") AS "moisture_pct__count", AVG(CAST("api_soilsample"."moisture_pct" AS real)) AS "moisture_pct__mean", AVG((CAST("api_soilsample"."moisture_pct" AS real) * CAST("api_soilsample"."moisture_pct" AS real))) AS "moisture_pct__mean_sq", CAST(MIN("api_soilsample"."moisture_pct") AS NUMERIC) AS "moisture_pct__min", CAST(MAX("api_soilsample"."moisture_pct") AS NUMERIC) AS "moisture_pct__max", COUNT("api_soilsample"."nutrient_n") AS "nutrient_n__count", AVG(CAST("api_soilsample"."nutrient_n" AS real)) AS "nutrient_n__mean", AVG((CAST("api_soilsample"."nutrient_n" AS real) * CAST("api_soilsample"."nutrient_n" AS real))) AS "nutrient_n__mean_sq", CAST(MIN("api_soilsample"."nutrient_n") AS NUMERIC) AS "nutrient_n__min", CAST(MAX("api_soilsample"."nutrient_n") AS NUMERIC) AS "nutrient_n__max", COUNT("api_soilsample"."nutrient_p") AS "nutrient_p__count", AVG(CAST("api_soilsample"."nutrient_p" AS real)) AS "nutrient_p__mean", AVG((CAST("api_soilsample"."nutrient_p" AS real) * CAST("api_soilsample"."nutrient_p" AS real))) AS "nutrient_p__mean_sq", CAST(MIN("api_soilsample"."nutrient_p") AS NUMERIC) AS "nutrient_p__min", CAST(MAX("api_soilsample"."nutrient_p") AS NUMERIC) AS "nutrient_p__max", COUNT("api_soilsample"."nutrient_k") AS "nutrient_k__count", AVG(CAST("api_soilsample"."nutrient_k" AS real)) AS "nutrient_k__mean", AVG((CAST("api_soilsample"."nutrient_k" AS real) * CAST("api_soilsample"."nutrient_k" AS real))) AS "nutrient_k__mean_sq", CAST(MIN("api_soilsample"."nutrient_k") AS NUMERIC) AS "nutrient_k__min", CAST(MAX("api_soilsample"."nutrient_k") AS NUMERIC) AS "nutrient_k__max" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") INNER JOIN "api_route" ON ("api_farm"."route_id" = "api_route"."id") GROUP BY 1, 2, 3 ORDER BY 1 ASC, 2 ASC, 3 ASC
+SELECT "api_soilsample"."pH", "api_soilsample"."moisture_pct", "api_soilsample"."nutrient_n", "api_soilsample"."nutrient_p", "api_soilsample"."nutrient_k", "api_farm"."route_id" AS "f1", "api_route"."name" AS "f2", django_date_trunc(%s, "api_soilsample"."sample_date", %s, %s) AS "truncmonth3" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") INNER JOIN "api_route" ON ("api_farm"."route_id" = "api_route"."id") ORDER BY "api_soilsample"."sample_date" DESC
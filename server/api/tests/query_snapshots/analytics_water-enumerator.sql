@@ -0,0 +1,4 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_rollupwatermark"."id", "api_rollupwatermark"."name", "api_rollupwatermark"."refreshed_through", "api_rollupwatermark"."updated_at" FROM "api_rollupwatermark" WHERE "api_rollupwatermark"."name" = %s ORDER BY "api_rollupwatermark"."id" ASC LIMIT 1
+SELECT "api_route"."id" FROM "api_route" WHERE "api_route"."assigned_to_id" = %s ORDER BY "api_route"."date_assigned" DESC
+SELECT django_date_trunc(%s, "api_watersample"."sample_date", %s, %s) AS "group_month", COUNT(DISTINCT "api_watersample"."id") AS "count", COUNT("api_watersample"."pH") AS "pH__count", AVG(CAST("api_watersample"."pH" AS real)) AS "pH__mean", AVG((CAST("api_watersample"."pH" AS real) * CAST("api_watersample"."pH" AS real))) AS "pH__mean_sq", CAST(MIN("api_watersample"."pH") AS NUMERIC) AS "pH__min", CAST(MAX("api_watersample"."pH") AS NUMERIC) AS "pH__max", COUNT("api_watersample"."turbidity") AS "turbidity__count", AVG(CAST("api_watersample"."turbidity" AS real)) AS "turbidity__mean", AVG((CAST("api_watersample"."turbidity" AS real) * CAST("api_watersample"."turbidity" AS real))) AS "turbidity__mean_sq", CAST(MIN("api_watersample"."turbidity") AS NUMERIC) AS "turbidity__min", CAST(MAX("api_watersample"."turbidity") AS NUMERIC) AS "turbidity__max" FROM "api_watersample" INNER JOIN "api_farm" ON ("api_watersample"."farm_id" = "api_farm"."id") WHERE "api_farm"."route_id" IN (%s, %s, %s, %s) GROUP BY 1 ORDER BY 1 ASC
@@ -0,0 +1,3 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_route"."id" FROM "api_route" WHERE "api_route"."assigned_to_id" = %s ORDER BY "api_route"."date_assigned" DESC
+SELECT "api_farmchange"."id", "api_farmchange"."farm_id" FROM "api_farmchange" WHERE "api_farmchange"."id" > %s ORDER BY "api_farmchange"."id" ASC LIMIT 1001
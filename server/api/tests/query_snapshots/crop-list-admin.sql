@@ -0,0 +1,3 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_crop"
+SELECT "api_crop"."id", "api_crop"."farm_id", "api_crop"."crop_type", "api_crop"."variety", "api_crop"."planting_date", "api_crop"."expected_harvest", "api_crop"."created_at", "api_crop"."updated_at" FROM "api_crop" ORDER BY "api_crop"."planting_date" DESC LIMIT 10
@@ -0,0 +1,25 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT COUNT("api_route"."id") AS "total", COUNT("api_route"."id") FILTER (WHERE "api_route"."status" = %s) AS "completed", COUNT("api_route"."id") FILTER (WHERE "api_route"."status" = %s) AS "in_progress", COUNT("api_route"."id") FILTER (WHERE "api_route"."status" = %s) AS "pending" FROM "api_route"
+SELECT COUNT(*) AS "__count" FROM "api_farm"
+SELECT COUNT(*) AS "__count" FROM "api_farm" WHERE "api_farm"."created_at" >= %s
+SELECT COUNT(*) AS "__count" FROM "api_soilsample"
+SELECT COUNT(*) AS "__count" FROM "api_soilsample" WHERE "api_soilsample"."created_at" >= %s
+SELECT COUNT(*) AS "__count" FROM "api_watersample"
+SELECT COUNT(*) AS "__count" FROM "api_watersample" WHERE "api_watersample"."created_at" >= %s
+SELECT COUNT(*) AS "__count" FROM "api_pestdiseasereport"
+SELECT COUNT(*) AS "__count" FROM "api_pestdiseasereport" WHERE "api_pestdiseasereport"."severity" = %s
+SELECT COUNT(*) AS "__count" FROM "api_pestdiseasereport" WHERE "api_pestdiseasereport"."created_at" >= %s
+SELECT "api_soilsample"."id", "api_soilsample"."farm_id", "api_soilsample"."sample_date", "api_soilsample"."pH", "api_soilsample"."moisture_pct", "api_soilsample"."nutrient_n", "api_soilsample"."nutrient_p", "api_soilsample"."nutrient_k", "api_soilsample"."notes", "api_soilsample"."photo", "api_soilsample"."created_at", "api_soilsample"."updated_at" FROM "api_soilsample" ORDER BY "api_soilsample"."created_at" DESC LIMIT 3
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_watersample"."id", "api_watersample"."farm_id", "api_watersample"."sample_date", "api_watersample"."source", "api_watersample"."pH", "api_watersample"."turbidity", "api_watersample"."notes", "api_watersample"."photo", "api_watersample"."created_at", "api_watersample"."updated_at" FROM "api_watersample" ORDER BY "api_watersample"."created_at" DESC LIMIT 3
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" ORDER BY "api_farm"."created_at" DESC LIMIT 5
+SELECT COUNT(*) AS "__count" FROM "api_route"
+SELECT COUNT(*) AS "__count" FROM "api_route" WHERE "api_route"."status" = %s
+SELECT COUNT(*) AS "__count" FROM "api_user"
+SELECT COUNT(*) AS "__count" FROM "api_user" WHERE "api_user"."role" = %s
+SELECT COUNT(*) FROM (SELECT DISTINCT "api_farm"."id" AS "col1", "api_farm"."route_id" AS "col2", "api_farm"."name" AS "col3", "api_farm"."owner_name" AS "col4", "api_farm"."size_ha" AS "col5", "api_farm"."address" AS "col6", "api_farm"."location" AS "col7", "api_farm"."latitude" AS "col8", "api_farm"."longitude" AS "col9", "api_farm"."photo" AS "col10", "api_farm"."boundary_geo" AS "col11", "api_farm"."created_at" AS "col12", "api_farm"."updated_at" AS "col13" FROM "api_farm" LEFT OUTER JOIN "api_soilsample" ON ("api_farm"."id" = "api_soilsample"."farm_id") LEFT OUTER JOIN "api_watersample" ON ("api_farm"."id" = "api_watersample"."farm_id") WHERE ("api_soilsample"."id" IS NOT NULL OR "api_watersample"."id" IS NOT NULL)) subquery
@@ -0,0 +1,7 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_route"."id" FROM "api_route" WHERE "api_route"."assigned_to_id" = %s ORDER BY "api_route"."date_assigned" DESC
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_soilsample" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_soil_samples", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_watersample" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_water_samples", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_pestdiseasereport" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_pest_reports", "api_route"."id", "api_route"."name", "api_route"."assigned_to_id", "api_route"."date_assigned", "api_route"."status", "api_route"."version" FROM "api_farm" INNER JOIN "api_route" ON ("api_farm"."route_id" = "api_route"."id") WHERE ("api_farm"."route_id" IN (%s, %s, %s, %s) AND "api_farm"."id" = %s) LIMIT 21
+SELECT "api_crop"."id", "api_crop"."farm_id", "api_crop"."crop_type", "api_crop"."variety", "api_crop"."planting_date", "api_crop"."expected_harvest", "api_crop"."created_at", "api_crop"."updated_at" FROM "api_crop" WHERE "api_crop"."farm_id" IN (%s) ORDER BY "api_crop"."planting_date" DESC
+SELECT "col1", "col2", "col3", "col4", "col5", "col6", "col7", "col8", "col9", "col10", "col11", "col12" FROM ( SELECT * FROM ( SELECT "api_soilsample"."id" AS "col1", "api_soilsample"."farm_id" AS "col2", "api_soilsample"."sample_date" AS "col3", "api_soilsample"."pH" AS "col4", "api_soilsample"."moisture_pct" AS "col5", "api_soilsample"."nutrient_n" AS "col6", "api_soilsample"."nutrient_p" AS "col7", "api_soilsample"."nutrient_k" AS "col8", "api_soilsample"."notes" AS "col9", "api_soilsample"."photo" AS "col10", "api_soilsample"."created_at" AS "col11", "api_soilsample"."updated_at" AS "col12", ROW_NUMBER() OVER (PARTITION BY "api_soilsample"."farm_id" ORDER BY "api_soilsample"."sample_date" DESC, "api_soilsample"."created_at" DESC) AS "qual0" FROM "api_soilsample" WHERE "api_soilsample"."farm_id" IN (%s) ORDER BY "api_soilsample"."sample_date" DESC, "api_soilsample"."created_at" DESC ) "qualify" WHERE ("qual0" > %s AND "qual0" <= %s) ) "qualify_mask" ORDER BY "col3" DESC, "col11" DESC
+SELECT "col1", "col2", "col3", "col4", "col5", "col6", "col7", "col8", "col9", "col10" FROM ( SELECT * FROM ( SELECT "api_watersample"."id" AS "col1", "api_watersample"."farm_id" AS "col2", "api_watersample"."sample_date" AS "col3", "api_watersample"."source" AS "col4", "api_watersample"."pH" AS "col5", "api_watersample"."turbidity" AS "col6", "api_watersample"."notes" AS "col7", "api_watersample"."photo" AS "col8", "api_watersample"."created_at" AS "col9", "api_watersample"."updated_at" AS "col10", ROW_NUMBER() OVER (PARTITION BY "api_watersample"."farm_id" ORDER BY "api_watersample"."sample_date" DESC, "api_watersample"."created_at" DESC) AS "qual0" FROM "api_watersample" WHERE "api_watersample"."farm_id" IN (%s) ORDER BY "api_watersample"."sample_date" DESC, "api_watersample"."created_at" DESC ) "qualify" WHERE ("qual0" > %s AND "qual0" <= %s) ) "qualify_mask" ORDER BY "col3" DESC, "col9" DESC
+SELECT "col1", "col2", "col3", "col4", "col5", "col6", "col7", "col8", "col9", "col10", "col11", "col12" FROM ( SELECT * FROM ( SELECT "api_pestdiseasereport"."id" AS "col1", "api_pestdiseasereport"."farm_id" AS "col2", "api_pestdiseasereport"."report_date" AS "col3", "api_pestdiseasereport"."category" AS "col4", "api_pestdiseasereport"."name" AS "col5", "api_pestdiseasereport"."severity" AS "col6", "api_pestdiseasereport"."description" AS "col7", "api_pestdiseasereport"."photo" AS "col8", "api_pestdiseasereport"."location_lat" AS "col9", "api_pestdiseasereport"."location_lng" AS "col10", "api_pestdiseasereport"."created_at" AS "col11", "api_pestdiseasereport"."updated_at" AS "col12", ROW_NUMBER() OVER (PARTITION BY "api_pestdiseasereport"."farm_id" ORDER BY "api_pestdiseasereport"."report_date" DESC, "api_pestdiseasereport"."created_at" DESC) AS "qual0" FROM "api_pestdiseasereport" WHERE "api_pestdiseasereport"."farm_id" IN (%s) ORDER BY "api_pestdiseasereport"."report_date" DESC, "api_pestdiseasereport"."created_at" DESC ) "qualify" WHERE ("qual0" > %s AND "qual0" <= %s) ) "qualify_mask" ORDER BY "col3" DESC, "col11" DESC
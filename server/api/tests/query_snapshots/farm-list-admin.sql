@@ -0,0 +1,4 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_farm"
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_soilsample" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_soil_samples", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_watersample" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_water_samples", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_pestdiseasereport" U0 WHERE U0."farm_id" = ("api_farm"."id") GROUP BY U0."farm_id"), %s) AS "num_pest_reports", "api_route"."id", "api_route"."name", "api_route"."assigned_to_id", "api_route"."date_assigned", "api_route"."status", "api_route"."version" FROM "api_farm" INNER JOIN "api_route" ON ("api_farm"."route_id" = "api_route"."id") ORDER BY "api_farm"."created_at" DESC LIMIT 10
+SELECT "api_crop"."id", "api_crop"."farm_id", "api_crop"."crop_type", "api_crop"."variety", "api_crop"."planting_date", "api_crop"."expected_harvest", "api_crop"."created_at", "api_crop"."updated_at" FROM "api_crop" WHERE "api_crop"."farm_id" IN (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ORDER BY "api_crop"."planting_date" DESC
@@ -0,0 +1,3 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_pestdiseasereport" INNER JOIN "api_farm" ON ("api_pestdiseasereport"."farm_id" = "api_farm"."id") WHERE ("api_pestdiseasereport"."severity" = %s AND "api_pestdiseasereport"."severity" = %s)
+SELECT "api_pestdiseasereport"."id", "api_pestdiseasereport"."farm_id", "api_farm"."name", "api_pestdiseasereport"."report_date", "api_pestdiseasereport"."category", "api_pestdiseasereport"."name", "api_pestdiseasereport"."severity", "api_pestdiseasereport"."description", "api_pestdiseasereport"."photo", "api_pestdiseasereport"."location_lat", "api_pestdiseasereport"."location_lng", "api_pestdiseasereport"."created_at", "api_pestdiseasereport"."updated_at" FROM "api_pestdiseasereport" INNER JOIN "api_farm" ON ("api_pestdiseasereport"."farm_id" = "api_farm"."id") WHERE ("api_pestdiseasereport"."severity" = %s AND "api_pestdiseasereport"."severity" = %s) ORDER BY "api_pestdiseasereport"."report_date" DESC LIMIT 2
@@ -0,0 +1,4 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_route"."id" FROM "api_route" WHERE "api_route"."assigned_to_id" = %s ORDER BY "api_route"."date_assigned" DESC
+SELECT COUNT(*) AS "__count" FROM "api_route" WHERE "api_route"."id" IN (%s, %s, %s, %s)
+SELECT "api_route"."id", "api_route"."name", "api_route"."assigned_to_id", "api_route"."date_assigned", "api_route"."status", "api_route"."version", COALESCE((SELECT COUNT(U0."id") AS "total" FROM "api_farm" U0 WHERE U0."route_id" = ("api_route"."id") GROUP BY U0."route_id"), %s) AS "num_farms", COALESCE((SELECT COUNT(V0."id") AS "total" FROM "api_farm" V0 WHERE (V0."route_id" = ("api_route"."id") AND (EXISTS(SELECT %s AS "a" FROM "api_soilsample" U0 WHERE U0."farm_id" = (V0."id") LIMIT 1) OR EXISTS(SELECT %s AS "a" FROM "api_watersample" U0 WHERE U0."farm_id" = (V0."id") LIMIT 1) OR EXISTS(SELECT %s AS "a" FROM "api_pestdiseasereport" U0 WHERE U0."farm_id" = (V0."id") LIMIT 1))) GROUP BY V0."route_id"), %s) AS "num_completed_farms", "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_route" INNER JOIN "api_user" ON ("api_route"."assigned_to_id" = "api_user"."id") WHERE "api_route"."id" IN (%s, %s, %s, %s) ORDER BY "api_route"."date_assigned" DESC LIMIT 4
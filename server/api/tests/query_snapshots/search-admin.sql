@@ -0,0 +1,2 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_searchdocument"."kind", "api_searchdocument"."object_id", "api_searchdocument"."farm_id", "api_searchdocument"."title", (SELECT -bm25(api_searchdocument_fts, 10.0, 1.0) FROM api_searchdocument_fts WHERE api_searchdocument_fts MATCH %s AND rowid = "api_searchdocument"."id") AS "rank" FROM "api_searchdocument" WHERE "api_searchdocument"."id" IN (SELECT rowid FROM api_searchdocument_fts WHERE api_searchdocument_fts MATCH %s) ORDER BY 5 DESC, "api_searchdocument"."kind" ASC, "api_searchdocument"."title" ASC LIMIT 20
@@ -0,0 +1,3 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") WHERE ("api_soilsample"."pH" >= %s AND "api_soilsample"."pH" <= %s)
+SELECT "api_soilsample"."id", "api_soilsample"."farm_id", "api_farm"."name", "api_soilsample"."sample_date", "api_soilsample"."pH", "api_soilsample"."moisture_pct", "api_soilsample"."nutrient_n", "api_soilsample"."nutrient_p", "api_soilsample"."nutrient_k", "api_soilsample"."notes", "api_soilsample"."photo", "api_soilsample"."created_at", "api_soilsample"."updated_at" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") WHERE ("api_soilsample"."pH" >= %s AND "api_soilsample"."pH" <= %s) ORDER BY "api_soilsample"."sample_date" DESC LIMIT 5
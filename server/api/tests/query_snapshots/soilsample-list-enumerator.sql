@@ -0,0 +1,5 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_route"."id" FROM "api_route" WHERE "api_route"."assigned_to_id" = %s ORDER BY "api_route"."date_assigned" DESC
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") WHERE ("api_farm"."route_id" IN (%s, %s, %s, %s) AND "api_soilsample"."farm_id" = %s AND "api_soilsample"."farm_id" = %s)
+SELECT "api_soilsample"."id", "api_soilsample"."farm_id", "api_farm"."name", "api_soilsample"."sample_date", "api_soilsample"."pH", "api_soilsample"."moisture_pct", "api_soilsample"."nutrient_n", "api_soilsample"."nutrient_p", "api_soilsample"."nutrient_k", "api_soilsample"."notes", "api_soilsample"."photo", "api_soilsample"."created_at", "api_soilsample"."updated_at" FROM "api_soilsample" INNER JOIN "api_farm" ON ("api_soilsample"."farm_id" = "api_farm"."id") WHERE ("api_farm"."route_id" IN (%s, %s, %s, %s) AND "api_soilsample"."farm_id" = %s AND "api_soilsample"."farm_id" = %s) ORDER BY "api_soilsample"."sample_date" DESC LIMIT 2
@@ -0,0 +1,4 @@
+SELECT "api_user"."password", "api_user"."last_login", "api_user"."is_superuser", "api_user"."username", "api_user"."first_name", "api_user"."last_name", "api_user"."is_staff", "api_user"."is_active", "api_user"."date_joined", "api_user"."id", "api_user"."email", "api_user"."role", "api_user"."token_version" FROM "api_user" WHERE "api_user"."id" = %s LIMIT 21
+SELECT "api_farm"."id", "api_farm"."route_id", "api_farm"."name", "api_farm"."owner_name", "api_farm"."size_ha", "api_farm"."address", "api_farm"."location", "api_farm"."latitude", "api_farm"."longitude", "api_farm"."photo", "api_farm"."boundary_geo", "api_farm"."created_at", "api_farm"."updated_at" FROM "api_farm" WHERE "api_farm"."id" = %s LIMIT 21
+SELECT COUNT(*) AS "__count" FROM "api_watersample" INNER JOIN "api_farm" ON ("api_watersample"."farm_id" = "api_farm"."id") WHERE ("api_watersample"."farm_id" = %s AND "api_watersample"."farm_id" = %s)
+SELECT "api_watersample"."id", "api_watersample"."farm_id", "api_farm"."name", "api_watersample"."sample_date", "api_watersample"."source", "api_watersample"."pH", "api_watersample"."turbidity", "api_watersample"."notes", "api_watersample"."photo", "api_watersample"."created_at", "api_watersample"."updated_at" FROM "api_watersample" INNER JOIN "api_farm" ON ("api_watersample"."farm_id" = "api_farm"."id") WHERE ("api_watersample"."farm_id" = %s AND "api_watersample"."farm_id" = %s) ORDER BY "api_watersample"."sample_date" DESC LIMIT 1
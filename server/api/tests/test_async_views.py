@@ -0,0 +1,115 @@
+import datetime
+import gzip
+import os
+import shutil
+import tempfile
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, AsyncRequestFactory, TestCase, override_settings
+from django.utils.http import http_date
+
+from agrisurvey.middleware.queries import QueryRecorder
+from api.authentication import ClaimsRefreshToken
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, User
+from api.views.asynchronous import AsyncDashboardView, AsyncExportView, serve_media
+from api.views.export import ExportFarmsView, ExportSoilSamplesView
+
+
+async def body(response):
+    if response.streaming:
+        return b''.join([chunk async for chunk in response.streaming_content])
+    return response.content
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=3, farms_per_route=3, crops_per_farm=1, soil_per_farm=2, water_per_farm=1,
+                         pests_per_farm=1)
+
+    def setUp(self):
+        self.clients, _ = role_clients()
+        self.tokens = {
+            role: f"Bearer {ClaimsRefreshToken.for_user(user).access_token}"
+            for role, user in [
+                ('admin', User.objects.filter(role=User.Role.ADMIN).order_by('username').first()),
+                ('enumerator', Farm.objects.select_related('route__assigned_to').order_by('name').first()
+                 .route.assigned_to),
+            ]
+        }
+
+    async def call(self, view, path, role='admin', **headers):
+        if role:
+            headers['Authorization'] = self.tokens[role]
+        request = AsyncRequestFactory().get(path, headers=headers)
+        return await view(request)
+
+    async def test_dashboard_matches_sync_view(self):
+        for role in ['admin', 'enumerator']:
+            with self.subTest(role=role):
+                expected = await sync_to_async(self.clients[role].get)('/api/dashboard/')
+                response = await self.call(AsyncDashboardView.as_view(), '/api/dashboard/', role)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.content, expected.content)
+
+    async def test_exports_match_sync_views(self):
+        for export_view, path in [(ExportFarmsView, '/api/export/farms/'),
+                                  (ExportSoilSamplesView, '/api/export/soil-samples/')]:
+            with self.subTest(path=path):
+                expected = await sync_to_async(self.clients['admin'].get)(path)
+                expected_body = await sync_to_async(lambda: b''.join(expected.streaming_content))()
+                response = await self.call(AsyncExportView.as_view(export_view=export_view), path)
+                self.assertEqual(response['Content-Disposition'], expected['Content-Disposition'])
+                self.assertEqual(await body(response), expected_body)
+
+    async def test_authentication_and_permissions(self):
+        export = AsyncExportView.as_view(export_view=ExportFarmsView)
+        response = await self.call(export, '/api/export/farms/', role=None)
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(response.has_header('WWW-Authenticate'))
+        response = await self.call(export, '/api/export/farms/', role=None, Authorization='Bearer nonsense')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual((await self.call(export, '/api/export/farms/', 'enumerator')).status_code, 403)
+
+    async def test_middleware_runs_under_asgi(self):
+        headers = {'Authorization': self.tokens['admin'], 'Accept-Encoding': 'gzip'}
+        with QueryRecorder() as recorder:
+            response = await AsyncClient().get('/api/farms/', {'page_size': 100}, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        expected = await sync_to_async(self.clients['admin'].get)('/api/farms/', {'page_size': 100})
+        self.assertEqual(gzip.decompress(response.content), expected.content)
+        # Queries run in sync_to_async threads are recorded too
+        self.assertGreater(recorder.count, 0)
+
+
+class ServeMediaTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        os.makedirs(os.path.join(self.media_root, 'farms', 'photos'))
+        self.content = os.urandom(200 * 1024)
+        with open(os.path.join(self.media_root, 'farms', 'photos', 'a.jpg'), 'wb') as file:
+            file.write(self.content)
+
+    async def get(self, path, **headers):
+        with override_settings(MEDIA_ROOT=self.media_root):
+            return await serve_media(AsyncRequestFactory().get(f'/media/{path}', headers=headers), path)
+
+    async def test_streams_files(self):
+        response = await self.get('farms/photos/a.jpg')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(int(response['Content-Length']), len(self.content))
+        self.assertEqual(await body(response), self.content)
+
+        later = http_date((datetime.datetime.now() + datetime.timedelta(days=1)).timestamp())
+        self.assertEqual((await self.get('farms/photos/a.jpg', **{'If-Modified-Since': later})).status_code, 304)
+
+    async def test_missing_and_outside_files(self):
+        from django.http import Http404
+        for path in ['farms/photos/b.jpg', 'farms/photos', '../secret.txt']:
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    await self.get(path)
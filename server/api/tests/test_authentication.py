@@ -0,0 +1,76 @@
+from unittest import mock
+
+import jwt
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from api.authentication import USER_CLAIMS, ClaimsUser, StatelessJWTAuthentication, token_versions
+from api.models import User
+
+# Views read the authentication classes when they are defined (JWT_STATELESS_AUTH)
+STATELESS = mock.patch.object(APIView, 'authentication_classes', [StatelessJWTAuthentication])
+
+
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ann', email='ann@example.com', password='old-pass-123',
+                                             role=User.Role.ENUMERATOR, first_name='Ann')
+
+    def test_password_and_role_changes_revoke_tokens(self):
+        self.user.first_name = 'Anna'
+        self.user.save()
+        self.assertEqual(User.objects.get().token_version, 0)
+
+        self.user.set_password('new-pass-456')
+        self.user.save()
+        self.assertEqual(User.objects.get().token_version, 1)
+
+        user = User.objects.get()
+        user.role = User.Role.ADMIN
+        user.save(update_fields=['role'])
+        self.assertEqual(User.objects.get().token_version, 2)
+
+
+@STATELESS
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ann', email='ann@example.com', password='old-pass-123',
+                                             role=User.Role.ENUMERATOR, first_name='Ann')
+        token_versions.discard(self.user.pk)
+
+    def login(self):
+        response = self.client.post('/api/auth/token/', {'username': 'ann', 'password': 'old-pass-123'})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['access']
+
+    def me(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return client.get('/api/users/me/')
+
+    def test_login_issues_the_claims(self):
+        claims = jwt.decode(self.login(), options={'verify_signature': False})
+        self.assertEqual({claim: claims[claim] for claim in USER_CLAIMS},
+                         {'username': 'ann', 'role': 'enumerator', 'token_version': 0})
+        self.assertFalse({'email', 'first_name', 'last_name'} & set(claims))
+
+        response = self.me(self.login())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['email'], 'ann@example.com')
+        self.assertIsInstance(response.wsgi_request.user, ClaimsUser)
+
+    def test_profile_fields_are_loaded_for_the_dashboard(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.login()}')
+        user = client.get('/api/dashboard/').json()['user']
+        self.assertEqual((user['name'], user['email']), ('Ann', 'ann@example.com'))
+
+    def test_password_change_revokes_the_access_token(self):
+        access = self.login()
+        self.assertEqual(self.me(access).status_code, 200)
+
+        user = User.objects.get()
+        user.set_password('new-pass-456')
+        user.save()
+        self.assertEqual(self.me(access).status_code, 401)
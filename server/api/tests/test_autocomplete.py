@@ -0,0 +1,124 @@
+import random
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from api import autocomplete
+from api.autocomplete import FarmIndex, words
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm
+
+NAMES = ['Green Acres', 'Greenfield', 'Hill Top', 'River Bend', 'Old Mill', 'Sunny Side']
+OWNERS = ['Amara Perera', 'Kasun Silva', 'Nimali Fernando', 'Ruwan Bandara']
+
+
+class FarmIndexTests(SimpleTestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.routes = [uuid.uuid4() for _ in range(4)]
+        self.farms = {
+            uuid.uuid4(): (f'{rng.choice(NAMES)} {i}', rng.choice(OWNERS), rng.choice(self.routes))
+            for i in range(300)
+        }
+        self.index = FarmIndex()
+        self.index.load((farm_id, *farm) for farm_id, farm in self.farms.items())
+
+    def expected(self, query, route_ids=None):
+        terms = words(query)
+        return {
+            farm_id for farm_id, (name, owner_name, route_id) in self.farms.items()
+            if (route_ids is None or route_id in route_ids)
+            and all(any(word.startswith(term) for word in words(f'{name} {owner_name}')) for term in terms)
+        }
+
+    def assertMatches(self, query, route_ids=None):
+        results = self.index.search(query, route_ids, limit=1000)
+        self.assertEqual({result['id'] for result in results}, self.expected(query, route_ids))
+
+    def test_prefix_lookups(self):
+        for query in ['gr', 'green', 'GREEN ac', 'kas sil', 'hill 1', 'r', 'nobody']:
+            with self.subTest(query=query):
+                self.assertMatches(query)
+                self.assertMatches(query, set(self.routes[:2]))
+
+    def test_names_starting_with_the_query_first(self):
+        results = self.index.search('green', limit=1000)
+        starts = [result['name'].lower().startswith('green') for result in results]
+        self.assertEqual(starts, sorted(starts, reverse=True))
+        self.assertEqual(len(self.index.search('r', limit=5)), 5)
+
+    def test_ranks_before_limiting(self):
+        index = FarmIndex()
+        index.load([(uuid.uuid4(), name, 'Owner', self.routes[0]) for name in ['Big Green', 'Old Green', 'Greenfield']])
+        self.assertEqual([result['name'] for result in index.search('green', limit=2)], ['Greenfield', 'Big Green'])
+
+    def test_incremental_changes(self):
+        rng = random.Random(5)
+        with mock.patch.object(autocomplete, 'MERGE_SIZE', 50):
+            for i in range(200):
+                farm_id = rng.choice(list(self.farms))
+                if i % 3 == 0:
+                    del self.farms[farm_id]
+                    self.index.remove(farm_id)
+                else:
+                    if i % 3 == 1:
+                        farm_id = uuid.uuid4()
+                    self.farms[farm_id] = (f'{rng.choice(NAMES)} x{i}', rng.choice(OWNERS), rng.choice(self.routes))
+                    self.index.add(farm_id, *self.farms[farm_id])
+        for query in ['green', 'x1', 'mill per', 'sunny']:
+            with self.subTest(query=query):
+                self.assertMatches(query)
+                self.assertMatches(query, {self.routes[0]})
+
+
+class AutocompleteViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=4, farms_per_route=5, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        # A fresh process: the change log of earlier tests was rolled back
+        self.enterContext(mock.patch.object(autocomplete, 'farm_index', FarmIndex()))
+        self.clients, context = role_clients()
+        self.farm = Farm.objects.get(pk=context['farm'])
+
+    def suggest(self, query, role='admin', **params):
+        response = self.clients[role].get('/api/autocomplete/farms/', {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_scoped_suggestions(self):
+        self.assertEqual(len(self.suggest('farm', limit=50)), 20)
+        enumerator = self.suggest('farm', 'enumerator', limit=50)
+        routes = set(Farm.objects.filter(route__assigned_to=self.farm.route.assigned_to)
+                     .values_list('route', flat=True))
+        self.assertTrue(enumerator)
+        self.assertTrue(all(uuid.UUID(result['route']) in routes for result in enumerator))
+        self.assertEqual(self.suggest(''), [])
+
+    def test_follows_changes_from_any_process(self):
+        other_process = FarmIndex()
+        other_process.sync()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.farm.name = 'Zebulon Orchard'
+            self.farm.save()
+        self.assertEqual([result['id'] for result in self.suggest('zebu')], [str(self.farm.pk)])
+
+        with self.assertNumQueries(2):  # the change log, then the changed farms
+            other_process.sync()
+        self.assertEqual(other_process.search('zebu')[0]['id'], self.farm.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.farm.delete()
+        self.assertEqual(self.suggest('zebu'), [])
+
+    def test_invalidate_rebuilds(self):
+        self.suggest('farm')
+        Farm.objects.filter(pk=self.farm.pk).update(name='Quiet Valley')
+        self.assertEqual(self.suggest('quiet'), [])
+        autocomplete.invalidate()
+        self.assertEqual([result['id'] for result in self.suggest('quiet')], [str(self.farm.pk)])
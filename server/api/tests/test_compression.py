@@ -0,0 +1,60 @@
+import gzip
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from agrisurvey.middleware.compression import CompressionMiddleware, parse_accept_encoding
+
+BODY = b'{"results":[' + b','.join(b'{"pH":"6.50","farm_name":"Farm 1-1"}' for _ in range(200)) + b']}'
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024, COMPRESSION_ENCODINGS=['zstd', 'br', 'gzip'])
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept_encoding='gzip'):
+        request = RequestFactory().get('/api/farms/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_compresses_json(self):
+        response = self.process(HttpResponse(BODY, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.process(HttpResponse(b'{"detail":"ok"}', content_type='application/json'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, b'{"detail":"ok"}')
+
+    def test_respects_accept_encoding(self):
+        for header in ['', 'identity', 'gzip;q=0', 'compress', '*;q=0']:
+            with self.subTest(header=header):
+                response = self.process(HttpResponse(BODY, content_type='application/json'), header)
+                self.assertFalse(response.has_header('Content-Encoding'))
+        response = self.process(HttpResponse(BODY, content_type='application/json'), '*')
+        self.assertTrue(response.has_header('Content-Encoding'))
+
+    def test_skips_binary_and_encoded_responses(self):
+        response = self.process(HttpResponse(BODY, content_type='image/jpeg'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        encoded = HttpResponse(BODY, content_type='application/json')
+        encoded['Content-Encoding'] = 'br'
+        self.assertIs(self.process(encoded).content, encoded.content)
+
+    def test_streams_compressed_chunks(self):
+        rows = [b'id,name\r\n'] + [b'%d,Farm %d\r\n' % (i, i) for i in range(1000)]
+        response = self.process(StreamingHttpResponse(iter(rows), content_type='text/csv'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(rows))
+
+    def test_strong_etag_is_weakened(self):
+        response = HttpResponse(BODY, content_type='application/json')
+        response['ETag'] = '"abc"'
+        self.assertEqual(self.process(response)['ETag'], 'W/"abc"')
+
+    def test_parse_accept_encoding(self):
+        self.assertEqual(
+            parse_accept_encoding('gzip, br;q=0.8, zstd ; q=0.9, *;q=0'),
+            {'gzip': 1.0, 'br': 0.8, 'zstd': 0.9, '*': 0.0},
+        )
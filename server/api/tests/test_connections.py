@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from agrisurvey.db.postgresql_pool import base
+
+
+class PoolBackendTests(unittest.TestCase):
+    def wrapper(self, **options):
+        return base.DatabaseWrapper({
+            'ENGINE': 'agrisurvey.db.postgresql_pool', 'NAME': 'agrisurvey', 'USER': 'survey', 'PASSWORD': '',
+            'HOST': 'db', 'PORT': '', 'OPTIONS': options, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False,
+            'AUTOCOMMIT': True, 'ATOMIC_REQUESTS': False, 'TIME_ZONE': None, 'TEST': {},
+        }, alias='pool-test')
+
+    def test_pool_options_are_not_connection_parameters(self):
+        wrapper = self.wrapper(pool={'min_size': 1, 'max_size': 2}, sslmode='require')
+        params = wrapper.get_connection_params()
+        self.assertNotIn('pool', params)
+        self.assertEqual((params['sslmode'], params['host']), ('require', 'db'))
+
+    def test_without_pool_options(self):
+        self.assertIsNone(self.wrapper().pool)
+
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    def connect(self, name):
+        wrapper = SQLiteDatabaseWrapper({
+            'ENGINE': 'django.db.backends.sqlite3', 'NAME': name, 'USER': '', 'PASSWORD': '', 'HOST': '',
+            'PORT': '', 'OPTIONS': {}, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False, 'TIME_ZONE': None, 'TEST': {},
+        }, alias='sqlite-tuning-test')
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper.connection
+
+    def pragma(self, connection, name):
+        return connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_profile_is_applied_to_new_connections(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'tuned.sqlite3')
+
+        with override_settings(SQLITE_TUNING=True, SQLITE_CACHE_SIZE_KB=2048, SQLITE_BUSY_TIMEOUT_MS=1500):
+            connection = self.connect(path)
+        self.assertEqual(self.pragma(connection, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(connection, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(connection, 'cache_size'), -2048)
+        self.assertEqual(self.pragma(connection, 'busy_timeout'), 1500)
+
+        with override_settings(SQLITE_TUNING=True):
+            memory = self.connect(':memory:')
+        self.assertEqual(self.pragma(memory, 'journal_mode'), 'memory')
+
+    def test_off_by_default(self):
+        with override_settings(SQLITE_TUNING=False):
+            connection = self.connect(':memory:')
+        self.assertEqual(self.pragma(connection, 'synchronous'), 2)  # FULL
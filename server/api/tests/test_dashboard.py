@@ -0,0 +1,88 @@
+import contextvars
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.views import dashboard
+from api.views.dashboard import DashboardView, run_sections
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def slow(seconds, value):
+    def section(*args):
+        time.sleep(seconds)
+        return value
+    return section
+
+
+class RunSectionsTests(TestCase):
+    def test_concurrent_sections(self):
+        request_id.set('abc')
+        threads = set()
+
+        def section(name):
+            threads.add(threading.get_ident())
+            time.sleep(0.05)
+            return name, request_id.get()
+
+        start = time.perf_counter()
+        results, incomplete = run_sections({name: lambda name=name: section(name) for name in 'abc'},
+                                           concurrently=True)
+        self.assertLess(time.perf_counter() - start, 0.14)
+        self.assertEqual(results, {name: (name, 'abc') for name in 'abc'})
+        self.assertEqual(incomplete, [])
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_timeout(self):
+        sections = {'fast': lambda: 1, 'slow': slow(0.2, 2), 'late': lambda: 3}
+        self.assertEqual(run_sections(sections, timeout=0.05, concurrently=True), ({'fast': 1, 'late': 3}, ['slow']))
+        # Sequentially, the sections after the slow one are skipped
+        self.assertEqual(run_sections(sections, timeout=0.05), ({'fast': 1, 'slow': 2}, ['late']))
+
+    def test_errors_propagate(self):
+        def broken():
+            raise ValueError('boom')
+        for concurrently in [False, True]:
+            with self.assertRaisesMessage(ValueError, 'boom'):
+                run_sections({'broken': broken}, concurrently=concurrently)
+
+
+class DashboardTimeoutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=2, farms_per_route=2, crops_per_farm=0, soil_per_farm=1, water_per_farm=1,
+                         pests_per_farm=1)
+
+    def test_partial_results(self):
+        clients, _ = role_clients()
+        with override_settings(DASHBOARD_TIMEOUT_MS=20), \
+                mock.patch.object(DashboardView, '_farm_stats', slow(0.05, {'total': 0})):
+            data = clients['admin'].get('/api/dashboard/').json()
+        self.assertEqual(data['incomplete'], ['sampling', 'pest_reports', 'activity', 'admin_stats'])
+        self.assertEqual(list(data), ['user', 'routes', 'farms', 'incomplete'])
+
+
+class ConcurrentDashboardTests(TransactionTestCase):
+    # Outside a test transaction, so the workers' connections see the data
+    # (and reads may go to the replicas, when configured)
+    databases = '__all__'
+
+    def setUp(self):
+        generate_dataset(routes=3, farms_per_route=3, crops_per_farm=1, soil_per_farm=2, water_per_farm=1,
+                         pests_per_farm=1)
+        self.clients, _ = role_clients()
+
+    def test_same_result_as_sequential(self):
+        for role in ['admin', 'enumerator']:
+            with self.subTest(role=role):
+                expected = self.clients[role].get('/api/dashboard/').json()
+                with mock.patch.object(dashboard, 'can_run_concurrently', return_value=True), \
+                        mock.patch.object(dashboard, 'run_sections', wraps=run_sections) as runner:
+                    data = self.clients[role].get('/api/dashboard/').json()
+                self.assertTrue(runner.call_args.kwargs['concurrently'])
+                self.assertEqual(data, expected)
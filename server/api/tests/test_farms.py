@@ -0,0 +1,28 @@
+from django.test import TestCase, override_settings
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import SoilSample
+
+
+@override_settings(FARM_DETAIL_CHILD_LIMIT=2)
+class FarmDetailTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=2, farms_per_route=2, crops_per_farm=1, soil_per_farm=3, water_per_farm=1,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        self.clients, self.context = role_clients()
+
+    def test_child_lists_are_capped_per_farm(self):
+        response = self.clients['admin'].get(f"/api/farms/{self.context['farm']}/")
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+
+        newest = SoilSample.objects.filter(farm_id=self.context['farm']).order_by('-sample_date', '-created_at')
+        expected = [str(pk) for pk in newest.values_list('pk', flat=True)[:2]]
+        self.assertEqual([sample['id'] for sample in data['soil_samples']], expected)
+        self.assertEqual(len(data['water_samples']), 1)
+        self.assertIn(f"farm={self.context['farm']}", data['more']['soil_samples'])
+        self.assertIsNone(data['more']['water_samples'])
@@ -0,0 +1,23 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Farm, User
+
+
+class GenerateDataTests(TestCase):
+    def test_reruns_with_the_same_seed(self):
+        for _ in range(2):
+            call_command('generate_data', scale='tiny', stdout=io.StringIO())
+        admins = User.objects.filter(username__startswith='bench-admin-').values_list('username', flat=True)
+        self.assertEqual(len(admins), 2)
+
+        # Same seed, same data, under each run's users
+        runs = [
+            sorted(Farm.objects.filter(route__assigned_to__username__startswith=f"enum-{admin.split('-')[-1]}-")
+                   .values_list('name', 'owner_name', 'size_ha'))
+            for admin in admins
+        ]
+        self.assertTrue(runs[0])
+        self.assertEqual(runs[0], runs[1])
@@ -0,0 +1,35 @@
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, identify_hasher, make_password
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import User
+
+PASSWORD = 'old-pass-123'
+
+
+class PasswordUpgradeTests(TestCase):
+    def test_old_hashes_are_upgraded_on_login(self):
+        configured = get_hasher()
+        old_hashes = {
+            'pbkdf2_sha1': make_password(PASSWORD, hasher='pbkdf2_sha1'),
+            'fewer iterations': PBKDF2PasswordHasher().encode(PASSWORD, PBKDF2PasswordHasher().salt(), iterations=1000),
+        }
+        for label, encoded in old_hashes.items():
+            with self.subTest(label):
+                username = label.replace(' ', '-')
+                user = User.objects.create(username=username, email=f'{username}@example.com', password=encoded,
+                                           role=User.Role.ENUMERATOR)
+
+                response = self.client.post('/api/auth/token/', {'username': user.username, 'password': PASSWORD})
+                self.assertEqual(response.status_code, 200, response.content)
+
+                user.refresh_from_db()
+                self.assertNotEqual(user.password, encoded)
+                self.assertEqual(identify_hasher(user.password).algorithm, configured.algorithm)
+                self.assertFalse(configured.must_update(user.password))
+                self.assertTrue(user.check_password(PASSWORD))
+                # Re-encoding isn't a password change: the new tokens stay valid
+                self.assertEqual(user.token_version, 0)
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+                self.assertEqual(client.get('/api/users/me/').status_code, 200)
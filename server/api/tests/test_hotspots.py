@@ -0,0 +1,99 @@
+import datetime
+import random
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from api import hotspots
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, PestDiseaseReport
+
+URL = '/api/analytics/pests/hotspots/?date_from=2024-01-01&date_to=2025-12-31&window=60&cell_size=0.05'
+
+
+class BinningTests(SimpleTestCase):
+    def test_numpy_matches_python(self):
+        if hotspots.np is None:
+            self.skipTest('NumPy is not installed')
+        rng = random.Random(7)
+        lats = [rng.uniform(-10, 10) for _ in range(2000)]
+        lngs = [rng.uniform(75, 85) for _ in range(2000)]
+        severities = [rng.randrange(3) for _ in range(2000)]
+        for cell_size in [0.01, 0.5, 3]:
+            with self.subTest(cell_size=cell_size):
+                self.assertEqual(hotspots._bin_numpy(lats, lngs, severities, cell_size),
+                                 hotspots._bin_python(lats, lngs, severities, cell_size))
+
+    def test_windows_are_aligned(self):
+        windows = hotspots.windows_between(datetime.date(2024, 3, 10), datetime.date(2024, 4, 2), 30)
+        self.assertEqual(windows[0], hotspots.window_bounds(datetime.date(2024, 3, 10), 30))
+        self.assertEqual(windows[-1], hotspots.window_bounds(datetime.date(2024, 4, 2), 30))
+        self.assertEqual(windows[0][0], datetime.date(2024, 2, 17))
+
+
+class HotspotViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=2, farms_per_route=3, crops_per_farm=1, soil_per_farm=1, water_per_farm=1,
+                         pests_per_farm=15)
+
+    def setUp(self):
+        cache.clear()
+        self.clients, context = role_clients()
+        self.enumerator_id = Farm.objects.get(pk=context['farm']).route.assigned_to_id
+
+    def total(self, response):
+        return sum(cell['count'] for window in response.json()['windows'] for cell in window['cells'])
+
+    def located_reports(self, response):
+        windows = response.json()['windows']
+        return PestDiseaseReport.objects.filter(
+            report_date__range=(windows[0]['start'], windows[-1]['end']), location_lat__isnull=False,
+        )
+
+    def test_counts_every_located_report(self):
+        response = self.clients['admin'].get(URL)
+        self.assertEqual(self.total(response), self.located_reports(response).count())
+        for cell in (cell for window in response.json()['windows'] for cell in window['cells']):
+            self.assertEqual(cell['hotspot'], cell['high'] >= 3)
+
+    def test_cached_until_a_report_changes(self):
+        first = self.clients['admin'].get(URL)
+        with self.assertNumQueries(2):  # authentication and the generation
+            self.assertEqual(self.clients['admin'].get(URL).json(), first.json())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PestDiseaseReport.objects.filter(report_date__range=('2024-01-01', '2025-12-31')).first().delete()
+        self.assertEqual(self.total(self.clients['admin'].get(URL)), self.total(first) - 1)
+
+    def test_a_write_leaves_other_windows_cached(self):
+        self.clients['admin'].get(URL)
+        report = PestDiseaseReport.objects.filter(report_date__range=('2024-01-01', '2025-12-31')).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            report.severity = PestDiseaseReport.Severity.HIGH
+            report.save()
+        # Authentication, generations, then the one window holding the report
+        with self.assertNumQueries(3):
+            response = self.clients['admin'].get(URL)
+        self.assertEqual(self.total(response), self.located_reports(response).count())
+
+        # Moving a report recomputes its old and new windows
+        with self.captureOnCommitCallbacks(execute=True):
+            moved = datetime.date(2024, 1, 1) if report.report_date.year == 2025 else datetime.date(2025, 12, 1)
+            report.report_date = moved
+            report.save()
+        with self.assertNumQueries(4):
+            response = self.clients['admin'].get(URL)
+        self.assertEqual(self.total(response), self.located_reports(response).count())
+
+    def test_enumerators_see_their_routes(self):
+        response = self.clients['enumerator'].get(URL)
+        reports = self.located_reports(response).filter(farm__route__assigned_to_id=self.enumerator_id)
+        self.assertEqual(self.total(response), reports.count())
+
+    def test_rejects_bad_parameters(self):
+        for query in ['window=0', 'cell_size=x', 'min_high=0', 'date_from=2020-01-01&window=1',
+                      'date_from=2025-01-02&date_to=2025-01-01', 'route=abc']:
+            with self.subTest(query=query):
+                self.assertEqual(self.clients['admin'].get(f'/api/analytics/pests/hotspots/?{query}').status_code, 400)
@@ -0,0 +1,167 @@
+import csv
+import io
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from api import imports
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, Route, SearchDocument, SoilSample
+
+
+def csv_file(rows, name='data.csv'):
+    stream = io.StringIO()
+    csv.writer(stream).writerows(rows)
+    return SimpleUploadedFile(name, stream.getvalue().encode(), content_type='text/csv')
+
+
+class ImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=2, farms_per_route=2, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        self.clients, context = role_clients()
+        self.farm = Farm.objects.get(pk=context['farm'])
+        self.route = Route.objects.first()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(IMPORT_REPORT_DIR=directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def upload(self, kind, file, role='admin', **data):
+        return self.clients[role].post(f'/api/imports/{kind}/', {'file': file, **data}, format='multipart')
+
+    def test_imports_valid_rows_and_reports_the_rest(self):
+        rows = [
+            ['route', 'name', 'owner_name', 'size_ha', 'address', 'latitude', 'boundary_geo', 'legacy_code'],
+            [self.route.pk, 'Mango Grove', 'Ann Silva', '2.5', '1 Hill Road', '', '{"type": "Polygon"}', 'A1'],
+            [self.route.pk, 'Tea Estate', 'Ravi Perera', '0', '2 Hill Road', '', '', 'A2'],
+            ['not-a-route', 'Paddy', 'Kumar', '1', '', '', '', 'A3'],
+            ['', '', '', '', '', '', '', ''],
+            [self.route.pk, 'River Bend', 'Mala Jay', '1.25', '3 River Road', '7.2', '', 'A4'],
+        ]
+        response = self.upload('farms', csv_file(rows))
+        self.assertEqual(response.status_code, 200, response.content)
+        result = response.json()
+        self.assertEqual((result['rows'], result['created'], result['failed']), (4, 2, 2))
+        self.assertEqual([error['row'] for error in result['errors']], [3, 4])
+        self.assertEqual(set(result['errors'][1]['errors']), {'route', 'address'})
+
+        farm = Farm.objects.get(name='Mango Grove')
+        self.assertEqual(farm.boundary_geo, {'type': 'Polygon'})
+        self.assertIsNone(farm.latitude)
+        self.assertTrue(SearchDocument.objects.filter(object_id=farm.pk).exists())
+
+        report = self.clients['admin'].get(result['report'])
+        self.assertEqual(report.status_code, 200)
+        lines = list(csv.reader(io.StringIO(b''.join(report.streaming_content).decode())))
+        self.assertEqual(lines[0], ['row', 'errors', *rows[0]])
+        self.assertEqual([line[0] for line in lines[1:]], ['3', '4'])
+        self.assertIn('size_ha: Size must be greater than 0.', lines[1][1])
+
+    def test_soil_samples_and_dry_run(self):
+        rows = [
+            ['farm', 'sample_date', 'pH', 'moisture_pct', 'nutrient_n'],
+            [self.farm.pk, '2024-03-01', '6.5', '', '120'],
+            [self.farm.pk, '2999-01-01', '15', '30', '1000'],
+        ]
+        result = self.upload('soil_samples', csv_file(rows), dry_run='true').json()
+        self.assertEqual((result['rows'], result['created'], result['failed']), (2, 0, 1))
+        self.assertEqual(set(result['errors'][0]['errors']), {'sample_date', 'pH', 'nutrient_n'})
+        self.assertFalse(SoilSample.objects.exists())
+
+        with self.assertNumQueries(6):  # farms, then the savepoint, insert and indexing
+            result = imports.import_rows('soil_samples', *imports.read_rows(csv_file(rows), 'data.csv'))
+        self.assertEqual(result['created'], 1)
+        self.assertIsNone(SoilSample.objects.get().moisture_pct)
+
+    def test_chunks(self):
+        rows = [['route', 'name', 'owner_name', 'size_ha', 'address']]
+        rows += [[self.route.pk, f'Imported {i}', 'Owner', '1', 'Road'] for i in range(25)]
+        before = Farm.objects.count()
+        result = imports.import_rows('farms', rows[0], iter(rows[1:]), chunk_size=10)
+        self.assertEqual(result['created'], 25)
+        self.assertEqual(Farm.objects.count(), before + 25)
+
+    def test_rejects_unusable_files(self):
+        for file in [
+            csv_file([['name', 'owner_name']]),
+            csv_file([['route', 'name']], name='farms.txt'),
+            csv_file([]),
+        ]:
+            with self.subTest(file=file.name):
+                response = self.upload('farms', file)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('file', response.json())
+        self.assertEqual(self.upload('routes', csv_file([['name']])).status_code, 404)
+        self.assertEqual(self.upload('farms', csv_file([['name']]), role='enumerator').status_code, 403)
+
+    def test_unreadable_rows_after_imported_chunks(self):
+        stream = io.StringIO()
+        writer = csv.writer(stream)
+        writer.writerow(['route', 'name', 'owner_name', 'size_ha', 'address'])
+        writer.writerows([self.route.pk, f'Farm {i}', 'Owner', '1', 'Road ' + 'x' * 400] for i in range(40))
+        data = stream.getvalue().encode() + b'bad,\xff\xfe,row,1,Road\r\n'
+
+        before = Farm.objects.count()
+        header, rows = imports.read_rows(io.BytesIO(data), 'data.csv')
+        with self.assertRaisesMessage(imports.ImportFileError, 'or a later one is not readable') as caught:
+            imports.import_rows('farms', header, rows, chunk_size=10)
+        result = caught.exception.result
+        self.assertEqual(result['created'], Farm.objects.count() - before)
+        self.assertGreater(result['created'], 0)
+
+        response = self.upload('farms', SimpleUploadedFile('data.csv', data))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not readable', response.json()['file'][0])
+        self.assertEqual((response.json()['created'], response.json()['report']), (0, None))
+
+    @unittest.skipIf(imports.openpyxl is None, 'openpyxl is not installed')
+    def test_xlsx(self):
+        import datetime
+        workbook = imports.openpyxl.Workbook()
+        workbook.active.append(['farm', 'sample_date', 'pH'])
+        workbook.active.append([str(self.farm.pk), datetime.datetime(2024, 3, 1), 6.5])
+        stream = io.BytesIO()
+        workbook.save(stream)
+        response = self.upload('soil_samples', SimpleUploadedFile('lab.xlsx', stream.getvalue()))
+        self.assertEqual(response.json()['created'], 1, response.content)
+
+
+class ImportConstraintTests(TransactionTestCase):
+    """Rows breaking a constraint on insert, outside a test transaction so it is checked on commit"""
+
+    def setUp(self):
+        generate_dataset(routes=2, farms_per_route=1, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def test_chunk_breaking_a_constraint_is_inserted_row_by_row(self):
+        kept, deleted = Route.objects.all()[:2]
+        header = ['route', 'name', 'owner_name', 'size_ha', 'address']
+        rows = [[route.pk, f'Imported {i}', 'Owner', '1', 'Road'] for i, route in enumerate([kept, deleted, kept])]
+        prefetch = imports.ChunkRelatedField.prefetch
+
+        def prefetch_then_delete(field, values):
+            # The route is deleted by another request after the chunk fetched it
+            prefetch(field, values)
+            deleted.delete()
+
+        report = io.StringIO()
+        with mock.patch.object(imports.ChunkRelatedField, 'prefetch', prefetch_then_delete):
+            result = imports.import_rows('farms', header, iter(rows), report=report)
+
+        self.assertEqual((result['rows'], result['created'], result['failed']), (3, 2, 1))
+        self.assertEqual([error['row'] for error in result['errors']], [3])
+        self.assertEqual(set(Farm.objects.filter(name__startswith='Imported ').values_list('name', flat=True)),
+                         {'Imported 0', 'Imported 2'})
+        reported = list(csv.reader(io.StringIO(report.getvalue())))
+        self.assertEqual([row[0] for row in reported[1:]], ['3'])
+        self.assertIn('Could not be saved', reported[1][1])
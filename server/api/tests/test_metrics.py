@@ -0,0 +1,22 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from agrisurvey.metrics import metrics_view
+
+
+class MetricsViewTests(SimpleTestCase):
+    def get(self, **headers):
+        return metrics_view(RequestFactory().get('/metrics', headers=headers))
+
+    def test_requires_a_token_outside_debug(self):
+        with override_settings(METRICS_TOKEN='', DEBUG=False):
+            self.assertEqual(self.get().status_code, 403)
+        with override_settings(METRICS_TOKEN='', DEBUG=True):
+            self.assertEqual(self.get().status_code, 200)
+
+    def test_token(self):
+        with override_settings(METRICS_TOKEN='secret', DEBUG=False):
+            self.assertEqual(self.get().status_code, 401)
+            self.assertEqual(self.get(Authorization='Bearer wrong').status_code, 401)
+            response = self.get(Authorization='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'agrisurvey_request_duration_seconds', response.content)
@@ -0,0 +1,46 @@
+import sys
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from agrisurvey.middleware.profiling import ProfilingMiddleware
+from api.authentication import ClaimsRefreshToken
+from api.benchmarks.data import generate_dataset
+from api.models import User
+
+
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=1, farms_per_route=1, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(PROFILING_DIR=directory.name, PROFILING_SAMPLE_EVERY=0))
+        self.profiled = []
+
+        def get_response(request):
+            self.profiled.append(sys.getprofile() is not None)
+            return HttpResponse()
+
+        self.middleware = ProfilingMiddleware(get_response)
+
+    def get(self, role=None):
+        headers = {'X-Profile': '1'}
+        if role is not None:
+            user = User.objects.filter(role=role).first()
+            headers['Authorization'] = f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'
+        return self.middleware(RequestFactory().get('/api/routes/', headers=headers))
+
+    def test_only_admins_can_request_a_profile(self):
+        for role in [None, User.Role.ENUMERATOR]:
+            self.assertNotIn('X-Profile-Id', self.get(role))
+        bad_token = RequestFactory().get('/api/routes/', headers={'X-Profile': '1', 'Authorization': 'Bearer x'})
+        self.assertNotIn('X-Profile-Id', self.middleware(bad_token))
+        self.assertEqual(self.profiled, [False, False, False])
+
+        self.assertIn('X-Profile-Id', self.get(User.Role.ADMIN))
+        self.assertEqual(self.profiled[-1], True)
@@ -0,0 +1,51 @@
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import ENDPOINTS, endpoint_label
+from api.tests.harness import Budget, QueryBudgetTestCase
+
+# Maximum queries per request against the 'tiny' dataset; none may grow with
+# the number of rows returned
+BUDGETS = {
+    'farm-list[admin]': Budget(queries=4),
+    'farm-list[enumerator]': Budget(queries=5),
+    'farm-detail[admin]': Budget(queries=6),
+    'farm-detail[enumerator]': Budget(queries=7),
+    'route-list[admin]': Budget(queries=3),
+    'route-list[enumerator]': Budget(queries=4),
+    'dashboard[admin]': Budget(queries=25),
+    'dashboard[enumerator]': Budget(queries=21),
+    'soilsample-list[admin]': Budget(queries=3),
+    'soilsample-list[enumerator]': Budget(queries=5),
+    'watersample-list[admin]': Budget(queries=4),
+    'pestdisease-list[admin]': Budget(queries=3),
+    'crop-list[admin]': Budget(queries=3),
+    'analytics_soil[admin]': Budget(queries=4),
+    'analytics_water[enumerator]': Budget(queries=4),
+    'analytics_pests[admin]': Budget(queries=3),
+    'analytics_pest_hotspots[admin]': Budget(queries=2),
+    'search[admin]': Budget(queries=2),
+    'autocomplete_farms[enumerator]': Budget(queries=3),
+    'export_farms[admin]': Budget(queries=2),
+    'export_soil_samples[admin]': Budget(queries=2),
+    'export_water_samples[admin]': Budget(queries=2),
+    'export_pest_disease[admin]': Budget(queries=2),
+}
+
+
+class EndpointBudgetTests(QueryBudgetTestCase):
+    """Guard the key endpoints against N+1 query regressions"""
+
+    def test_every_endpoint_has_a_budget(self):
+        self.assertEqual({endpoint_label(e) for e in ENDPOINTS}, set(BUDGETS))
+
+    def test_endpoints_within_budget(self):
+        for endpoint in ENDPOINTS:
+            label = endpoint_label(endpoint)
+            with self.subTest(label):
+                self.assertWithinBudget(endpoint, BUDGETS[label])
+
+    def test_route_list_budget_does_not_grow_with_routes(self):
+        generate_dataset(routes=12, farms_per_route=3, soil_per_farm=1, water_per_farm=1, pests_per_farm=1)
+        for endpoint in ENDPOINTS:
+            if endpoint.name == 'route-list':
+                with self.subTest(endpoint.role):
+                    self.assertWithinBudget(endpoint, BUDGETS[endpoint_label(endpoint)])
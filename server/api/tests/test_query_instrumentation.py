@@ -0,0 +1,73 @@
+import json
+from unittest import mock
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from agrisurvey.middleware.queries import QueryInstrumentationMiddleware
+from api.models import Route, User
+
+
+def run_queries(count):
+    for _ in range(count):
+        User.objects.exists()
+
+
+class QueryInstrumentationTests(TestCase):
+    def request(self, get_response, **settings):
+        with override_settings(**{'SQL_INSTRUMENTATION_SAMPLE_RATE': 1.0, **settings}):
+            middleware = QueryInstrumentationMiddleware(get_response)
+        return middleware(RequestFactory().get('/api/routes/'))
+
+    def view(self, queries=3, **headers):
+        def get_response(request):
+            run_queries(queries)
+            return HttpResponse(headers=headers)
+        return get_response
+
+    def test_server_timing_and_log_line(self):
+        with self.assertLogs('agrisurvey.sql', 'INFO') as logs:
+            response = self.request(self.view(queries=3, **{'Server-Timing': 'cache;dur=1'}))
+
+        timing = response['Server-Timing']
+        self.assertTrue(timing.startswith('cache;dur=1, db;dur='), timing)
+        self.assertIn('desc="3 queries"', timing)
+        self.assertIn(', app;dur=', timing)
+
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record['path'], record['status'], record['query_count']), ('/api/routes/', 200, 3))
+        self.assertNotIn('duplicates', record)
+
+    def test_repeated_statements_are_logged_as_warnings(self):
+        with self.assertLogs('agrisurvey.sql', 'INFO') as logs:
+            self.request(self.view(queries=3), SQL_DUPLICATE_THRESHOLD=3)
+        self.assertEqual(logs.records[0].levelname, 'WARNING')
+        self.assertEqual(json.loads(logs.records[0].getMessage())['duplicates'][0]['count'], 3)
+
+    def test_sampling(self):
+        with mock.patch('agrisurvey.middleware.queries.random.random', side_effect=[0.2, 0.7]):
+            with self.assertLogs('agrisurvey.sql', 'INFO') as logs:
+                sampled = self.request(self.view(), SQL_INSTRUMENTATION_SAMPLE_RATE=0.5)
+                skipped = self.request(self.view(), SQL_INSTRUMENTATION_SAMPLE_RATE=0.5)
+        self.assertIn('Server-Timing', sampled)
+        self.assertNotIn('Server-Timing', skipped)
+        self.assertEqual(len(logs.records), 1)
+
+        with self.assertNoLogs('agrisurvey.sql'):
+            self.assertNotIn('Server-Timing', self.request(self.view(), SQL_INSTRUMENTATION_SAMPLE_RATE=0.0))
+
+    def test_streamed_content_is_not_measured(self):
+        def content():
+            yield str(Route.objects.count())
+
+        def get_response(request):
+            run_queries(1)
+            return StreamingHttpResponse(content())
+
+        with self.assertLogs('agrisurvey.sql', 'INFO'):
+            response = self.request(get_response)
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        # The content's query runs after the middleware has reported
+        with self.assertNumQueries(1):
+            self.assertEqual(b''.join(response.streaming_content), b'0')
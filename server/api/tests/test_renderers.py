@@ -0,0 +1,62 @@
+import datetime
+import uuid
+from io import BytesIO
+from decimal import Decimal
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'size_ha': Decimal('12.50'),
+    'latitude': Decimal('7.1234567'),
+    'sample_date': datetime.date(2024, 3, 1),
+    'created_at': datetime.datetime(2024, 3, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    'label': gettext_lazy('Low'),
+    'notes': 'line\u2028separator\u2029 é "quoted"',
+    1: [None, True, 0.25, -3],
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameAsDRF(self, data, accepted_media_type=None, renderer_context=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type, renderer_context),
+            JSONRenderer().render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_matches_drf_output(self):
+        self.assertSameAsDRF(PAYLOAD)
+        self.assertSameAsDRF([PAYLOAD, PAYLOAD])
+        self.assertSameAsDRF(None)
+
+    @override_settings(REST_FRAMEWORK={'COERCE_DECIMAL_TO_STRING': False})
+    def test_decimals_as_floats(self):
+        self.assertSameAsDRF({'pH': Decimal('6.50'), 'location_lat': Decimal('7.853084')})
+
+    def test_indented_output_falls_back(self):
+        self.assertSameAsDRF(PAYLOAD, 'application/json; indent=4')
+        self.assertSameAsDRF(PAYLOAD, renderer_context={'indent': 2})
+
+    def test_unencodable_values_fall_back(self):
+        self.assertSameAsDRF({'big': 2 ** 70})
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(BytesIO(body), 'application/json', {})
+
+    def test_matches_drf_parser(self):
+        body = '{"name": "Farm é", "pH": 6.5, "ids": [1, 2], "photo": null}'.encode()
+        self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_json_is_a_parse_error(self):
+        for body in [b'{"a": ', b'{"a": NaN}']:
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
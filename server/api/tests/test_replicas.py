@@ -0,0 +1,155 @@
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from agrisurvey.db import routers
+from agrisurvey.db.routers import ReplicaRouter
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, Route
+
+
+class RecordingRouter(ReplicaRouter):
+    """ReplicaRouter noting the replica each read was given (None for the primary)"""
+
+    reads = []
+
+    def db_for_read(self, model, **hints):
+        holder = routers._replica.get()
+        self.reads.append(holder[0] if holder else None)
+        return super().db_for_read(model, **hints)
+
+
+class RoutingRecorder(ReplicaRouter):
+    """
+    ReplicaRouter noting the alias each query was routed to and the thread
+    it ran on, while running every query on the test database
+    """
+
+    routed = []
+
+    def db_for_read(self, model, **hints):
+        return self._record('read', super().db_for_read(model, **hints))
+
+    def db_for_write(self, model, **hints):
+        return self._record('write', super().db_for_write(model, **hints))
+
+    def _record(self, operation, alias):
+        self.routed.append((operation, threading.current_thread().name, alias))
+        return DEFAULT_DB_ALIAS
+
+
+# The test database stands in for the replica; the reads recorded show
+# which one the router picked
+@override_settings(
+    DATABASE_REPLICAS=['default'],
+    DATABASE_ROUTERS=['api.tests.test_replicas.RecordingRouter'],
+    MIDDLEWARE=[*settings.MIDDLEWARE, 'agrisurvey.middleware.replicas.ReplicaMiddleware'],
+)
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=2, farms_per_route=2, crops_per_farm=0, soil_per_farm=1, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        cache.clear()
+        self.clients, self.context = role_clients()
+
+    def reads(self, role, path):
+        RecordingRouter.reads = []
+        response = self.clients[role].get(path)
+        self.assertEqual(response.status_code, 200, path)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return set(RecordingRouter.reads)
+
+    def test_read_only_views_use_replicas(self):
+        for path in ['/api/farms/', f"/api/farms/{self.context['farm']}/", '/api/dashboard/',
+                     '/api/analytics/soil/?group_by=route', '/api/export/farms/']:
+            with self.subTest(path=path):
+                self.assertEqual(self.reads('admin', path), {'default'})
+        self.assertEqual(self.reads('admin', '/api/search/?q=farm'), {None})
+
+    def test_writes_pin_the_writer_to_the_primary(self):
+        route = Route.objects.first()
+        response = self.clients['admin'].post('/api/farms/', {
+            'route': route.pk, 'name': 'New Farm', 'owner_name': 'Ann Silva', 'size_ha': 1, 'address': 'Road',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.reads('admin', '/api/farms/'), {None})
+        self.assertEqual(self.reads('enumerator', '/api/farms/'), {'default'})
+
+        cache.delete(routers.PIN_KEY.format(response.wsgi_request.user.pk))
+        self.assertEqual(self.reads('admin', '/api/farms/'), {'default'})
+
+    def test_outside_requests_and_transactions_use_the_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Farm), 'default')
+        token = routers.start_request()
+        try:
+            routers.read_from_replica()
+            # Inside the test's transaction
+            self.assertEqual(router.db_for_read(Farm), 'default')
+        finally:
+            routers.end_request(token)
+        self.assertTrue(router.allow_migrate('default', 'api'))
+        self.assertFalse(router.allow_migrate('replica1', 'api'))
+
+    def test_replicas_require_a_shared_cache(self):
+        self.assertEqual([error.id for error in routers.check_shared_cache(None)], ['agrisurvey.E001'])
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(routers.check_shared_cache(None), [])
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(routers.check_shared_cache(None), [])
+
+
+# Outside a test transaction, so reads aren't kept on the primary and the
+# dashboard's worker threads see the rows
+@override_settings(
+    DATABASE_REPLICAS=['replica1'],
+    DATABASE_ROUTERS=['api.tests.test_replicas.RoutingRecorder'],
+    MIDDLEWARE=[*settings.MIDDLEWARE, 'agrisurvey.middleware.replicas.ReplicaMiddleware'],
+)
+class ReplicaThreadTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        generate_dataset(routes=2, farms_per_route=2, crops_per_farm=0, soil_per_farm=1, water_per_farm=1,
+                         pests_per_farm=1)
+        self.clients, _ = role_clients()
+        RoutingRecorder.routed = []
+
+    def test_dashboard_sections_read_from_the_replica(self):
+        with mock.patch('api.views.dashboard.can_run_concurrently', return_value=True):
+            response = self.clients['admin'].get('/api/dashboard/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertNotIn('incomplete', response.json())
+
+        in_sections = {alias for operation, thread, alias in RoutingRecorder.routed if thread.startswith('dashboard')}
+        self.assertEqual(in_sections, {'replica1'})
+        self.assertNotIn('write', {operation for operation, _, _ in RoutingRecorder.routed})
+
+    def test_atomic_blocks_stay_on_the_primary(self):
+        route = Route.objects.first()
+        token = routers.start_request()
+        try:
+            routers.read_from_replica()
+            RoutingRecorder.routed = []
+            Farm.objects.count()
+            self.assertEqual(RoutingRecorder.routed[-1][::2], ('read', 'replica1'))
+
+            RoutingRecorder.routed = []
+            with transaction.atomic():
+                farm = Farm.objects.create(route=route, name='New Farm', owner_name='Ann Silva', size_ha=1,
+                                           address='Road')
+                self.assertTrue(Farm.objects.filter(pk=farm.pk).exists())
+        finally:
+            routers.end_request(token)
+        self.assertTrue(RoutingRecorder.routed)
+        self.assertEqual({alias for _, _, alias in RoutingRecorder.routed}, {DEFAULT_DB_ALIAS})
+        self.assertIn('write', {operation for operation, _, _ in RoutingRecorder.routed})
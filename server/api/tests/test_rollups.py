@@ -0,0 +1,89 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, PestDiseaseReport, Route, SoilSample, StaleRollup, WaterSample
+from api.rollups import DATED_MODELS, refresh_rollups
+
+QUERIES = [
+    'soil/', 'soil/?group_by=route', 'soil/?group_by=month,crop_type',
+    'water/?group_by=week&date_from=2025-01-01', 'pests/?group_by=route,month', 'pests/?group_by=crop_type',
+]
+
+
+class RollupTests(TestCase):
+    """Analytics answered from the rollups must match the ones computed from the samples"""
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=3, farms_per_route=4, crops_per_farm=2, soil_per_farm=5, water_per_farm=3,
+                         pests_per_farm=3)
+
+    def setUp(self):
+        self.clients, self.path_context = role_clients()
+
+    def assertMatchesSamples(self):
+        for role, client in self.clients.items():
+            for query in QUERIES + [f'soil/?group_by=month&farm={self.path_context["farm"]}']:
+                with self.subTest(role=role, query=query):
+                    with override_settings(ANALYTICS_USE_ROLLUPS=False):
+                        expected = client.get(f'/api/analytics/{query}').json()
+                    actual = client.get(f'/api/analytics/{query}').json()
+                    self.assertEqual((expected.pop('source'), actual.pop('source')), ('samples', 'rollups'))
+                    expected.pop('refreshed_through')
+                    self.assertIsNotNone(actual.pop('refreshed_through'))
+                    self.assertEqual(actual, expected)
+
+    def test_full_refresh(self):
+        refresh_rollups(full=True)
+        self.assertMatchesSamples()
+
+    def test_incremental_refresh(self):
+        refresh_rollups()
+        sample = SoilSample.objects.first()
+        sample.sample_date, sample.pH = datetime.date(2020, 1, 1), Decimal('3.10')
+        sample.save()
+        WaterSample.objects.first().delete()
+        PestDiseaseReport.objects.last().delete()
+        farm = Farm.objects.first()
+        farm.route = Route.objects.exclude(pk=farm.route_id).first()
+        farm.save()
+        Farm.objects.last().delete()
+        self.assertTrue(StaleRollup.objects.exists())
+
+        refresh_rollups()
+        self.assertFalse(StaleRollup.objects.exists())
+        self.assertMatchesSamples()
+
+    @override_settings(ROLLUP_WATERMARK_OVERLAP=0)
+    def test_incremental_refresh_reads_rows_changed_since_the_watermark(self):
+        refresh_rollups()
+        self.assertEqual(refresh_rollups()['farm_days'], 0)
+        sample = SoilSample.objects.first()
+        sample.pH = Decimal('5.55')
+        sample.save()
+        self.assertEqual(refresh_rollups()['farm_days'], 1)
+        self.assertMatchesSamples()
+
+        if connection.vendor == 'sqlite':
+            for model, _ in DATED_MODELS:
+                with self.subTest(model=model.__name__):
+                    plan = model.objects.filter(updated_at__gte=sample.updated_at).values('farm_id').explain()
+                    self.assertIn('updated_', plan)
+                    self.assertIn('INDEX', plan)
+
+    def test_samples_used_until_first_refresh(self):
+        response = self.clients['admin'].get('/api/analytics/soil/')
+        self.assertEqual(response.json()['source'], 'samples')
+        self.assertIsNone(response.json()['refreshed_through'])
+
+    def test_rejects_malformed_ids(self):
+        for query in ['soil/?route=abc', 'water/?farm=1', 'pests/?route=abc&group_by=route']:
+            with self.subTest(query=query):
+                response = self.clients['admin'].get(f'/api/analytics/{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.json()), [query.split('?')[1].split('=')[0]])
@@ -0,0 +1,116 @@
+import uuid
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, Route
+
+
+class RouteStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=4, farms_per_route=1, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def setUp(self):
+        self.clients, context = role_clients()
+        self.route = Farm.objects.get(pk=context['farm']).route
+        Route.objects.update(status=Route.Status.PENDING)
+
+    def update_status(self, role='enumerator', **data):
+        return self.clients[role].post(f'/api/routes/{self.route.pk}/update_status/', data,
+                                       content_type='application/json')
+
+    def test_writes_only_status_and_version(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.update_status(status='in_progress')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json(), {
+            'id': str(self.route.pk), 'status': 'in_progress', 'status_display': 'In Progress',
+            'version': self.route.version + 1,
+        })
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"name"', updates[0])
+        self.route.refresh_from_db()
+        self.assertEqual((self.route.status, self.route.version), ('in_progress', 1))
+
+        # The same status again writes nothing
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.update_status(status='in_progress').json()['version'], 1)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+
+    def test_stale_version_conflicts(self):
+        self.assertEqual(self.update_status(status='in_progress', version=0).status_code, 200)
+        response = self.update_status(status='complete', version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual((response.json()['status'], response.json()['version']), ('in_progress', 1))
+        self.assertEqual(self.update_status(status='complete', version=1).json()['version'], 2)
+
+        self.assertEqual(self.update_status(status='complete', version='x').status_code, 400)
+        self.assertEqual(self.update_status(status='completed').status_code, 400)
+
+    def test_edits_bump_the_version_on_status_changes(self):
+        url = f'/api/routes/{self.route.pk}/'
+        response = self.clients['admin'].patch(url, {'name': 'Renamed'}, content_type='application/json')
+        self.assertEqual(response.json()['version'], 0)
+        response = self.clients['admin'].patch(url, {'status': 'complete'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['version'], 1)
+
+        response = self.update_status(status='in_progress', version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual((response.json()['status'], response.json()['version']), ('complete', 1))
+
+    def test_edits_check_the_version(self):
+        url = f'/api/routes/{self.route.pk}/'
+        self.assertEqual(self.update_status(status='in_progress', version=0).status_code, 200)
+
+        for method, data in [('patch', {'name': 'Renamed'}), ('put', {'name': 'Renamed', 'status': 'complete',
+                                                                      'assigned_to': str(self.route.assigned_to_id)})]:
+            with self.subTest(method):
+                response = getattr(self.clients['admin'], method)(url, {**data, 'version': 0},
+                                                                  content_type='application/json')
+                self.assertEqual(response.status_code, 409, response.content)
+                self.assertEqual((response.json()['status'], response.json()['version']), ('in_progress', 1))
+                self.assertEqual(Route.objects.get(pk=self.route.pk).name, self.route.name)
+
+        response = self.clients['admin'].patch(url, {'name': 'Renamed', 'version': 1}, content_type='application/json')
+        self.assertEqual((response.status_code, response.json()['version']), (200, 1))
+        response = self.clients['admin'].patch(url, {'status': 'complete', 'version': '1'},
+                                               content_type='application/json')
+        self.assertEqual((response.status_code, response.json()['version']), (200, 2))
+        response = self.clients['admin'].patch(url, {'name': 'Again', 'version': 'x'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Route.objects.get(pk=self.route.pk).name, 'Renamed')
+
+    def test_bulk_update(self):
+        others = list(Route.objects.exclude(pk=self.route.pk).values_list('pk', flat=True))
+        Route.objects.filter(pk=others[0]).update(status=Route.Status.COMPLETE)
+        missing = uuid.uuid4()
+        ids = [str(pk) for pk in [self.route.pk, *others, missing]]
+
+        response = self.clients['enumerator'].post('/api/routes/bulk_update_status/', {
+            'ids': ids, 'status': 'complete',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+        with self.assertNumQueries(5):  # token check, then savepoint, lookup, update, release
+            response = self.clients['admin'].post('/api/routes/bulk_update_status/', {
+                'ids': ids, 'status': 'complete',
+            }, content_type='application/json')
+        self.assertEqual(response.json(), {
+            'status': 'complete', 'updated': 3, 'unchanged': 1, 'not_found': [str(missing)],
+        })
+        self.assertFalse(Route.objects.exclude(status=Route.Status.COMPLETE).exists())
+        self.assertEqual(Route.objects.get(pk=others[0]).version, 0)
+
+        for data in [{'ids': ['nope'], 'status': 'complete'}, {'ids': [], 'status': 'complete'},
+                     {'ids': ids, 'status': 'done'}]:
+            with self.subTest(data=data):
+                response = self.clients['admin'].post('/api/routes/bulk_update_status/', data,
+                                                      content_type='application/json')
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,86 @@
+from django.test import RequestFactory, TestCase
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, PestDiseaseReport, Route, SoilSample, User
+from api.scope import get_user_scope
+
+
+class ScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=10, farms_per_route=1, crops_per_farm=0, soil_per_farm=1, water_per_farm=0,
+                         pests_per_farm=1)
+
+    def setUp(self):
+        self.clients, context = role_clients()
+        self.farm = Farm.objects.select_related('route__assigned_to').get(pk=context['farm'])
+        self.enumerator = self.farm.route.assigned_to
+        self.other_farm = Farm.objects.exclude(route__assigned_to=self.enumerator).select_related('route').first()
+
+    def post(self, url, data):
+        return self.clients['enumerator'].post(url, data, content_type='application/json')
+
+    def test_enumerators_cannot_read_unassigned_routes(self):
+        other_sample = SoilSample.objects.get(farm=self.other_farm)
+        other_report = PestDiseaseReport.objects.get(farm=self.other_farm)
+        client = self.clients['enumerator']
+        for url in [f'/api/routes/{self.other_farm.route.pk}/', f'/api/farms/{self.other_farm.pk}/',
+                    f'/api/soil-samples/{other_sample.pk}/', f'/api/pest-disease/{other_report.pk}/']:
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 404)
+
+        farms = client.get('/api/farms/', {'page_size': 1000}).json()['results']
+        self.assertIn(str(self.farm.pk), {farm['id'] for farm in farms})
+        self.assertNotIn(str(self.other_farm.pk), {farm['id'] for farm in farms})
+
+    def test_enumerators_cannot_write_to_unassigned_routes(self):
+        farm = {'name': 'New Farm', 'owner_name': 'Owner', 'size_ha': '1', 'address': '1 Road'}
+        sample = {'sample_date': '2024-05-01', 'pH': '6.5'}
+        report = {'report_date': '2024-05-01', 'name': 'Aphids', 'category': 'pest', 'severity': 'low'}
+        writes = [
+            ('/api/farms/', 'route', farm, self.farm.route.pk, self.other_farm.route.pk),
+            ('/api/soil-samples/', 'farm', sample, self.farm.pk, self.other_farm.pk),
+            ('/api/pest-disease/', 'farm', report, self.farm.pk, self.other_farm.pk),
+        ]
+        for url, field, data, own, other in writes:
+            with self.subTest(url=url):
+                response = self.post(url, {**data, field: str(other)})
+                self.assertEqual(response.status_code, 400, response.content)
+                self.assertIn(field, response.json())
+                # The same data on an assigned route is accepted
+                response = self.post(url, {**data, field: str(own)})
+                self.assertEqual(response.status_code, 201, response.content)
+
+        response = self.clients['enumerator'].patch(f'/api/farms/{self.other_farm.pk}/', {'name': 'Taken'},
+                                                    content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Farm.objects.filter(name='Taken').exists())
+
+    def test_scope_is_loaded_once_per_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.enumerator
+        scope = get_user_scope(request)
+        with self.assertNumQueries(2):
+            self.assertTrue(scope.has_route(self.farm.route_id))
+            self.assertTrue(scope.has_farm(self.farm.pk))
+            self.assertIs(get_user_scope(request), scope)
+            self.assertFalse(scope.has_farm(self.other_farm.pk))
+            self.assertFalse(scope.has_route(self.other_farm.route_id))
+
+    def test_scope_is_not_reused_for_another_user(self):
+        request = RequestFactory().get('/')
+        request.user = self.enumerator
+        self.assertTrue(get_user_scope(request).has_farm(self.farm.pk))
+
+        request.user = self.other_farm.route.assigned_to
+        scope = get_user_scope(request)
+        self.assertEqual(scope.user_id, request.user.pk)
+        self.assertFalse(scope.has_farm(self.farm.pk))
+        self.assertTrue(scope.has_farm(self.other_farm.pk))
+
+        request.user = User.objects.filter(role=User.Role.ADMIN).first()
+        scope = get_user_scope(request)
+        self.assertFalse(scope.is_restricted)
+        self.assertTrue(scope.has_farm(self.farm.pk) and scope.has_farm(self.other_farm.pk))
+        self.assertEqual(scope.restrict(Route.objects.all(), 'id').count(), Route.objects.count())
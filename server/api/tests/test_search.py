@@ -0,0 +1,94 @@
+import datetime
+
+from django.test import TestCase, override_settings
+
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm, PestDiseaseReport, SearchDocument, SoilSample
+from api.search import SEARCH_TYPES, search_terms
+from api.views import FarmViewSet, PestDiseaseReportViewSet, SoilSampleViewSet, WaterSampleViewSet
+
+LISTS = ['/api/farms/', '/api/soil-samples/', '/api/water-samples/', '/api/pest-disease/']
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=3, farms_per_route=4, crops_per_farm=1, soil_per_farm=2, water_per_farm=2,
+                         pests_per_farm=2)
+
+    def setUp(self):
+        self.clients, context = role_clients()
+        self.farm = Farm.objects.get(pk=context['farm'])
+
+    def search(self, role='admin', **params):
+        response = self.clients[role].get('/api/search/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['results']
+
+    def test_terms(self):
+        self.assertEqual(search_terms("  O'Brien's   farm_2 "), ['o', 'brien', 's', 'farm', '2'])
+        self.assertEqual(search_terms('%%'), [])
+
+    def test_list_search_matches_substring_search_on_whole_words(self):
+        report = PestDiseaseReport.objects.first()
+        # Sample and report lists search their farm's name too
+        self.farm.name = 'Mango Grove'
+        self.farm.save()
+        queries = [self.farm.owner_name, 'mango grove', report.name.lower(), f'{self.farm.owner_name.split()[0]} farm']
+        for role, client in self.clients.items():
+            for url in LISTS:
+                for query in queries:
+                    with self.subTest(role=role, url=url, query=query):
+                        indexed = client.get(url, {'search': query, 'page_size': 1000}).json()
+                        with override_settings(SEARCH_USE_INDEX=False):
+                            scanned = client.get(url, {'search': query, 'page_size': 1000}).json()
+                        self.assertEqual(indexed, scanned)
+
+    def test_documents_hold_the_list_search_fields(self):
+        for view in [FarmViewSet, SoilSampleViewSet, WaterSampleViewSet, PestDiseaseReportViewSet]:
+            with self.subTest(view=view.__name__):
+                search_type = SEARCH_TYPES[view.search_kind]
+                self.assertEqual(set(search_type.title + search_type.body), set(view.search_fields))
+
+    def test_ranked_across_types(self):
+        in_title = Farm.objects.create(route=self.farm.route, name='Mango Grove', owner_name='Ann Silva',
+                                       size_ha=1, address='1 Hill Road')
+        in_body = Farm.objects.create(route=self.farm.route, name='Hill Farm', owner_name='Ravi Perera',
+                                      size_ha=1, address='2 Hill Road', location='Behind the old mango grove')
+        SoilSample.objects.create(farm=in_title, sample_date=datetime.date(2024, 5, 1), pH=6)
+
+        # Title matches first, whatever the type
+        results = self.search(q='mango gro')
+        self.assertEqual({(result['type'], result['title']) for result in results[:2]},
+                         {('farm', 'Mango Grove'), ('soil_sample', 'Mango Grove')})
+        self.assertEqual(results[2]['id'], str(in_body.pk))
+        self.assertGreater(results[1]['rank'], results[2]['rank'])
+
+        results = self.search(q='mango', types='farm', limit=1)
+        self.assertEqual([result['id'] for result in results], [str(in_title.pk)])
+
+    def test_enumerators_only_find_their_routes(self):
+        routes = set(Farm.objects.filter(route__assigned_to=self.farm.route.assigned_to).values_list('pk', flat=True))
+        results = self.search('enumerator', q='farm', limit=100)
+        self.assertTrue(results)
+        self.assertTrue(all(Farm.objects.filter(pk=result['farm'], pk__in=routes).exists() for result in results))
+
+    def test_rejects_bad_parameters(self):
+        for params in [{}, {'q': '!!'}, {'q': 'farm', 'types': 'route'}, {'q': 'farm', 'limit': 'ten'}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.clients['admin'].get('/api/search/', params).status_code, 400)
+
+    def test_documents_follow_changes(self):
+        sample = SoilSample.objects.create(farm=self.farm, sample_date=datetime.date(2024, 5, 1), pH=6,
+                                           notes='Heavy clay after floods')
+        self.assertEqual([result['id'] for result in self.search(q='clay flood')], [str(sample.pk)])
+
+        self.farm.name = 'Zebulon Orchard'
+        self.farm.save()
+        types = {result['type'] for result in self.search(q='zebulon', limit=100)}
+        self.assertEqual(types, {'farm', 'soil_sample', 'water_sample', 'pest_report'})
+
+        self.farm.delete()
+        self.assertEqual(self.search(q='zebulon'), [])
+        self.assertFalse(SearchDocument.objects.filter(farm_id=self.farm.pk).exists())
@@ -0,0 +1,76 @@
+import datetime
+import random
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from api import validation
+from api.benchmarks.data import generate_dataset
+from api.benchmarks.endpoints import role_clients
+from api.models import Farm
+from api.validation import SOIL_SAMPLE_RULES, WATER_SAMPLE_RULES, is_valid, validate_batch
+
+TODAY = datetime.date(2024, 6, 1)
+
+
+class BatchValidationTests(SimpleTestCase):
+    def columns(self, rows):
+        rng = random.Random(2)
+        values = {
+            'sample_date': lambda: TODAY + datetime.timedelta(days=rng.randint(-3, 3)),
+            'pH': lambda: Decimal(f'{rng.uniform(-1, 15):.2f}'),
+            'moisture_pct': lambda: Decimal(f'{rng.uniform(-5, 105):.2f}'),
+            'nutrient_n': lambda: Decimal(rng.choice(['0', '999', '999.01', '-0.01', '500'])),
+            'turbidity': lambda: Decimal(f'{rng.uniform(-1, 10):.2f}'),
+        }
+        return {
+            field: [None if rng.random() < 0.2 else make() for _ in range(rows)]
+            for field, make in values.items()
+        }
+
+    def expected(self, rules, columns):
+        errors = {}
+        for field, values in columns.items():
+            if field in rules:
+                for row, value in enumerate(values):
+                    if not is_valid(rules[field], value, TODAY):
+                        errors.setdefault(row, {})[field] = rules[field].message
+        return errors
+
+    def test_matches_row_by_row_checks(self):
+        columns = self.columns(500)
+        for rules in [SOIL_SAMPLE_RULES, WATER_SAMPLE_RULES]:
+            expected = self.expected(rules, columns)
+            self.assertTrue(expected)
+            self.assertEqual(validate_batch(rules, columns, TODAY), expected)
+            with mock.patch.object(validation, 'np', None):
+                self.assertEqual(validate_batch(rules, columns, TODAY), expected)
+
+    def test_bounds_are_inclusive(self):
+        columns = {'pH': [Decimal('0'), Decimal('14'), Decimal('14.01')], 'sample_date': [TODAY, None, None]}
+        self.assertEqual(validate_batch(SOIL_SAMPLE_RULES, columns, TODAY), {2: {'pH': 'pH must be between 0 and 14'}})
+        self.assertEqual(validate_batch(SOIL_SAMPLE_RULES, {'pH': []}, TODAY), {})
+
+
+class SerializerRuleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(routes=1, farms_per_route=1, crops_per_farm=0, soil_per_farm=0, water_per_farm=0,
+                         pests_per_farm=0)
+
+    def test_api_reports_the_rule_messages(self):
+        clients, context = role_clients()
+        farm = Farm.objects.get(pk=context['farm'])
+        future = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+        response = clients['admin'].post('/api/soil-samples/', {
+            'farm': str(farm.pk), 'sample_date': future, 'pH': 14.5, 'moisture_pct': 101, 'nutrient_k': -1,
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            field: [SOIL_SAMPLE_RULES[field].message] for field in ['sample_date', 'pH', 'moisture_pct', 'nutrient_k']
+        })
+        response = clients['admin'].post('/api/water-samples/', {
+            'farm': str(farm.pk), 'sample_date': '2024-01-01', 'source': 'Well', 'pH': 7, 'turbidity': -2,
+        }, format='json')
+        self.assertEqual(response.json(), {'turbidity': ['Turbidity must be 0 or greater']})
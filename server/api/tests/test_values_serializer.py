@@ -0,0 +1,58 @@
+import datetime
+from decimal import Decimal
+
+from django.test import override_settings
+
+from api.models import Farm, SoilSample, PestDiseaseReport
+from api.tests.harness import QueryBudgetTestCase
+
+LIST_PATHS = [
+    '/api/soil-samples/',
+    '/api/soil-samples/?farm={farm}&ordering=pH',
+    '/api/soil-samples/?search=Farm&page=2',
+    '/api/water-samples/?min_ph=6',
+    '/api/pest-disease/?severity=high',
+    '/api/pest-disease/?ordering=name',
+    '/api/crops/?farm={farm}',
+]
+
+
+class ValuesListSerializationTests(QueryBudgetTestCase):
+    """The values() list fast path must render exactly what the serializers render"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        farm = Farm.objects.order_by('name').first()
+        # Edge cases the generated data does not cover: nulls, files, odd decimals
+        SoilSample.objects.create(
+            farm=farm, sample_date=datetime.date.today(), pH=Decimal('7'),
+            moisture_pct=None, nutrient_n=Decimal('0.5'), photo='soil_samples/photos/a b.jpg',
+        )
+        PestDiseaseReport.objects.create(
+            farm=farm, report_date=datetime.date.today(), category='disease', name='Blast',
+            severity='high', description='', location_lat=None, location_lng=None,
+        )
+
+    def assertSameResponses(self, role):
+        client = self.clients[role]
+        for path in LIST_PATHS:
+            path = path.format(**self.path_context)
+            with self.subTest(role=role, path=path):
+                with override_settings(FAST_LIST_SERIALIZATION=False):
+                    expected = client.get(path)
+                with override_settings(FAST_LIST_SERIALIZATION=True):
+                    actual = client.get(path)
+                self.assertEqual(expected.status_code, 200)
+                self.assertEqual(actual.status_code, 200)
+                self.assertEqual(actual.content, expected.content)
+
+    def test_admin_lists_match(self):
+        self.assertSameResponses('admin')
+
+    def test_enumerator_lists_match(self):
+        self.assertSameResponses('enumerator')
+
+    @override_settings(REST_FRAMEWORK={'COERCE_DECIMAL_TO_STRING': False, 'PAGE_SIZE': 10})
+    def test_lists_match_without_decimal_coercion(self):
+        self.assertSameResponses('admin')
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 from rest_framework_simplejwt.views import (
@@ -12,12 +13,29 @@ from api.views.farm import FarmViewSet, CropViewSet
 from api.views.sampling import SoilSampleViewSet, WaterSampleViewSet
 from api.views.pest import PestDiseaseReportViewSet
 from api.views.dashboard import DashboardView
+from api.views.analytics import SoilAnalyticsView, WaterAnalyticsView, PestAnalyticsView, PestHotspotView
+from api.views.search import SearchView, FarmAutocompleteView
 from api.views.export import (
     ExportFarmsView,
     ExportSoilSamplesView,
     ExportWaterSamplesView,
     ExportPestDiseaseView
 )
+from api.views.imports import ImportView, ImportReportView
+from api.views.profiling import ProfileListView, ProfileDownloadView
+from api.views.asynchronous import AsyncDashboardView, AsyncExportView
+
+# Async views for the dashboard and exports in ASGI deployments
+if settings.API_ASYNC_VIEWS:
+    dashboard_view = AsyncDashboardView.as_view()
+
+    def export_view(view):
+        return AsyncExportView.as_view(export_view=view)
+else:
+    dashboard_view = DashboardView.as_view()
+
+    def export_view(view):
+        return view.as_view()
 
 # Create a router and register our viewsets with it.
 router = routers.DefaultRouter()
@@ -39,12 +57,30 @@ urlpatterns = [
     path('auth/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
 
     # Dashboard endpoint
-    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('dashboard/', dashboard_view, name='dashboard'),
+
+    # Grouped sample statistics, pest report counts and outbreak hotspots
+    path('analytics/soil/', SoilAnalyticsView.as_view(), name='analytics_soil'),
+    path('analytics/water/', WaterAnalyticsView.as_view(), name='analytics_water'),
+    path('analytics/pests/', PestAnalyticsView.as_view(), name='analytics_pests'),
+    path('analytics/pests/hotspots/', PestHotspotView.as_view(), name='analytics_pest_hotspots'),
+
+    # Full-text search across farms, samples and pest reports, and farm autocomplete
+    path('search/', SearchView.as_view(), name='search'),
+    path('autocomplete/farms/', FarmAutocompleteView.as_view(), name='autocomplete_farms'),
 
     # Export endpoints (admin only)
-    path('export/farms/', ExportFarmsView.as_view(), name='export_farms'),
-    path('export/soil-samples/', ExportSoilSamplesView.as_view(), name='export_soil_samples'),
-    path('export/water-samples/', ExportWaterSamplesView.as_view(), name='export_water_samples'),
-    path('export/pest-disease/', ExportPestDiseaseView.as_view(), name='export_pest_disease'),
+    path('export/farms/', export_view(ExportFarmsView), name='export_farms'),
+    path('export/soil-samples/', export_view(ExportSoilSamplesView), name='export_soil_samples'),
+    path('export/water-samples/', export_view(ExportWaterSamplesView), name='export_water_samples'),
+    path('export/pest-disease/', export_view(ExportPestDiseaseView), name='export_pest_disease'),
+
+    # Bulk imports and their error reports (admin only)
+    path('imports/reports/<str:name>/', ImportReportView.as_view(), name='import_report'),
+    path('imports/<str:kind>/', ImportView.as_view(), name='import'),
+
+    # Captured request profiles (admin only)
+    path('profiles/', ProfileListView.as_view(), name='profile_list'),
+    path('profiles/<str:name>/', ProfileDownloadView.as_view(), name='profile_download'),
 ]
 
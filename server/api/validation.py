@@ -0,0 +1,118 @@
+"""
+Value rules for soil and water samples, shared by the serializers and
+batch validation.
+
+The sample serializers check one value at a time through
+RuleValidationMixin. `validate_batch` checks whole columns at once (with
+NumPy masks when it is installed, an equivalent loop otherwise) and is
+used for bulk imports of lab results, where the serializers run in batch
+mode and leave these rules to it.
+"""
+from collections import namedtuple
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone
+from rest_framework import serializers
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Bounds are inclusive; None leaves a side open
+Range = namedtuple('Range', ['minimum', 'maximum', 'message'])
+NotInFuture = namedtuple('NotInFuture', ['message'])
+
+PH = Range(0, 14, 'pH must be between 0 and 14')
+SAMPLE_DATE = NotInFuture('Sample date cannot be in the future')
+
+SOIL_SAMPLE_RULES = {
+    'sample_date': SAMPLE_DATE,
+    'pH': PH,
+    'moisture_pct': Range(0, 100, 'Moisture percentage must be between 0 and 100'),
+    'nutrient_n': Range(0, 999, 'Nitrogen level must be between 0 and 999'),
+    'nutrient_p': Range(0, 999, 'Phosphorus level must be between 0 and 999'),
+    'nutrient_k': Range(0, 999, 'Potassium level must be between 0 and 999'),
+}
+
+WATER_SAMPLE_RULES = {
+    'sample_date': SAMPLE_DATE,
+    'pH': PH,
+    'turbidity': Range(0, None, 'Turbidity must be 0 or greater'),
+}
+
+
+def is_valid(rule, value, today=None):
+    if value is None:
+        return True
+    if isinstance(rule, NotInFuture):
+        return value <= (today or timezone.now().date())
+    return ((rule.minimum is None or value >= rule.minimum)
+            and (rule.maximum is None or value <= rule.maximum))
+
+
+def _invalid_numpy(rule, values, today):
+    if isinstance(rule, NotInFuture):
+        # None becomes NaT, which compares false
+        return np.asarray(values, dtype='datetime64[D]') > np.datetime64(today, 'D')
+    # None becomes NaN, which compares false
+    column = np.asarray(values, dtype=float)
+    invalid = np.zeros(len(column), dtype=bool)
+    if rule.minimum is not None:
+        invalid |= column < rule.minimum
+    if rule.maximum is not None:
+        invalid |= column > rule.maximum
+    return invalid
+
+
+def _invalid_python(rule, values, today):
+    return [not is_valid(rule, value, today) for value in values]
+
+
+def validate_batch(rules, columns, today=None):
+    """
+    Check columns of parsed values ({field: [value, ...]}, None where
+    missing) against `rules`. Returns {row index: {field: message}} for
+    the rows breaking any rule.
+    """
+    today = today or timezone.now().date()
+    check = _invalid_numpy if np is not None else _invalid_python
+    errors = {}
+    for field, values in columns.items():
+        rule = rules.get(field)
+        if rule is None or not len(values):
+            continue
+        invalid = check(rule, values, today)
+        rows = np.flatnonzero(invalid).tolist() if np is not None else [i for i, bad in enumerate(invalid) if bad]
+        for row in rows:
+            errors.setdefault(row, {})[field] = rule.message
+    return errors
+
+
+class RuleValidationMixin:
+    """
+    ModelSerializer mixin checking `rules` from validate_<field> methods.
+
+    The model's min/max validators are dropped from the fields, so range
+    errors always carry the rule's message. With `batch_rules` in the
+    context the rules are skipped entirely, for validate_batch() to check
+    the whole batch afterwards.
+    """
+
+    rules = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.rules:
+            if name in fields:
+                fields[name].validators = [
+                    validator for validator in fields[name].validators
+                    if not isinstance(validator, (MinValueValidator, MaxValueValidator))
+                ]
+        return fields
+
+    def check_rule(self, field, value):
+        rule = self.rules[field]
+        if not self.context.get('batch_rules') and not is_valid(rule, value):
+            raise serializers.ValidationError(rule.message)
+        return value
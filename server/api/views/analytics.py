@@ -0,0 +1,240 @@
+import datetime
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.analytics import (
+    GROUPINGS, SOIL_METRICS, WATER_METRICS,
+    add_percentiles, pest_report_counts, rollup_statistics, sample_statistics,
+)
+from api.models import (
+    SoilSample, WaterSample, PestDiseaseReport,
+    FarmDailyRollup, RouteDailyRollup, FarmDailyPestRollup, RouteDailyPestRollup, RollupWatermark,
+)
+from api.hotspots import hotspot_windows, windows_between
+from api.models.rollup import Dataset
+from api.rollups import WATERMARK
+from api.scope import get_user_scope
+
+
+def date_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    date = parse_date(value)
+    if date is None:
+        raise ValidationError({name: 'Use the YYYY-MM-DD format'})
+    return date
+
+
+def uuid_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a UUID'})
+
+
+def number_param(request, name, default, minimum, maximum, cast=float):
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ValidationError({name: 'Must be a number'})
+    if not minimum <= number <= maximum:
+        raise ValidationError({name: f'Must be between {minimum:g} and {maximum:g}'})
+    return number
+
+
+class AnalyticsView(APIView):
+    """
+    Base view for grouped analytics
+
+    Query parameters:
+        group_by      comma-separated: route, month, week, crop_type
+        route, farm   limit to one route or farm
+        date_from, date_to   inclusive date range (YYYY-MM-DD)
+
+    Results come from the daily rollups once `refresh_rollups` has run (see
+    `source` and `refreshed_through` in the response). Grouping by crop_type
+    counts a row once for every crop type grown on its farm.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.group_by = self._list_param('group_by')
+        unknown = [grouping for grouping in self.group_by if grouping not in GROUPINGS]
+        if unknown:
+            raise ValidationError({'group_by': f"Unknown grouping {', '.join(unknown)}; "
+                                               f"choose from {', '.join(GROUPINGS)}"})
+
+        self.dates = {}
+        for param in ['date_from', 'date_to']:
+            if request.query_params.get(param):
+                self.dates[param] = date_param(request, param)
+
+        self.ids = {param: uuid_param(request, param) for param in ['route', 'farm']}
+
+        self.scope = get_user_scope(request)
+        self.watermark = None
+        if settings.ANALYTICS_USE_ROLLUPS:
+            self.watermark = RollupWatermark.objects.filter(name=WATERMARK).first()
+
+    def rollups(self, farm_model, route_model):
+        """Rollups the query can be answered from: per route unless farm-level rows are needed"""
+        by_farm = self.ids['farm'] is not None or 'crop_type' in self.group_by
+        queryset = self.scope.restrict((farm_model if by_farm else route_model).objects.all(), 'route_id')
+        return self.filter(queryset, 'route_id', 'farm_id', 'date')
+
+    def source_rows(self, model, date_field):
+        return self.filter(
+            self.scope.restrict(model.objects.all(), 'farm__route_id'), 'farm__route_id', 'farm_id', date_field,
+        )
+
+    def filter(self, queryset, route_field, farm_field, date_field):
+        if self.ids['route'] is not None:
+            queryset = queryset.filter(**{route_field: self.ids['route']})
+        if self.ids['farm'] is not None:
+            queryset = queryset.filter(**{farm_field: self.ids['farm']})
+        if 'date_from' in self.dates:
+            queryset = queryset.filter(**{f'{date_field}__gte': self.dates['date_from']})
+        if 'date_to' in self.dates:
+            queryset = queryset.filter(**{f'{date_field}__lte': self.dates['date_to']})
+        return queryset
+
+    def respond(self, groups, **extra):
+        return Response({
+            'group_by': self.group_by,
+            **extra,
+            'source': 'rollups' if self.watermark is not None else 'samples',
+            'refreshed_through': self.watermark.refreshed_through if self.watermark is not None else None,
+            'results': list(groups.values()),
+        })
+
+    def _list_param(self, name):
+        value = self.request.query_params.get(name, '')
+        return list(dict.fromkeys(item.strip() for item in value.split(',') if item.strip()))
+
+
+class SampleAnalyticsView(AnalyticsView):
+    """
+    Count, mean, standard deviation, min and max of sample measurements
+
+    Also accepts `percentiles`, comma-separated percentiles to add (e.g.
+    25,50,75); these are always computed from the samples themselves.
+    """
+    model = None
+    dataset = None
+    metrics = []
+    date_field = 'sample_date'
+
+    def get(self, request):
+        try:
+            percentiles = [float(value) for value in self._list_param('percentiles')]
+        except ValueError:
+            raise ValidationError({'percentiles': 'Percentiles must be numbers'})
+        if any(not 0 <= pct <= 100 for pct in percentiles):
+            raise ValidationError({'percentiles': 'Percentiles must be between 0 and 100'})
+
+        samples = self.source_rows(self.model, self.date_field)
+        if self.watermark is not None:
+            rollups = self.rollups(FarmDailyRollup, RouteDailyRollup).filter(dataset=self.dataset)
+            groups = rollup_statistics(rollups, self.metrics, self.group_by)
+        else:
+            groups = sample_statistics(samples, self.date_field, self.metrics, self.group_by)
+
+        if percentiles:
+            add_percentiles(groups, samples, self.date_field, self.metrics, self.group_by, percentiles)
+        return self.respond(groups, metrics=self.metrics, percentiles=percentiles)
+
+
+class SoilAnalyticsView(SampleAnalyticsView):
+    """pH, moisture and NPK statistics of soil samples"""
+    model = SoilSample
+    dataset = Dataset.SOIL
+    metrics = SOIL_METRICS
+
+
+class WaterAnalyticsView(SampleAnalyticsView):
+    """pH and turbidity statistics of water samples"""
+    model = WaterSample
+    dataset = Dataset.WATER
+    metrics = WATER_METRICS
+
+
+class PestAnalyticsView(AnalyticsView):
+    """Number of pest/disease reports per severity"""
+
+    def get(self, request):
+        if self.watermark is not None:
+            rollups = self.rollups(FarmDailyPestRollup, RouteDailyPestRollup)
+            groups = pest_report_counts(rollups, self.group_by, from_rollups=True)
+        else:
+            groups = pest_report_counts(self.source_rows(PestDiseaseReport, 'report_date'), self.group_by)
+        return self.respond(groups)
+
+
+class PestHotspotView(APIView):
+    """
+    Grid cells where pest/disease reports cluster, per time window
+
+    Query parameters:
+        date_from, date_to   range to cover (default: the last 90 days),
+                             widened to whole windows
+        window      window length in days (default 30)
+        cell_size   grid cell size in degrees (default HOTSPOT_CELL_SIZE)
+        min_high    high-severity reports making a cell a hotspot
+                    (default HOTSPOT_MIN_HIGH)
+        route       limit to one route
+
+    Every window lists its non-empty cells with report counts per severity.
+    Windows are cached, so overlaying past months costs no table scan.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
+    max_windows = 120
+
+    def get(self, request):
+        date_to = date_param(request, 'date_to', datetime.date.today())
+        date_from = date_param(request, 'date_from', date_to - datetime.timedelta(days=89))
+        if date_from > date_to:
+            raise ValidationError({'date_from': 'Must not be after date_to'})
+        days = number_param(request, 'window', 30, 1, 366, cast=int)
+        cell_size = number_param(request, 'cell_size', settings.HOTSPOT_CELL_SIZE, 0.0001, 1)
+        min_high = number_param(request, 'min_high', settings.HOTSPOT_MIN_HIGH, 1, 10000, cast=int)
+
+        windows = windows_between(date_from, date_to, days)
+        if len(windows) > self.max_windows:
+            raise ValidationError({'window': f'The range spans more than {self.max_windows} windows'})
+
+        scope = get_user_scope(request)
+        reports = scope.restrict(PestDiseaseReport.objects.all(), 'farm__route_id')
+        route = uuid_param(request, 'route')
+        if route is not None:
+            reports = reports.filter(farm__route_id=route)
+        return Response({
+            'window': days,
+            'cell_size': cell_size,
+            'min_high': min_high,
+            'windows': hotspot_windows(reports, windows, cell_size, min_high, self.cache_key(scope, route)),
+        })
+
+    @staticmethod
+    def cache_key(scope, route):
+        """Identifies the reports a user can see, so users with the same routes share cache entries"""
+        key = 'all' if not scope.is_restricted else hashlib.sha1(
+            ','.join(sorted(str(route_id) for route_id in scope.route_ids)).encode()
+        ).hexdigest()
+        return f'{key}:{route or ""}'
@@ -0,0 +1,141 @@
+"""
+Async variants of the I/O-bound endpoints, served when API_ASYNC_VIEWS is
+on (meant for ASGI deployments, see agrisurvey/asgi.py).
+
+Under ASGI a slow client downloading an export or a photo only holds a
+coroutine instead of a whole worker. DRF views can't be async, so
+AsyncAPIView reproduces the parts of APIView these endpoints need:
+the same authentication and permission classes, and JSON responses.
+"""
+import mimetypes
+import os
+from pathlib import Path
+from stat import S_ISREG
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views import View
+from django.views.static import was_modified_since
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from api.renderers import FastJSONRenderer
+from api.views.dashboard import DashboardView
+from api.views.export import EXPORT_CHUNK_SIZE, IsAdminUser, csv_response
+
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncAPIView(View):
+    """
+    Async view authenticating and authorizing requests like APIView, and
+    passing handlers a DRF Request. Handlers return HttpResponses; use
+    `render()` for JSON.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = api_settings.DEFAULT_PERMISSION_CLASSES
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Authentication is by token, as in APIView
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            # Token checks may hit the database
+            await sync_to_async(self.check_access)(request)
+        except APIException as exc:
+            return self.handle_exception(request, exc)
+        return await super().dispatch(request, *args, **kwargs)
+
+    def check_access(self, request):
+        request.user
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise NotAuthenticated()
+                raise PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, request, exc):
+        """Error response matching DRF's exception handler"""
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, exc.status_code)
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            header = request.authenticators[0].authenticate_header(request) if request.authenticators else None
+            if header:
+                response['WWW-Authenticate'] = header
+            else:
+                response.status_code = 403
+        return response
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), status=status, content_type=self.renderer.media_type)
+
+
+class AsyncDashboardView(AsyncAPIView):
+    """Async DashboardView"""
+
+    read_replica = True
+
+    async def get(self, request):
+        # Django's async ORM runs each query in this request's sync thread
+        # anyway, so the sections are built from there, concurrently where
+        # dashboard_data can
+        return self.render(await sync_to_async(DashboardView().dashboard_data)(request))
+
+
+class AsyncExportView(AsyncAPIView):
+    """Async counterpart of an ExportView, streaming rows from QuerySet.aiterator()"""
+
+    permission_classes = [IsAdminUser]
+    read_replica = True
+    export_view = None
+
+    async def get(self, request):
+        export = self.export_view()
+        objects = export.export_queryset().aiterator(chunk_size=EXPORT_CHUNK_SIZE)
+        return csv_response(export.filename, export.header, (export.row(obj) async for obj in objects))
+
+
+async def _file_chunks(path):
+    read_in_thread = sync_to_async(lambda file: file.read(MEDIA_CHUNK_SIZE), thread_sensitive=False)
+    file = await sync_to_async(open, thread_sensitive=False)(path, 'rb')
+    try:
+        while chunk := await read_in_thread(file):
+            yield chunk
+    finally:
+        file.close()
+
+
+async def serve_media(request, path):
+    """Stream an uploaded file from MEDIA_ROOT, reading it in a worker thread chunk by chunk"""
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = await sync_to_async(os.stat, thread_sensitive=False)(full_path)
+    except OSError:
+        raise Http404
+    if not S_ISREG(stat.st_mode):
+        raise Http404
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    response = StreamingHttpResponse(_file_chunks(full_path), content_type=content_type or 'application/octet-stream')
+    response['Content-Length'] = str(stat.st_size)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
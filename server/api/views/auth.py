@@ -1,7 +1,7 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from api.authentication import ClaimsRefreshToken
 from django.contrib.auth import get_user_model
 from api.models import Route
 from api.serializers import UserSerializer, RouteSerializer
@@ -41,7 +41,9 @@ class UserViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def me(self, request):
         """Get current user profile"""
-        serializer = self.get_serializer(request.user)
+        # request.user may be a claims-only user under stateless authentication
+        user = request.user if isinstance(request.user, User) else User.objects.get(pk=request.user.pk)
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
 
     @action(detail=False, methods=['post'], permission_classes=[permissions.AllowAny])
@@ -50,7 +52,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
 
             response_data = {
                 'user': serializer.data,
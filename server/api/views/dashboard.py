@@ -1,14 +1,88 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 from api.models import (
-    Route, Farm,
+    User, Route, Farm,
     SoilSample, WaterSample,
     PestDiseaseReport
 )
+from api.scope import get_user_scope
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix='dashboard')
+        return _executor
+
+
+def _run_in_worker(function):
+    try:
+        return function()
+    finally:
+        # As at the end of a request, drop the thread's connection once it
+        # is past CONN_MAX_AGE or broken
+        close_old_connections()
+
+
+def can_run_concurrently(using=DEFAULT_DB_ALIAS):
+    """
+    Whether queries may run on other threads' connections: not on SQLite,
+    and not inside a transaction, whose uncommitted rows other connections
+    wouldn't see.
+    """
+    connection = connections[using]
+    return settings.DASHBOARD_WORKERS > 0 and connection.vendor != 'sqlite' and not connection.in_atomic_block
+
+
+def run_sections(sections, timeout=None, concurrently=False):
+    """
+    Call the `sections` callables ({name: callable}), on the worker threads
+    when `concurrently`. Returns ({name: result}, [names of the sections
+    not done within `timeout` seconds]).
+
+    Sequentially, sections are skipped once the time is up; concurrently,
+    unfinished ones are abandoned and finish in the background.
+    """
+    results, incomplete = {}, []
+    if not concurrently:
+        deadline = time.monotonic() + timeout if timeout else None
+        for name, function in sections.items():
+            if deadline is not None and time.monotonic() >= deadline:
+                incomplete.append(name)
+            else:
+                results[name] = function()
+        return results, incomplete
+
+    executor = _get_executor()
+    # Each section gets a copy of the context, so per-request state such
+    # as QueryRecorder follows it into the worker
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _run_in_worker, function)
+        for name, function in sections.items()
+    }
+    done, _ = wait(futures.values(), timeout=timeout or None)
+    for name, future in futures.items():
+        if future in done:
+            results[name] = future.result()
+        else:
+            future.cancel()
+            incomplete.append(name)
+    return results, incomplete
 
 
 class DashboardView(APIView):
@@ -17,94 +91,114 @@ class DashboardView(APIView):
     Returns summary statistics based on user role
     """
     permission_classes = [permissions.IsAuthenticated]
+    read_replica = True
 
     def get(self, request):
+        return Response(self.dashboard_data(request))
+
+    def dashboard_data(self, request):
         user = request.user
         is_admin = user.role == 'admin'
+        scope = get_user_scope(request)
+        since = timezone.now() - timedelta(days=7)
 
-        # Base dashboard data
-        dashboard_data = {
-            'user': {
-                'id': str(user.id),
-                'username': user.username,
-                'name': f"{user.first_name} {user.last_name}".strip() or user.username,
-                'role': user.role,
-                'email': user.email,
-            },
+        # Each section lives in its own method so it shows up by name in profiles
+        sections = {
+            'routes': lambda: self._route_stats(scope),
+            'farms': lambda: self._farm_stats(scope, since),
+            'sampling': lambda: self._sampling_stats(scope, since),
+            'pest_reports': lambda: self._pest_report_stats(scope, since),
+            'activity': lambda: self._recent_activity(scope),
         }
 
-        # Routes statistics
+        # Admin-specific data
         if is_admin:
-            # Admin sees all routes
-            routes = Route.objects.all()
-        else:
-            # Enumerator sees only assigned routes
-            routes = Route.objects.filter(assigned_to=user)
-        
-        route_stats = routes.aggregate(
+            sections['admin_stats'] = lambda: self._admin_stats(scope)
+
+        concurrently = can_run_concurrently()
+        if concurrently and scope.is_restricted:
+            # Load the route IDs once, before the sections need them
+            scope.route_ids
+        results, incomplete = run_sections(
+            sections, timeout=settings.DASHBOARD_TIMEOUT_MS / 1000, concurrently=concurrently,
+        )
+
+        dashboard_data = {'user': self._user_info(user), **results}
+        if incomplete:
+            dashboard_data['incomplete'] = incomplete
+        return dashboard_data
+
+    # Querysets limited to what the user may see: admins see everything,
+    # enumerators only their assigned routes
+    def _routes(self, scope):
+        return scope.restrict(Route.objects.all(), 'id')
+
+    def _farms(self, scope):
+        return scope.restrict(Farm.objects.all(), 'route_id')
+
+    def _soil_samples(self, scope):
+        return scope.restrict(SoilSample.objects.all(), 'farm__route_id')
+
+    def _water_samples(self, scope):
+        return scope.restrict(WaterSample.objects.all(), 'farm__route_id')
+
+    def _pest_reports(self, scope):
+        return scope.restrict(PestDiseaseReport.objects.all(), 'farm__route_id')
+
+    def _user_info(self, user):
+        if not isinstance(user, User):
+            # Stateless authentication: profile fields aren't token claims
+            user = User.objects.only('username', 'first_name', 'last_name', 'role', 'email').get(pk=user.pk)
+        return {
+            'id': str(user.id),
+            'username': user.username,
+            'name': f"{user.first_name} {user.last_name}".strip() or user.username,
+            'role': user.role,
+            'email': user.email,
+        }
+
+    def _route_stats(self, scope):
+        return self._routes(scope).aggregate(
             total=Count('id'),
             completed=Count('id', filter=Q(status='completed')),
             in_progress=Count('id', filter=Q(status='in_progress')),
             pending=Count('id', filter=Q(status='pending'))
         )
-        dashboard_data['routes'] = route_stats
 
-        # Farms statistics
-        if is_admin:
-            farms = Farm.objects.all()
-        else:
-            # Enumerator sees farms in their routes
-            farms = Farm.objects.filter(route__assigned_to=user)
-        
-        dashboard_data['farms'] = {
+    def _farm_stats(self, scope, since):
+        farms = self._farms(scope)
+        return {
             'total': farms.count(),
-            'recent': farms.filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).count()
+            'recent': farms.filter(created_at__gte=since).count()
         }
 
-        # Sampling statistics
-        if is_admin:
-            soil_samples = SoilSample.objects.all()
-            water_samples = WaterSample.objects.all()
-        else:
-            soil_samples = SoilSample.objects.filter(farm__route__assigned_to=user)
-            water_samples = WaterSample.objects.filter(farm__route__assigned_to=user)
-
-        dashboard_data['sampling'] = {
+    def _sampling_stats(self, scope, since):
+        soil_samples = self._soil_samples(scope)
+        water_samples = self._water_samples(scope)
+        return {
             'soil': {
                 'total': soil_samples.count(),
-                'recent': soil_samples.filter(
-                    created_at__gte=timezone.now() - timedelta(days=7)
-                ).count()
+                'recent': soil_samples.filter(created_at__gte=since).count()
             },
             'water': {
                 'total': water_samples.count(),
-                'recent': water_samples.filter(
-                    created_at__gte=timezone.now() - timedelta(days=7)
-                ).count()
+                'recent': water_samples.filter(created_at__gte=since).count()
             }
         }
 
-        # Pest & Disease reports
-        if is_admin:
-            pest_reports = PestDiseaseReport.objects.all()
-        else:
-            pest_reports = PestDiseaseReport.objects.filter(farm__route__assigned_to=user)
-        
-        dashboard_data['pest_reports'] = {
+    def _pest_report_stats(self, scope, since):
+        pest_reports = self._pest_reports(scope)
+        return {
             'total': pest_reports.count(),
             'high_severity': pest_reports.filter(severity='high').count(),
-            'recent': pest_reports.filter(
-                created_at__gte=timezone.now() - timedelta(days=7)
-            ).count()
+            'recent': pest_reports.filter(created_at__gte=since).count()
         }
 
-        # Recent activity
-        recent_farms = farms.order_by('-created_at')[:5]
+    def _recent_activity(self, scope):
+        recent_farms = self._farms(scope).order_by('-created_at')[:5]
         recent_samples = []
-        
-        for sample in soil_samples.order_by('-created_at')[:3]:
+
+        for sample in self._soil_samples(scope).order_by('-created_at')[:3]:
             recent_samples.append({
                 'type': 'soil',
                 'farm': sample.farm.name,
@@ -112,7 +206,7 @@ class DashboardView(APIView):
                 'id': str(sample.id)
             })
 
-        for sample in water_samples.order_by('-created_at')[:3]:
+        for sample in self._water_samples(scope).order_by('-created_at')[:3]:
             recent_samples.append({
                 'type': 'water',
                 'farm': sample.farm.name,
@@ -122,8 +216,8 @@ class DashboardView(APIView):
 
         # Sort by date
         recent_samples.sort(key=lambda x: x['date'], reverse=True)
-        
-        dashboard_data['activity'] = [
+
+        return [
             {
                 'type': 'farm',
                 'name': farm.name,
@@ -132,22 +226,19 @@ class DashboardView(APIView):
             } for farm in recent_farms
         ] + recent_samples[:5]  # Limit to 5 most recent
 
-        # Admin-specific data
-        if is_admin:
-            # Overall completion stats
-            total_routes = Route.objects.count()
-            completed_routes = Route.objects.filter(status='completed').count()
-            
-            dashboard_data['admin_stats'] = {
-                'total_users': user.__class__.objects.count(),
-                'total_enumerators': user.__class__.objects.filter(role='enumerator').count(),
-                'overall_completion': round(completed_routes / total_routes * 100) if total_routes > 0 else 0,
-                'farms_with_samples': farms.filter(
-                    Q(soil_samples__isnull=False) | Q(water_samples__isnull=False)
-                ).distinct().count()
-            }
+    def _admin_stats(self, scope):
+        # Overall completion stats
+        total_routes = Route.objects.count()
+        completed_routes = Route.objects.filter(status='completed').count()
 
-        return Response(dashboard_data)
+        return {
+            'total_users': User.objects.count(),
+            'total_enumerators': User.objects.filter(role='enumerator').count(),
+            'overall_completion': round(completed_routes / total_routes * 100) if total_routes > 0 else 0,
+            'farms_with_samples': self._farms(scope).filter(
+                Q(soil_samples__isnull=False) | Q(water_samples__isnull=False)
+            ).distinct().count()
+        }
 
     def _get_farms_by_route(self, farms):
         """Get farm counts by route"""
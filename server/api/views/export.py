@@ -1,5 +1,5 @@
 import csv
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from rest_framework import views, permissions
 from rest_framework.response import Response
 from api.models import Farm, SoilSample, WaterSample, PestDiseaseReport
@@ -13,125 +13,156 @@ class IsAdminUser(permissions.BasePermission):
         return request.user.is_authenticated and request.user.role == 'admin'
 
 
-class ExportFarmsView(views.APIView):
-    permission_classes = [IsAdminUser]
-    
-    def get(self, request):
-        # 创建CSV响应
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="farms.csv"'
-        
-        writer = csv.writer(response)
-        # 写入表头
-        writer.writerow([
-            'ID', 'Name', 'Owner Name', 'Location', 'Address', 'Size (ha)', 
-            'Route', 'Latitude', 'Longitude', 'Created At'
-        ])
-        
-        # 写入数据
-        farms = Farm.objects.select_related('route').all()
-        for farm in farms:
-            writer.writerow([
-                farm.id,
-                farm.name,
-                farm.owner_name,
-                farm.location,
-                farm.address,
-                farm.size_ha,
-                farm.route.name if farm.route else '',
-                farm.latitude,
-                farm.longitude,
-                farm.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
-
-
-class ExportSoilSamplesView(views.APIView):
-    permission_classes = [IsAdminUser]
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="soil_samples.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Farm', 'Sample Date', 'pH', 'Moisture %', 
-            'Nitrogen', 'Phosphorus', 'Potassium', 'Notes', 'Created At'
-        ])
-        
-        samples = SoilSample.objects.select_related('farm').all()
-        for sample in samples:
-            writer.writerow([
-                sample.id,
-                sample.farm.name,
-                sample.sample_date.strftime('%Y-%m-%d'),
-                sample.pH,
-                sample.moisture_pct,
-                sample.nitrogen,
-                sample.phosphorus,
-                sample.potassium,
-                sample.notes,
-                sample.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
-
-
-class ExportWaterSamplesView(views.APIView):
-    permission_classes = [IsAdminUser]
-    
-    def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="water_samples.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Farm', 'Source', 'Sample Date', 'pH', 
-            'Turbidity (NTU)', 'Bacteria Present', 'Notes', 'Created At'
-        ])
-        
-        samples = WaterSample.objects.select_related('farm').all()
-        for sample in samples:
-            writer.writerow([
-                sample.id,
-                sample.farm.name,
-                sample.source,
-                sample.sample_date.strftime('%Y-%m-%d'),
-                sample.pH,
-                sample.turbidity,
-                'Yes' if sample.bacteria_present else 'No',
-                sample.notes,
-                sample.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response
-
-
-class ExportPestDiseaseView(views.APIView):
+class Echo:
+    """File-like object whose write() returns the line, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(filename, header, rows):
+    """
+    Stream a CSV file row by row so large exports never sit in memory.
+    `rows` may be an async iterable, for async views.
+    """
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    async def async_lines():
+        yield writer.writerow(header)
+        async for row in rows:
+            yield writer.writerow(row)
+
+    content = async_lines() if hasattr(rows, '__aiter__') else lines()
+    response = StreamingHttpResponse(content, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Rows fetched from the database per round trip while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportView(views.APIView):
+    """CSV export of every row of a model (admin only)"""
+
     permission_classes = [IsAdminUser]
-    
+    read_replica = True
+    filename = None
+    header = []
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def row(self, obj):
+        raise NotImplementedError
+
+    def export_queryset(self):
+        queryset = self.get_queryset()
+        # Rows are read while the response streams, after the request's
+        # database routing has ended, so the database is picked now
+        return queryset.using(queryset.db)
+
     def get(self, request):
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="pest_disease_reports.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Farm', 'Category', 'Name', 'Severity', 
-            'Report Date', 'Description', 'Created At'
-        ])
-        
-        reports = PestDiseaseReport.objects.select_related('farm').all()
-        for report in reports:
-            writer.writerow([
-                report.id,
-                report.farm.name,
-                report.category,
-                report.name,
-                report.severity,
-                report.report_date.strftime('%Y-%m-%d'),
-                report.description,
-                report.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
-        
-        return response 
\ No newline at end of file
+        rows = (self.row(obj) for obj in self.export_queryset().iterator(chunk_size=EXPORT_CHUNK_SIZE))
+        return csv_response(self.filename, self.header, rows)
+
+
+class ExportFarmsView(ExportView):
+    filename = 'farms.csv'
+    header = [
+        'ID', 'Name', 'Owner Name', 'Location', 'Address', 'Size (ha)',
+        'Route', 'Latitude', 'Longitude', 'Created At'
+    ]
+
+    def get_queryset(self):
+        return Farm.objects.select_related('route')
+
+    def row(self, farm):
+        return [
+            farm.id,
+            farm.name,
+            farm.owner_name,
+            farm.location,
+            farm.address,
+            farm.size_ha,
+            farm.route.name if farm.route else '',
+            farm.latitude,
+            farm.longitude,
+            farm.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        ]
+
+
+class ExportSoilSamplesView(ExportView):
+    filename = 'soil_samples.csv'
+    header = [
+        'ID', 'Farm', 'Sample Date', 'pH', 'Moisture %',
+        'Nitrogen', 'Phosphorus', 'Potassium', 'Notes', 'Created At'
+    ]
+
+    def get_queryset(self):
+        return SoilSample.objects.select_related('farm')
+
+    def row(self, sample):
+        return [
+            sample.id,
+            sample.farm.name,
+            sample.sample_date.strftime('%Y-%m-%d'),
+            sample.pH,
+            sample.moisture_pct,
+            sample.nutrient_n,
+            sample.nutrient_p,
+            sample.nutrient_k,
+            sample.notes,
+            sample.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        ]
+
+
+class ExportWaterSamplesView(ExportView):
+    filename = 'water_samples.csv'
+    header = [
+        'ID', 'Farm', 'Source', 'Sample Date', 'pH',
+        'Turbidity (NTU)', 'Notes', 'Created At'
+    ]
+
+    def get_queryset(self):
+        return WaterSample.objects.select_related('farm')
+
+    def row(self, sample):
+        return [
+            sample.id,
+            sample.farm.name,
+            sample.source,
+            sample.sample_date.strftime('%Y-%m-%d'),
+            sample.pH,
+            sample.turbidity,
+            sample.notes,
+            sample.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        ]
+
+
+class ExportPestDiseaseView(ExportView):
+    filename = 'pest_disease_reports.csv'
+    header = [
+        'ID', 'Farm', 'Category', 'Name', 'Severity',
+        'Report Date', 'Description', 'Created At'
+    ]
+
+    def get_queryset(self):
+        return PestDiseaseReport.objects.select_related('farm')
+
+    def row(self, report):
+        return [
+            report.id,
+            report.farm.name,
+            report.category,
+            report.name,
+            report.severity,
+            report.report_date.strftime('%Y-%m-%d'),
+            report.description,
+            report.created_at.strftime('%Y-%m-%d %H:%M:%S')
+        ]
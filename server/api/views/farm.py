@@ -2,35 +2,69 @@ from rest_framework import viewsets, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from api.models import Farm, Crop
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from api.filters import IndexedSearchFilter
+from api.models import Farm, Crop, SoilSample, WaterSample, PestDiseaseReport, SearchDocument
+from api.scope import get_user_scope
+from api.views.mixins import ValuesListMixin
 from api.serializers import (
     FarmSerializer, FarmDetailSerializer, FarmCreateUpdateSerializer,
     CropSerializer
 )
 
 
+def child_count(model):
+    """Correlated subquery counting a farm's rows in a child table"""
+    counts = model.objects.filter(farm=OuterRef('pk')).order_by().values('farm').annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
 class FarmViewSet(viewsets.ModelViewSet):
     """ViewSet for managing farms"""
 
     queryset = Farm.objects.all()
     serializer_class = FarmSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     filterset_fields = ['route', 'name', 'owner_name']
     search_fields = ['name', 'owner_name', 'location']
+    search_kind = SearchDocument.Kind.FARM
     ordering_fields = ['name', 'owner_name', 'size_ha', 'created_at']
     ordering = ['-created_at']
 
     def get_queryset(self):
         """Filter farms based on user role and assigned routes"""
-        user = self.request.user
         queryset = Farm.objects.all()
 
-        if user.is_enumerator:
-            # Enumerators can only see farms in their assigned routes
-            queryset = queryset.filter(route__assigned_to=user)
+        if self.action in ['list', 'retrieve']:
+            # Everything FarmSerializer reads per farm, in a constant number of queries
+            queryset = queryset.select_related('route').prefetch_related('crops').annotate(
+                num_soil_samples=child_count(SoilSample),
+                num_water_samples=child_count(WaterSample),
+                num_pest_reports=child_count(PestDiseaseReport),
+            )
 
-        return queryset
+        if self.action == 'retrieve':
+            # Newest children only, capped per farm so detail latency stays
+            # bounded. Sliced prefetches run as a window function query and,
+            # in Django 4.2, need a to_attr; they also cache the parent farm
+            # on every child
+            limit = settings.FARM_DETAIL_CHILD_LIMIT
+            queryset = queryset.prefetch_related(
+                Prefetch('soil_samples', to_attr='latest_soil_samples',
+                         queryset=SoilSample.objects.order_by('-sample_date', '-created_at')[:limit]),
+                Prefetch('water_samples', to_attr='latest_water_samples',
+                         queryset=WaterSample.objects.order_by('-sample_date', '-created_at')[:limit]),
+                Prefetch('pest_disease_reports', to_attr='latest_pest_disease_reports',
+                         queryset=PestDiseaseReport.objects.order_by('-report_date', '-created_at')[:limit]),
+            )
+
+        # Enumerators can only see farms in their assigned routes
+        return get_user_scope(self.request).restrict(queryset, 'route_id')
 
     def get_serializer_class(self):
         """Return different serializers for different actions"""
@@ -76,7 +110,7 @@ class FarmViewSet(viewsets.ModelViewSet):
         return Response(data)
 
 
-class CropViewSet(viewsets.ModelViewSet):
+class CropViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for managing crops"""
 
     queryset = Crop.objects.all()
@@ -90,11 +124,7 @@ class CropViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter crops based on user role and assigned routes"""
-        user = self.request.user
         queryset = Crop.objects.all()
 
-        if user.is_enumerator:
-            # Enumerators can only see crops for farms in their assigned routes
-            queryset = queryset.filter(farm__route__assigned_to=user)
-
-        return queryset
\ No newline at end of file
+        # Enumerators can only see crops for farms in their assigned routes
+        return get_user_scope(self.request).restrict(queryset, 'farm__route_id')
\ No newline at end of file
@@ -0,0 +1,70 @@
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from rest_framework import status, views
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from api.imports import IMPORT_TYPES, REPORT_NAME_RE, ImportFileError, import_rows, read_rows, report_dir, report_name
+from api.views.export import IsAdminUser
+
+
+class ImportView(views.APIView):
+    """
+    Import farms or soil samples from an uploaded CSV or XLSX file (admin only).
+
+    Send the file as `file` in a multipart form, with `dry_run=true` to
+    only validate it. Rejected rows are listed in an error report, linked
+    as `report`. A file turning unreadable part way answers 400 with the
+    counts of the rows imported until then. For very large files, prefer
+    `manage.py import_data`.
+    """
+
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind):
+        if kind not in IMPORT_TYPES:
+            raise Http404
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'Upload a .csv or .xlsx file'})
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+
+        directory = report_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / report_name(kind)
+        try:
+            with path.open('w', newline='', encoding='utf-8') as report:
+                header, rows = read_rows(upload, upload.name)
+                result = import_rows(kind, header, rows, report, dry_run=dry_run, context={'request': request})
+        except ImportFileError as exc:
+            if exc.result is None:
+                path.unlink(missing_ok=True)
+                raise ValidationError({'file': str(exc)})
+            return Response(
+                {'file': [str(exc)], **self._result(request, kind, dry_run, exc.result, path)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self._result(request, kind, dry_run, result, path))
+
+    def _result(self, request, kind, dry_run, result, path):
+        """Import counts, linking the error report when rows were rejected"""
+        if result['failed']:
+            report_url = request.build_absolute_uri(reverse('import_report', args=[path.name]))
+        else:
+            path.unlink()
+            report_url = None
+        return {'type': kind, 'dry_run': dry_run, **result, 'report': report_url}
+
+
+class ImportReportView(views.APIView):
+    """Download the error report of an import (admin only)"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name):
+        path = report_dir() / name
+        if not REPORT_NAME_RE.match(name) or not path.is_file():
+            raise Http404
+        return FileResponse(path.open('rb'), as_attachment=True, filename=name)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from rest_framework.response import Response
+
+from api.serializers.values import values_serializer
+
+
+class ValuesListMixin:
+    """
+    Serve the list action from queryset.values() rows.
+
+    The response is identical to the regular list response; set
+    FAST_LIST_SERIALIZATION to False to go through the serializer instead.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        serializer = values_serializer(self.get_serializer_class())
+        queryset = self.filter_queryset(self.get_queryset()).values(*serializer.columns)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page, request))
+        return Response(serializer.serialize(queryset, request))
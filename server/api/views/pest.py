@@ -1,29 +1,31 @@
 from rest_framework import viewsets, permissions, filters
 from django_filters.rest_framework import DjangoFilterBackend
-from api.models import PestDiseaseReport
+from api.filters import IndexedSearchFilter
+from api.models import PestDiseaseReport, SearchDocument
 from api.serializers import PestDiseaseReportSerializer
+from api.scope import get_user_scope
+from api.views.mixins import ValuesListMixin
 
 
-class PestDiseaseReportViewSet(viewsets.ModelViewSet):
+class PestDiseaseReportViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for managing pest and disease reports"""
 
     queryset = PestDiseaseReport.objects.all()
     serializer_class = PestDiseaseReportSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     filterset_fields = ['farm', 'report_date', 'category', 'name', 'severity']
     search_fields = ['farm__name', 'name', 'description']
+    search_kind = SearchDocument.Kind.PEST_REPORT
     ordering_fields = ['report_date', 'name', 'severity']
     ordering = ['-report_date']
 
     def get_queryset(self):
         """Filter pest/disease reports based on user role and assigned routes"""
-        user = self.request.user
         queryset = PestDiseaseReport.objects.all()
 
-        if user.is_enumerator:
-            # Enumerators can only see reports for farms in their assigned routes
-            queryset = queryset.filter(farm__route__assigned_to=user)
+        # Enumerators can only see reports for farms in their assigned routes
+        queryset = get_user_scope(self.request).restrict(queryset, 'farm__route_id')
 
         # Filter by category
         category = self.request.query_params.get('category')
@@ -0,0 +1,53 @@
+import io
+import pstats
+
+from django.http import FileResponse, Http404, HttpResponse
+from rest_framework import views
+from rest_framework.response import Response
+
+from agrisurvey.middleware.profiling import PROFILE_NAME_RE, profile_dir
+from api.views.export import IsAdminUser
+
+
+class ProfileListView(views.APIView):
+    """List captured request profiles, newest first (admin only)"""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        directory = profile_dir()
+        profiles = sorted(
+            (p for p in directory.iterdir() if PROFILE_NAME_RE.match(p.name)),
+            reverse=True,
+        ) if directory.exists() else []
+
+        return Response([
+            {
+                'name': profile.name,
+                'size': profile.stat().st_size,
+                'url': request.build_absolute_uri(f'{profile.name}/'),
+            } for profile in profiles
+        ])
+
+
+class ProfileDownloadView(views.APIView):
+    """
+    Download a captured profile (admin only).
+
+    cProfile dumps can be opened with pstats or snakeviz; pass ?as=text for
+    the top functions by cumulative time instead.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name):
+        path = profile_dir() / name
+        if not PROFILE_NAME_RE.match(name) or not path.is_file():
+            raise Http404
+
+        if request.query_params.get('as') == 'text' and path.suffix == '.prof':
+            stream = io.StringIO()
+            pstats.Stats(str(path), stream=stream).sort_stats('cumulative').print_stats(60)
+            return HttpResponse(stream.getvalue(), content_type='text/plain')
+
+        return FileResponse(path.open('rb'), as_attachment=True, filename=name)
@@ -1,10 +1,67 @@
-from rest_framework import viewsets, permissions, status
+import uuid
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import exceptions, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from api.models import Route
+from api.models import Farm, PestDiseaseReport, Route, SoilSample, WaterSample
 from api.serializers import RouteSerializer
+from api.scope import get_user_scope
+from api.views.export import IsAdminUser
+
+# Routes one bulk status update may change
+BULK_STATUS_LIMIT = 1000
+
+
+def status_error(new_status):
+    """400 response for a status that isn't one of Route.Status, else None"""
+    if new_status in Route.Status.values:
+        return None
+    return Response(
+        {"detail": f"Invalid status. Choose from: {', '.join(Route.Status.values)}"},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def expected_version(request, route):
+    """The route version the client last saw: the `version` it sent, else the loaded one"""
+    expected = request.data.get('version')
+    if expected in (None, ''):
+        return route.version
+    try:
+        return int(expected)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError({"version": "Must be an integer."})
+
+
+class VersionConflict(exceptions.APIException):
+    """409 carrying the route's current status and version"""
+
+    status_code = status.HTTP_409_CONFLICT
+
+    def __init__(self, route_id):
+        current = Route.objects.filter(pk=route_id).values('status', 'version').first() or {}
+        # Set directly so the version stays a number in the response
+        self.detail = {"detail": "The route was changed by someone else. Reload it and try again.", **current}
+
+
+def farm_counts():
+    """Annotations counting a route's farms and the ones with samples or pest reports"""
+    farms = Farm.objects.filter(route=OuterRef('pk')).order_by().values('route')
+    completed = farms.filter(
+        Q(Exists(SoilSample.objects.filter(farm=OuterRef('pk'))))
+        | Q(Exists(WaterSample.objects.filter(farm=OuterRef('pk'))))
+        | Q(Exists(PestDiseaseReport.objects.filter(farm=OuterRef('pk'))))
+    )
+
+    def count(queryset):
+        total = queryset.annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(total, output_field=IntegerField()), 0)
 
+    return {'num_farms': count(farms), 'num_completed_farms': count(completed)}
 
 
 class RouteViewSet(viewsets.ModelViewSet):
@@ -17,11 +74,11 @@ class RouteViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter routes by assigned user if the current user is an enumerator"""
 
-        user = self.request.user
         queryset = Route.objects.all().order_by('-date_assigned')
-
-        if user.is_enumerator:
-            queryset = queryset.filter(assigned_to=user)
+        if self.action in ['list', 'retrieve']:
+            # Everything RouteSerializer reads per route, in a constant number of queries
+            queryset = queryset.select_related('assigned_to').annotate(**farm_counts())
+        queryset = get_user_scope(self.request).restrict(queryset, 'id')
 
         # Filter by status if provided
         status_param = self.request.query_params.get('status')
@@ -30,27 +87,95 @@ class RouteViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def perform_update(self, serializer):
+        """
+        Status changes through PUT/PATCH bump the version too. As with
+        update_status, a `version` the route has moved past is a 409.
+        """
+        route = serializer.instance
+        expected = expected_version(self.request, route)
+        new_version = expected + (serializer.validated_data.get('status', route.status) != route.status)
+        with transaction.atomic():
+            # Claims the row at the expected version before the other fields are written
+            if not Route.objects.filter(pk=route.pk, version=expected).update(version=new_version):
+                raise VersionConflict(route.pk)
+            route.version = new_version
+            serializer.save()
+
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
-        """Update the status of a route"""
+        """
+        Update the status of a route, writing only the status and version.
+
+        Clients may send the `version` they last saw: if the route has
+        changed since, nothing is written and 409 is returned with the
+        current status and version.
+        """
         route = self.get_object()
 
         # Check if user has permission (admin or assigned enumerator)
-        if not request.user.is_admin and route.assigned_to != request.user:
+        if not get_user_scope(request).has_route(route.pk):
             return Response(
                 {"detail": "You do not have permission to update this route's status."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Update status
         new_status = request.data.get('status')
-        if new_status not in dict(Route.Status.choices).keys():
-            return Response(
-                {"detail": f"Invalid status. Choose from: {', '.join(dict(Route.Status.choices).keys())}"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        error = status_error(new_status)
+        if error:
+            return error
+
+        expected = expected_version(request, route)
+
+        # Repeating the current status writes nothing
+        if expected == route.version and new_status == route.status:
+            return Response(self._status_payload(route.pk, new_status, route.version))
+
+        updated = Route.objects.filter(pk=route.pk, version=expected).update(
+            status=new_status, version=F('version') + 1,
+        )
+        if not updated:
+            raise VersionConflict(route.pk)
+        return Response(self._status_payload(route.pk, new_status, expected + 1))
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def bulk_update_status(self, request):
+        """
+        Set the status of many routes at once (admins only): `ids` lists
+        the routes. Routes already in that status are left untouched.
+        """
+        new_status = request.data.get('status')
+        error = status_error(new_status)
+        if error:
+            return error
+
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            return Response({"ids": "Send a list of route IDs."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > BULK_STATUS_LIMIT:
+            return Response({"ids": f"At most {BULK_STATUS_LIMIT} routes per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = {uuid.UUID(str(route_id)) for route_id in ids}
+        except ValueError:
+            return Response({"ids": "Route IDs must be UUIDs."}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            routes = Route.objects.filter(pk__in=ids)
+            found = set(routes.order_by().values_list('pk', flat=True))
+            updated = routes.exclude(status=new_status).update(status=new_status, version=F('version') + 1)
 
-        route.status = new_status
-        route.save()
+        return Response({
+            'status': new_status,
+            'updated': updated,
+            'unchanged': len(found) - updated,
+            'not_found': sorted(str(route_id) for route_id in ids - found),
+        })
 
-        return Response(self.get_serializer(route).data)
\ No newline at end of file
+    def _status_payload(self, route_id, new_status, version):
+        return {
+            'id': str(route_id),
+            'status': new_status,
+            'status_display': str(Route.Status(new_status).label),
+            'version': version,
+        }
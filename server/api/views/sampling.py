@@ -1,33 +1,36 @@
 from rest_framework import viewsets, permissions, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from api.models import SoilSample, WaterSample
+from api.filters import IndexedSearchFilter
+from api.models import SoilSample, WaterSample, SearchDocument
+from api.parsers import FastJSONParser
 from api.serializers import SoilSampleSerializer, WaterSampleSerializer
+from api.scope import get_user_scope
+from api.views.mixins import ValuesListMixin
 
 
-class SoilSampleViewSet(viewsets.ModelViewSet):
+class SoilSampleViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for managing soil samples"""
 
     queryset = SoilSample.objects.all()
     serializer_class = SoilSampleSerializer
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]  # Support file uploads
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    parser_classes = [MultiPartParser, FormParser, FastJSONParser]  # Support file uploads
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     filterset_fields = ['farm', 'sample_date']
     search_fields = ['farm__name', 'notes']
+    search_kind = SearchDocument.Kind.SOIL_SAMPLE
     ordering_fields = ['sample_date', 'pH', 'moisture_pct']
     ordering = ['-sample_date']
 
     def get_queryset(self):
         """Filter soil samples based on user role and assigned routes"""
-        user = self.request.user
         queryset = SoilSample.objects.select_related('farm').all()
 
-        if hasattr(user, 'is_enumerator') and user.is_enumerator:
-            # Enumerators can only see soil samples for farms in their assigned routes
-            queryset = queryset.filter(farm__route__assigned_to=user)
+        # Enumerators can only see soil samples for farms in their assigned routes
+        queryset = get_user_scope(self.request).restrict(queryset, 'farm__route_id')
 
         # Filter by farm if specified
         farm_id = self.request.query_params.get('farm')
@@ -80,27 +83,26 @@ class SoilSampleViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class WaterSampleViewSet(viewsets.ModelViewSet):
+class WaterSampleViewSet(ValuesListMixin, viewsets.ModelViewSet):
     """ViewSet for managing water samples"""
 
     queryset = WaterSample.objects.all()
     serializer_class = WaterSampleSerializer
     permission_classes = [permissions.IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]  # Support file uploads
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    parser_classes = [MultiPartParser, FormParser, FastJSONParser]  # Support file uploads
+    filter_backends = [DjangoFilterBackend, IndexedSearchFilter, filters.OrderingFilter]
     filterset_fields = ['farm', 'sample_date', 'source']
     search_fields = ['farm__name', 'source', 'notes']
+    search_kind = SearchDocument.Kind.WATER_SAMPLE
     ordering_fields = ['sample_date', 'pH', 'turbidity']
     ordering = ['-sample_date']
 
     def get_queryset(self):
         """Filter water samples based on user role and assigned routes"""
-        user = self.request.user
         queryset = WaterSample.objects.select_related('farm').all()
 
-        if hasattr(user, 'is_enumerator') and user.is_enumerator:
-            # Enumerators can only see water samples for farms in their assigned routes
-            queryset = queryset.filter(farm__route__assigned_to=user)
+        # Enumerators can only see water samples for farms in their assigned routes
+        queryset = get_user_scope(self.request).restrict(queryset, 'farm__route_id')
 
         # Filter by farm if specified
         farm_id = self.request.query_params.get('farm')
@@ -0,0 +1,79 @@
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.autocomplete import autocomplete
+from api.models import SearchDocument
+from api.scope import get_user_scope
+from api.search import matching_documents
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search across farms, samples and pest reports
+
+    Query parameters:
+        q       words to find; each must start a word of the result
+        types   comma-separated kinds to search (farm, soil_sample,
+                water_sample, pest_report); all by default
+        limit   maximum results (default 20, at most 100)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request):
+        kinds = [kind.strip() for kind in request.query_params.get('types', '').split(',') if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in SearchDocument.Kind.values]
+        if unknown:
+            raise ValidationError({'types': f"Unknown type {', '.join(unknown)}; "
+                                            f"choose from {', '.join(SearchDocument.Kind.values)}"})
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be a number'})
+
+        documents = get_user_scope(request).restrict(SearchDocument.objects.all(), 'route_id')
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        documents = matching_documents(documents, request.query_params.get('q', ''))
+        if documents is None:
+            raise ValidationError({'q': 'Enter at least one word to search for'})
+
+        results = documents.order_by('-rank', 'kind', 'title').values(
+            'kind', 'object_id', 'farm_id', 'title', 'rank',
+        )[:max(limit, 1)]
+        return Response({
+            'query': request.query_params['q'],
+            'results': [
+                {'type': row['kind'], 'id': row['object_id'], 'farm': row['farm_id'],
+                 'title': row['title'], 'rank': round(row['rank'], 4)}
+                for row in results
+            ],
+        })
+
+
+class FarmAutocompleteView(APIView):
+    """
+    Farms whose name or owner has words starting with each word typed
+
+    Query parameters:
+        q       text typed so far
+        limit   maximum suggestions (default 10, at most 50)
+
+    Answered from an in-memory index (api.autocomplete) rather than the
+    database, so it can be called on every keystroke.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = max(min(int(request.query_params.get('limit', 10)), self.max_limit), 1)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be a number'})
+
+        scope = get_user_scope(request)
+        query = request.query_params.get('q', '')
+        results = autocomplete(query, scope.route_ids if scope.is_restricted else None, limit)
+        return Response({'query': query, 'results': results})
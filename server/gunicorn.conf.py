@@ -0,0 +1,35 @@
+import os
+import shutil
+
+# Prometheus multiprocess mode: workers write metrics to mmap files in this
+# directory, which /metrics aggregates. It must be set before workers start.
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/agrisurvey-metrics')
+
+# SERVER_MODE=asgi runs agrisurvey.asgi on uvicorn workers, each serving many
+# concurrent (slow) clients from one event loop; the default runs
+# agrisurvey.wsgi on sync workers, one request at a time each. Outside
+# gunicorn, `uvicorn agrisurvey.asgi:application` serves the ASGI app too.
+if os.environ.get('SERVER_MODE', 'wsgi') == 'asgi':
+    wsgi_app = 'agrisurvey.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'agrisurvey.wsgi:application'
+
+
+def on_starting(server):
+    # Drop samples left over from a previous run
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    # Close the worker's database connection pool (DB_POOL) cleanly
+    from agrisurvey.db.postgresql_pool.base import DatabaseWrapper
+
+    DatabaseWrapper.close_pools()
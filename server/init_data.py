@@ -2,20 +2,19 @@
 """
 Initialization script for AgriSurvey application
 Creates superuser and sample data
+
+For benchmark-sized datasets use `python manage.py generate_data` instead.
 """
 import os
 import django
 import datetime
-import uuid
-import json
 
 # Set up Django environment
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'agrisurvey.settings')
 django.setup()
 
-from django.contrib.auth.models import User
 from api.models import (
-    UserProfile, Route, Farm, Crop,
+    User, Route, Farm, Crop,
     SoilSample, WaterSample, PestDiseaseReport
 )
 
@@ -26,11 +25,9 @@ def create_superuser():
         admin = User.objects.create_superuser(
             username='admin',
             email='admin@example.com',
-            password='adminpassword'
+            password='adminpassword',
+            role=User.Role.ADMIN
         )
-        # Superuser profile should be created automatically via signal
-        admin.profile.role = 'admin'
-        admin.profile.save()
         print('Superuser created')
     else:
         print('Superuser already exists')
@@ -45,10 +42,9 @@ def create_sample_users():
             email='manager@example.com',
             password='manager123',
             first_name='Manager',
-            last_name='User'
+            last_name='User',
+            role=User.Role.ADMIN
         )
-        manager.profile.role = 'admin'
-        manager.profile.save()
         print('Admin user created')
 
     # Create enumerator users
@@ -65,22 +61,22 @@ def create_sample_users():
                 email=enum['email'],
                 password='password123',
                 first_name=enum['first'],
-                last_name=enum['last']
+                last_name=enum['last'],
+                role=User.Role.ENUMERATOR
             )
-            # Enumerator profile should be created automatically via signal
             print(f'Enumerator {enum["username"]} created')
 
 
 def create_sample_routes():
     """Create sample routes"""
     # Get enumerator users
-    enumerators = User.objects.filter(profile__role='enumerator')
+    enumerators = User.objects.filter(role=User.Role.ENUMERATOR)
 
     # Create one route for each enumerator
     for i, enumerator in enumerate(enumerators):
         route = Route.objects.create(
+            name=f'Route {i + 1}',
             assigned_to=enumerator,
-            date_assigned=datetime.date.today(),
             status=['pending', 'in_progress', 'complete'][i % 3]
         )
         print(f'Created route for {enumerator.username}')
@@ -89,9 +85,11 @@ def create_sample_routes():
         for j in range(2):
             farm = Farm.objects.create(
                 route=route,
+                name=f'Farm {i * 2 + j + 1}',
                 owner_name=f'Farmer {i * 2 + j + 1}',
                 size_ha=5.0 + j * 2.5,
-                boundary_geo=json.dumps({
+                address=f'{j + 1} Field Road, Village {i + 1}',
+                boundary_geo={
                     "type": "Polygon",
                     "coordinates": [
                         [
@@ -102,7 +100,7 @@ def create_sample_routes():
                             [30.0 + i * 0.1, 0.0 + j * 0.1]
                         ]
                     ]
-                })
+                }
             )
             print(f'Created farm {farm.owner_name} for route {route.id}')
 
@@ -122,9 +120,9 @@ def create_sample_routes():
                 sample_date=datetime.date.today() - datetime.timedelta(days=10),
                 pH=6.5 + (i * 0.1),
                 moisture_pct=35.0 + (j * 5.0),
-                nutrients_n=20 + i + j,
-                nutrients_p=15 + i,
-                nutrients_k=10 + j
+                nutrient_n=20 + i + j,
+                nutrient_p=15 + i,
+                nutrient_k=10 + j
             )
             print(f'Created soil sample for farm {farm.owner_name}')
 
@@ -133,6 +131,7 @@ def create_sample_routes():
                 water_sample = WaterSample.objects.create(
                     farm=farm,
                     sample_date=datetime.date.today() - datetime.timedelta(days=10),
+                    source='Well',
                     pH=7.0 + (i * 0.2),
                     turbidity=2.5 + (j * 0.5)
                 )